@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.gamification.models import User
+from apps.achievements.services.achievement_engine import check_user_achievements
+
+
+class Command(BaseCommand):
+    help = "Pełne przeliczenie achievementów (nocny reconcile po delta-update, czas abstynencji). Uruchamiać z crona raz na dobę."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Tylko dla jednego usera (id).")
+
+    def handle(self, *args, **options):
+        users = User.objects.all().order_by("id")
+
+        if options["user"]:
+            users = users.filter(id=options["user"])
+
+        for user in users.iterator():
+            completed = check_user_achievements(user)
+            self.stdout.write(f"[ACHIEVEMENTS] user={user.id} newly completed={len(completed)}")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0001_initial'),
+        ('gamification', '0008_authtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userachievement',
+            index=models.Index(fields=['user', 'is_completed'], name='achievement_user_id_7738d9_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from apps.common.managers import UserScopedManager
 
 
 class Achievement(models.Model):
@@ -62,6 +63,10 @@ class Achievement(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
+    user_scope_shared = True
 
     class Meta:
         ordering = ["difficulty__order", "name"]
@@ -100,8 +105,13 @@ class UserAchievement(models.Model):
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedManager()
+
     class Meta:
         unique_together = ("user", "achievement")
+        indexes = [
+            models.Index(fields=["user", "is_completed"]),
+        ]
 
     def __str__(self):
         return f"{self.user_id} - {self.achievement.name}"
@@ -1,6 +1,67 @@
 from django.utils import timezone
 from apps.achievements.models import Achievement, UserAchievement
+from apps.common.services import user_cache
 from .condition_evaluator import evaluate_condition, get_target_value
+from .batch_evaluator import evaluate_batch
+from .dependency_index import (
+    SOURCE_HABIT_DAY,
+    SOURCE_TODO_TASK,
+    SOURCE_RANDOM_NOTE,
+    SOURCE_MOOD_ENTRY,
+    SOURCE_GOAL,
+    SOURCE_SOBRIETY,
+    SOURCE_XP_LOG,
+    achievement_ids_for_scope,
+)
+
+
+# --- eventy domenowe = źródła z dependency_index ---
+
+EVENT_HABIT_DAY = SOURCE_HABIT_DAY
+EVENT_TODO = SOURCE_TODO_TASK
+EVENT_NOTE = SOURCE_RANDOM_NOTE
+EVENT_MOOD = SOURCE_MOOD_ENTRY
+EVENT_GOAL = SOURCE_GOAL
+EVENT_SOBRIETY = SOURCE_SOBRIETY
+EVENT_XP = SOURCE_XP_LOG
+
+# condition typy liczone jako COUNT — można je aktualizować deltą
+DELTA_CONDITIONS = {
+    "habit_days",
+    "any_habit_days",
+    "goal_completed",
+    "goal_completed_by_period",
+    "todo_completed",
+    "notes_count",
+    "mood_logged_days",
+    "specific_mood_count",
+}
+
+
+def _config_matches(config, key, value):
+    """
+    Brak klucza w configu = achievement dotyczy wszystkiego.
+    Brak wartości w kontekście eventu = nie wiemy, więc traktujemy jako trafienie.
+    """
+
+    expected = config.get(key)
+
+    if not expected or value is None:
+        return True
+
+    return str(expected) == str(value)
+
+
+# czy dany event w ogóle dotyczy achievementa (np. inny habit_id)
+EVENT_FILTERS = {
+    "habit_days": lambda config, ctx: _config_matches(config, "habit_id", ctx.get("habit_id")),
+    "habit_streak": lambda config, ctx: _config_matches(config, "habit_id", ctx.get("habit_id")),
+    "todo_completed": lambda config, ctx: _config_matches(config, "category_id", ctx.get("category_id")),
+    "goal_completed_by_period": lambda config, ctx: _config_matches(config, "period", ctx.get("period")),
+    "specific_mood_count": lambda config, ctx: _config_matches(config, "mood", ctx.get("mood")),
+    "sobriety_duration": lambda config, ctx: _config_matches(config, "sobriety_id", ctx.get("sobriety_id")),
+}
+
 
 def get_or_create_user_achievement(user, achievement):
     ua, created = UserAchievement.objects.get_or_create(
@@ -15,19 +76,20 @@ def get_or_create_user_achievement(user, achievement):
 
     return ua
 
+def _apply_value(ua, current_value, now):
+    ua.current_value = current_value
+
+    if current_value >= ua.target_value:
+        ua.is_completed = True
+        ua.completed_at = now
+
 def update_user_achievement(user, achievement):
     ua = get_or_create_user_achievement(user, achievement)
 
     if ua.is_completed:
         return ua
 
-    current_value = evaluate_condition(user, achievement)
-
-    ua.current_value = current_value
-
-    if current_value >= ua.target_value:
-        ua.is_completed = True
-        ua.completed_at = timezone.now()
+    _apply_value(ua, evaluate_condition(user, achievement), timezone.now())
 
     ua.save(update_fields=[
         "current_value",
@@ -39,21 +101,145 @@ def update_user_achievement(user, achievement):
     return ua
 
 
-def check_user_achievements(user):
+def _scoped_achievements(user, scope):
+    qs = Achievement.objects.for_user(user)
+
+    if scope is not None:
+        qs = qs.filter(id__in=achievement_ids_for_scope(scope))
+
+    return qs
+
+
+def _load_states(user, achievements):
+    return {
+        ua.achievement_id: ua
+        for ua in UserAchievement.objects.filter(
+            user=user,
+            achievement__in=achievements,
+        )
+    }
+
+
+def _write_states(user, achievements, states, values):
     """
-    Sprawdza wszystkie achievementy usera.
+    Zapisuje nowe wartości: brakujące stany przez bulk_create,
+    zmienione przez bulk_update. Zwraca nowo ukończone.
     """
 
-    achievements = Achievement.objects.filter(
-        user__isnull=True
-    ) | Achievement.objects.filter(user=user)
-
-    updated = []
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    completed = []
 
     for achievement in achievements:
-        ua = update_user_achievement(user, achievement)
+        if achievement.id not in values:
+            continue
+
+        current_value = values[achievement.id]
+        ua = states.get(achievement.id)
+
+        if ua is None:
+            ua = UserAchievement(
+                user=user,
+                achievement=achievement,
+                current_value=0,
+                target_value=get_target_value(achievement),
+            )
+            _apply_value(ua, current_value, now)
+            to_create.append(ua)
+
+        elif current_value != ua.current_value:
+            _apply_value(ua, current_value, now)
+            ua.updated_at = now
+            to_update.append(ua)
+
+        else:
+            continue
 
         if ua.is_completed:
-            updated.append(ua)
+            completed.append(ua)
+
+    if to_create:
+        # równoległy request mógł już utworzyć stan — wtedy wygrywa tamten
+        UserAchievement.objects.bulk_create(to_create, ignore_conflicts=True)
+
+    if to_update:
+        UserAchievement.objects.bulk_update(
+            to_update,
+            ["current_value", "is_completed", "completed_at", "updated_at"],
+        )
 
-    return updated
\ No newline at end of file
+    if to_create or to_update:
+        # bulk_* nie wysyłają sygnałów
+        user_cache.bump(user.id, user_cache.ACHIEVEMENTS)
+
+    return completed
+
+
+def handle_event(user, event, *, delta=None, **context):
+    """
+    Aktualizuje tylko achievementy subskrybujące dany event.
+
+    delta != None  -> COUNT-owe achievementy dostają current_value += delta
+    delta is None  -> pełna ewaluacja, ale tylko dla achievementów tego eventu
+    context        -> np. habit_id / category_id / mood / period / sobriety_id,
+                      używany do odfiltrowania achievementów innego obiektu
+    """
+
+    achievements = []
+
+    for achievement in _scoped_achievements(user, [event]):
+        event_filter = EVENT_FILTERS.get(achievement.condition_type)
+
+        if event_filter and not event_filter(achievement.condition_config or {}, context):
+            continue
+
+        achievements.append(achievement)
+
+    if not achievements:
+        return []
+
+    states = _load_states(user, achievements)
+    values = {}
+    to_evaluate = []
+
+    for achievement in achievements:
+        ua = states.get(achievement.id)
+
+        if ua is not None and ua.is_completed:
+            continue
+
+        # brak stanu -> pełna ewaluacja (już uwzględnia ten event)
+        if ua is not None and delta is not None and achievement.condition_type in DELTA_CONDITIONS:
+            values[achievement.id] = max(0, ua.current_value + delta)
+        else:
+            to_evaluate.append(achievement)
+
+    values.update(evaluate_batch(user, to_evaluate))
+
+    return _write_states(user, achievements, states, values)
+
+
+def check_user_achievements(user, scope=None):
+    """
+    Pełna re-ewaluacja achievementów usera (import, edycja achievementa, nocny reconcile).
+    scope — opcjonalna lista źródeł (dependency_index.SOURCE_*),
+    wtedy sprawdzane są tylko achievementy od nich zależne.
+    Na co dzień używaj handle_event.
+    """
+
+    achievements = list(_scoped_achievements(user, scope))
+    states = _load_states(user, achievements)
+
+    pending = [
+        achievement
+        for achievement in achievements
+        if not (achievement.id in states and states[achievement.id].is_completed)
+    ]
+
+    return _write_states(
+        user,
+        pending,
+        states,
+        evaluate_batch(user, pending),
+    )
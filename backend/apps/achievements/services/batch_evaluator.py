@@ -0,0 +1,203 @@
+from collections import defaultdict
+
+from django.db.models import Count
+
+from apps.habits.models import Habit, HabitDay
+from apps.notes.models import RandomNote
+from apps.mood.models import MoodEntry
+from apps.goals.models import Goal
+from apps.todos.models import TodoTask
+from apps.sobriety.models import Sobriety
+from apps.habits.services.streaks import longest_streaks
+from .condition_evaluator import evaluate_condition, _duration_to_unit
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# --- rodziny condition_type -> jedno zapytanie na rodzinę ---
+
+def _habit_days_family(user, achievements):
+    counts = dict(
+        HabitDay.objects.filter(
+            habit__user=user,
+            status=HabitDay.STATUS_COMPLETED,
+        )
+        .values("habit_id")
+        .annotate(n=Count("id"))
+        .values_list("habit_id", "n")
+    )
+    total = sum(counts.values())
+
+    values = {}
+    for a in achievements:
+        habit_id = _as_int((a.condition_config or {}).get("habit_id"))
+
+        if a.condition_type == "habit_days" and habit_id:
+            values[a.id] = counts.get(habit_id, 0)
+        else:
+            values[a.id] = total
+
+    return values
+
+
+def _habit_streak_family(user, achievements):
+    habits = Habit.objects.filter(user=user).select_related("streak")
+    streaks = longest_streaks(habits)
+    best_active = max(
+        (streaks[h.id] for h in habits if h.is_active),
+        default=0,
+    )
+
+    values = {}
+    for a in achievements:
+        if a.condition_type == "habit_streak":
+            habit_id = _as_int((a.condition_config or {}).get("habit_id"))
+            values[a.id] = streaks.get(habit_id, 0) if habit_id else 0
+        else:
+            values[a.id] = best_active
+
+    return values
+
+
+def _goal_family(user, achievements):
+    counts = dict(
+        Goal.objects.filter(user=user, is_completed=True)
+        .values("period__name")
+        .annotate(n=Count("id"))
+        .values_list("period__name", "n")
+    )
+    total = sum(counts.values())
+
+    values = {}
+    for a in achievements:
+        if a.condition_type == "goal_completed_by_period":
+            period = (a.condition_config or {}).get("period")
+            values[a.id] = counts.get(period, 0) if period else 0
+        else:
+            values[a.id] = total
+
+    return values
+
+
+def _todo_family(user, achievements):
+    counts = dict(
+        TodoTask.objects.filter(user=user, is_completed=True)
+        .values("category_id")
+        .annotate(n=Count("id"))
+        .values_list("category_id", "n")
+    )
+    total = sum(counts.values())
+
+    values = {}
+    for a in achievements:
+        category_id = _as_int((a.condition_config or {}).get("category_id"))
+        values[a.id] = counts.get(category_id, 0) if category_id else total
+
+    return values
+
+
+def _notes_family(user, achievements):
+    count = RandomNote.objects.filter(user=user).count()
+    return {a.id: count for a in achievements}
+
+
+def _mood_family(user, achievements):
+    counts = dict(
+        MoodEntry.objects.filter(user=user)
+        .values("mood")
+        .annotate(n=Count("id"))
+        .values_list("mood", "n")
+    )
+    total = sum(counts.values())
+
+    values = {}
+    for a in achievements:
+        if a.condition_type == "specific_mood_count":
+            mood = (a.condition_config or {}).get("mood")
+            values[a.id] = counts.get(mood, 0) if mood else 0
+        else:
+            values[a.id] = total
+
+    return values
+
+
+def _sobriety_family(user, achievements):
+    durations = {
+        s.id: s.current_duration()
+        for s in Sobriety.objects.filter(user=user)
+    }
+
+    values = {}
+    for a in achievements:
+        config = a.condition_config or {}
+        unit = config.get("unit", "days")
+
+        if a.condition_type == "sobriety_duration":
+            duration = durations.get(_as_int(config.get("sobriety_id")))
+            values[a.id] = _duration_to_unit(duration, unit) if duration else 0
+        else:
+            values[a.id] = max(
+                (_duration_to_unit(d, unit) for d in durations.values() if d),
+                default=0,
+            )
+
+    return values
+
+
+def _xp_family(user, achievements):
+    return {
+        a.id: user.total_xp if a.condition_type == "xp_reached" else user.current_level
+        for a in achievements
+    }
+
+
+FAMILIES = {
+    "habit_days": _habit_days_family,
+    "any_habit_days": _habit_days_family,
+    "habit_streak": _habit_streak_family,
+    "any_habit_streak": _habit_streak_family,
+
+    "goal_completed": _goal_family,
+    "goal_completed_by_period": _goal_family,
+
+    "todo_completed": _todo_family,
+
+    "notes_count": _notes_family,
+
+    "mood_logged_days": _mood_family,
+    "specific_mood_count": _mood_family,
+
+    "sobriety_duration": _sobriety_family,
+    "any_sobriety_duration": _sobriety_family,
+
+    "xp_reached": _xp_family,
+    "level_reached": _xp_family,
+}
+
+
+def evaluate_batch(user, achievements):
+    """
+    achievement_id -> current value dla wielu achievementów naraz.
+    Jedno zapytanie agregujące na rodzinę condition_type zamiast COUNT per achievement.
+    """
+
+    grouped = defaultdict(list)
+    values = {}
+
+    for a in achievements:
+        family = FAMILIES.get(a.condition_type)
+
+        if family is None:
+            values[a.id] = evaluate_condition(user, a)
+        else:
+            grouped[family].append(a)
+
+    for family, members in grouped.items():
+        values.update(family(user, members))
+
+    return values
@@ -22,30 +22,8 @@ def get_target_value(achievement):
 
     return 1
 
-def _calculate_habit_streak(days):
-    """
-    Zwraca biggest streak dla querysetu HabitDay.
-    """
-
-    max_streak = 0
-    cur = 0
-    last_date = None
-
-    for d in days:
-        if d.status == d.STATUS_COMPLETED:
-            if last_date and (d.date - last_date).days == 1:
-                cur += 1
-            else:
-                cur = 1
-            max_streak = max(max_streak, cur)
-        else:
-            cur = 0
-
-        last_date = d.date
-
-    return max_streak
-
 from apps.habits.models import Habit, HabitDay
+from apps.habits.services.streaks import get_streak, longest_streaks
 
 
 def evaluate_habit_streak(user, achievement):
@@ -59,12 +37,15 @@ def evaluate_habit_streak(user, achievement):
     if not habit_id:
         return 0
 
-    days = HabitDay.objects.filter(
-        habit_id=habit_id,
-        habit__user=user,
-    ).order_by("date")
+    habit = Habit.objects.filter(
+        id=habit_id,
+        user=user,
+    ).select_related("streak").first()
 
-    return _calculate_habit_streak(days)
+    if not habit:
+        return 0
+
+    return get_streak(habit).longest_streak
 
 def evaluate_any_habit_streak(user, achievement):
     """
@@ -74,19 +55,9 @@ def evaluate_any_habit_streak(user, achievement):
     habits = Habit.objects.filter(
         user=user,
         is_active=True,
-    )
-
-    best = 0
-
-    for habit in habits:
-        days = HabitDay.objects.filter(
-            habit=habit
-        ).order_by("date")
+    ).select_related("streak")
 
-        streak = _calculate_habit_streak(days)
-        best = max(best, streak)
-
-    return best
+    return max(longest_streaks(habits).values(), default=0)
 
 
 def evaluate_habit_days(user, achievement):
@@ -0,0 +1,107 @@
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from apps.achievements.models import Achievement
+
+
+# --- źródła danych (modele), z których czytają evaluatory ---
+
+SOURCE_HABIT_DAY = "HabitDay"
+SOURCE_TODO_TASK = "TodoTask"
+SOURCE_RANDOM_NOTE = "RandomNote"
+SOURCE_MOOD_ENTRY = "MoodEntry"
+SOURCE_GOAL = "Goal"
+SOURCE_SOBRIETY = "Sobriety"
+SOURCE_XP_LOG = "XPLog"
+
+ALL_SOURCES = (
+    SOURCE_HABIT_DAY,
+    SOURCE_TODO_TASK,
+    SOURCE_RANDOM_NOTE,
+    SOURCE_MOOD_ENTRY,
+    SOURCE_GOAL,
+    SOURCE_SOBRIETY,
+    SOURCE_XP_LOG,
+)
+
+# condition_type -> źródła, których zmiana może zmienić wynik evaluatora
+CONDITION_SOURCES = {
+    "habit_days": (SOURCE_HABIT_DAY,),
+    "any_habit_days": (SOURCE_HABIT_DAY,),
+    "habit_streak": (SOURCE_HABIT_DAY,),
+    "any_habit_streak": (SOURCE_HABIT_DAY,),
+
+    "goal_completed": (SOURCE_GOAL,),
+    "goal_completed_by_period": (SOURCE_GOAL,),
+
+    "todo_completed": (SOURCE_TODO_TASK,),
+
+    "notes_count": (SOURCE_RANDOM_NOTE,),
+
+    "mood_logged_days": (SOURCE_MOOD_ENTRY,),
+    "specific_mood_count": (SOURCE_MOOD_ENTRY,),
+
+    "sobriety_duration": (SOURCE_SOBRIETY,),
+    "any_sobriety_duration": (SOURCE_SOBRIETY,),
+
+    # total_xp / current_level zmieniają się tylko razem z XPLog
+    "xp_reached": (SOURCE_XP_LOG,),
+    "level_reached": (SOURCE_XP_LOG,),
+
+    # manual nie zależy od niczego
+    "manual": (),
+}
+
+CACHE_KEY = "achievements:dependency_index"
+
+# górny limit życia wpisu — zmiany z pominięciem updated_at (queryset.update) też się odświeżą
+CACHE_TIMEOUT = 5 * 60
+
+
+def build_dependency_index():
+    """
+    source -> lista id achievementów (systemowych i customowych), które od niego zależą.
+    """
+
+    index = {source: [] for source in ALL_SOURCES}
+
+    rows = Achievement.objects.values_list("id", "condition_type").order_by("id")
+
+    for achievement_id, condition_type in rows:
+        for source in CONDITION_SOURCES.get(condition_type, ()):
+            index[source].append(achievement_id)
+
+    return index
+
+
+def _index_version():
+    # z bazy, nie z sygnału: zapis (updated_at) i usunięcie (count) w dowolnym procesie
+    # zmieniają klucz, więc żaden worker nie trzyma starego indeksu
+    stamp = Achievement.objects.aggregate(count=Count("id"), last=Max("updated_at"))
+    last = stamp["last"].timestamp() if stamp["last"] else 0
+    return f"{stamp['count']}:{last}"
+
+
+def get_dependency_index():
+    key = f"{CACHE_KEY}:{_index_version()}"
+    index = cache.get(key)
+
+    if index is None:
+        index = build_dependency_index()
+        cache.set(key, index, timeout=CACHE_TIMEOUT)
+
+    return index
+
+
+def achievement_ids_for_scope(scope):
+    """
+    scope — iterable źródeł (np. [SOURCE_HABIT_DAY]).
+    """
+
+    index = get_dependency_index()
+    ids = set()
+
+    for source in scope:
+        ids.update(index.get(source, ()))
+
+    return ids
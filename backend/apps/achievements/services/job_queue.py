@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+
+from .achievement_engine import EVENT_SOBRIETY, handle_event, check_user_achievements
+
+
+logger = logging.getLogger(__name__)
+
+BACKEND_THREAD = "thread"
+BACKEND_IMMEDIATE = "immediate"
+
+DEFAULTS = {
+    "BACKEND": BACKEND_THREAD,
+    "WORKERS": 2,
+    "COALESCE_SECONDS": 0.5,
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, "ACHIEVEMENT_QUEUE", {})}
+
+
+# --- stan kolejki (per proces) ---
+
+_lock = threading.Lock()
+_idle = threading.Condition(_lock)
+_pending = {}     # user_id -> lista (event, delta, context) czekających na worker
+_active = set()   # user_id z workerem w trakcie — max jeden naraz na usera
+_executor = None
+
+# user_id -> eventy odłożone w bieżącym wątku (deferred_events)
+_deferred = threading.local()
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_config()["WORKERS"],
+            thread_name_prefix="achievements",
+        )
+
+    return _executor
+
+
+def _load_user(user_id):
+    from apps.gamification.models import User
+    return User.objects.filter(pk=user_id).first()
+
+
+def _process(user_id, jobs):
+    user = _load_user(user_id)
+
+    if user is None:
+        return
+
+    _evaluate(user, jobs)
+
+
+def _evaluate(user, jobs):
+    if len(jobs) == 1:
+        event, delta, context = jobs[0]
+        handle_event(user, event, delta=delta, **context)
+        return
+
+    # kilka eventów w oknie -> jedna pełna ewaluacja po wszystkich źródłach naraz;
+    # delty nie sumujemy, bo stan bazy zawiera już wszystkie zmiany
+    check_user_achievements(user, scope=sorted({event for event, _, _ in jobs}))
+
+
+def _run(user_id):
+    window = _config()["COALESCE_SECONDS"]
+
+    try:
+        while True:
+            # czekamy chwilę, żeby kolejne eventy tego usera dołączyły do partii
+            time.sleep(window)
+
+            with _lock:
+                jobs = _pending.pop(user_id, [])
+
+            if jobs:
+                close_old_connections()
+                try:
+                    _process(user_id, jobs)
+                except Exception:
+                    logger.exception("Achievement evaluation failed for user %s", user_id)
+
+            with _lock:
+                if user_id not in _pending:
+                    _active.discard(user_id)
+                    _idle.notify_all()
+                    return
+    finally:
+        connection.close()
+
+
+def _enqueue(user_id, *jobs):
+    with _lock:
+        _pending.setdefault(user_id, []).extend(jobs)
+
+        if user_id in _active:
+            return
+
+        _active.add(user_id)
+
+    _get_executor().submit(_run, user_id)
+
+
+def schedule_event(user, event, *, delta=None, **context):
+    """
+    Jak handle_event, ale po commicie i poza requestem.
+    Eventy jednego usera z okna COALESCE_SECONDS są łączone w jedną ewaluację.
+    """
+
+    job = (event, delta, context)
+
+    deferred = _deferred_jobs().get(user.id)
+    if deferred is not None:
+        deferred.append(job)
+        return
+
+    if _config()["BACKEND"] == BACKEND_IMMEDIATE:
+        handle_event(user, event, delta=delta, **context)
+        return
+
+    transaction.on_commit(lambda: _enqueue(user.id, job))
+
+
+# achievementy zależne od upływu czasu (sobriety_duration) — sprawdzane najwyżej raz na tyle sekund
+TIME_CHECK_SECONDS = 60 * 60
+
+
+def schedule_time_checks(user):
+    """
+    Czas trwania abstynencji rośnie bez żadnego zapisu, więc żaden event go nie zgłosi.
+    Wołane z odczytów po otwarciu aplikacji (dashboard, lista achievementów);
+    nocny reconcile_achievements domyka resztę.
+    """
+
+    if not cache.add(f"achievements:time-check:{user.id}", True, TIME_CHECK_SECONDS):
+        return
+
+    schedule_event(user, EVENT_SOBRIETY)
+
+
+def _deferred_jobs():
+    if not hasattr(_deferred, "jobs"):
+        _deferred.jobs = {}
+    return _deferred.jobs
+
+
+@contextmanager
+def deferred_events(user):
+    """
+    schedule_event tego usera w bloku tylko zbiera eventy; na wyjściu idą razem
+    jako jedna partia (jedna ewaluacja po wszystkich źródłach, jak w workerze).
+    Wyjątek w bloku = eventy przepadają razem ze zmianami.
+    """
+
+    deferred = _deferred_jobs()
+    jobs = deferred[user.id] = []
+
+    try:
+        yield jobs
+    finally:
+        del deferred[user.id]
+
+    if not jobs:
+        return
+
+    if _config()["BACKEND"] == BACKEND_IMMEDIATE:
+        _evaluate(user, jobs)
+        return
+
+    transaction.on_commit(lambda: _enqueue(user.id, *jobs))
+
+
+def wait_until_idle(timeout=None):
+    """
+    Czeka aż kolejka się opróżni (testy, komendy zarządzające). False po timeoucie.
+    """
+
+    with _idle:
+        return _idle.wait_for(lambda: not _active and not _pending, timeout=timeout)
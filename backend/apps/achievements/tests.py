@@ -1,3 +1,313 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from unittest import mock
+from rest_framework.test import APIClient
+from apps.achievements.models import Achievement, UserAchievement
+from apps.achievements.services.achievement_engine import (
+    handle_event,
+    check_user_achievements,
+    EVENT_NOTE,
+)
+from apps.achievements.services import job_queue
+from apps.achievements.services.batch_evaluator import evaluate_batch
+from apps.achievements.services.condition_evaluator import evaluate_condition
+from apps.achievements.services.dependency_index import (
+    get_dependency_index,
+    SOURCE_HABIT_DAY,
+    SOURCE_RANDOM_NOTE,
+)
+from apps.common.models import DifficultyType
+from apps.gamification.models import User
+from apps.habits.models import Habit, HabitDay
+from apps.habits.services.streaks import rebuild_streak
+from apps.mood.models import MoodEntry
+from apps.notes.models import RandomNote
+from apps.sobriety.models import Sobriety
+from datetime import date, time, timedelta
+
+
+# ewaluacja w requeście — w TestCase commit (a z nim worker) nigdy nie następuje
+@override_settings(ACHIEVEMENT_QUEUE={"BACKEND": "immediate"})
+class AchievementEventTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+        self.habit = Habit.objects.create(
+            user=self.user,
+            title="Meditation",
+            difficulty=self.diff,
+        )
+
+    def _achievement(self, condition_type, **config):
+        return Achievement.objects.create(
+            name=condition_type,
+            difficulty=self.diff,
+            condition_type=condition_type,
+            condition_config=config,
+        )
+
+    def test_habit_toggle_updates_habit_achievement_by_delta(self):
+        achievement = self._achievement("habit_days", target=2, habit_id=self.habit.id)
+
+        self.client.post(
+            f"/api/habits/{self.habit.id}/toggle-day/",
+            {"date": "2025-01-01"},
+            format="json",
+        )
+        self.client.post(
+            f"/api/habits/{self.habit.id}/toggle-day/",
+            {"date": "2025-01-02"},
+            format="json",
+        )
+
+        ua = UserAchievement.objects.get(user=self.user, achievement=achievement)
+        self.assertEqual(ua.current_value, 2)
+        self.assertTrue(ua.is_completed)
+
+    def test_uncompleting_day_decrements_progress(self):
+        achievement = self._achievement("any_habit_days", target=5)
+        url = f"/api/habits/{self.habit.id}/toggle-day/"
+
+        self.client.post(url, {"date": "2025-01-01"}, format="json")
+        self.client.post(url, {"date": "2025-01-01"}, format="json")
+
+        ua = UserAchievement.objects.get(user=self.user, achievement=achievement)
+        self.assertEqual(ua.current_value, 0)
+
+    def test_event_does_not_touch_unrelated_achievements(self):
+        self._achievement("notes_count", target=3)
+        mood_achievement = self._achievement("mood_logged_days", target=3)
+
+        RandomNote.objects.create(user=self.user, content="hello")
+        handle_event(self.user, EVENT_NOTE, delta=1)
+
+        self.assertFalse(
+            UserAchievement.objects.filter(achievement=mood_achievement).exists()
+        )
+
+    def test_first_event_evaluates_from_scratch(self):
+        achievement = self._achievement("notes_count", target=3)
+
+        RandomNote.objects.create(user=self.user, content="one")
+        RandomNote.objects.create(user=self.user, content="two")
+        handle_event(self.user, EVENT_NOTE, delta=1)
+
+        ua = UserAchievement.objects.get(user=self.user, achievement=achievement)
+        self.assertEqual(ua.current_value, 2)
+
+
+    def test_sobriety_duration_is_checked_on_app_open(self):
+        achievement = self._achievement("any_sobriety_duration", days=30)
+        Sobriety.objects.create(
+            user=self.user,
+            name="Coffee",
+            motivation_reason="sleep",
+            started_at=timezone.now() - timedelta(days=31),
+        )
+
+        self.client.get("/api/dashboard/")
+
+        ua = UserAchievement.objects.get(user=self.user, achievement=achievement)
+        self.assertTrue(ua.is_completed)
+
+        # w oknie TIME_CHECK_SECONDS kolejne odczyty nie ewaluują ponownie
+        later = self._achievement("any_sobriety_duration", days=1)
+        self.client.get("/api/achievements/user/")
+        self.assertFalse(UserAchievement.objects.filter(achievement=later).exists())
+
+
+class DependencyIndexTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+    def test_index_is_invalidated_on_achievement_change(self):
+        achievement = Achievement.objects.create(
+            name="Notes",
+            difficulty=self.diff,
+            condition_type="notes_count",
+            condition_config={"target": 1},
+        )
+        self.assertIn(achievement.id, get_dependency_index()[SOURCE_RANDOM_NOTE])
+
+        achievement.condition_type = "any_habit_days"
+        achievement.save()
+
+        index = get_dependency_index()
+        self.assertNotIn(achievement.id, index[SOURCE_RANDOM_NOTE])
+        self.assertIn(achievement.id, index[SOURCE_HABIT_DAY])
+
+    def test_index_follows_changes_made_without_signals(self):
+        # inny worker / queryset.update: lokalny sygnał nie zadziała, wersja z bazy tak
+        achievement = Achievement.objects.create(
+            name="Notes",
+            difficulty=self.diff,
+            condition_type="notes_count",
+            condition_config={"target": 1},
+        )
+        self.assertIn(achievement.id, get_dependency_index()[SOURCE_RANDOM_NOTE])
+
+        Achievement.objects.filter(pk=achievement.pk).update(
+            condition_type="any_habit_days",
+            updated_at=timezone.now() + timedelta(seconds=1),
+        )
+        self.assertIn(achievement.id, get_dependency_index()[SOURCE_HABIT_DAY])
+
+        Achievement.objects.filter(pk=achievement.pk)._raw_delete(using="default")
+        self.assertNotIn(achievement.id, get_dependency_index()[SOURCE_HABIT_DAY])
+
+    def test_scoped_check_only_touches_dependent_achievements(self):
+        notes = Achievement.objects.create(
+            name="Notes",
+            difficulty=self.diff,
+            condition_type="notes_count",
+            condition_config={"target": 1},
+        )
+        habits = Achievement.objects.create(
+            name="Habits",
+            difficulty=self.diff,
+            condition_type="any_habit_days",
+            condition_config={"target": 1},
+        )
+
+        check_user_achievements(self.user, scope=[SOURCE_RANDOM_NOTE])
+
+        self.assertTrue(UserAchievement.objects.filter(achievement=notes).exists())
+        self.assertFalse(UserAchievement.objects.filter(achievement=habits).exists())
+
+
+class BatchEvaluatorTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(total_xp=350, current_level=3)
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+        self.habits = [
+            Habit.objects.create(user=self.user, title=f"H{i}", difficulty=self.diff)
+            for i in range(3)
+        ]
+
+        start = date(2025, 1, 1)
+        for i, habit in enumerate(self.habits):
+            for offset in range(5 + i):
+                if offset == 2 and i == 1:
+                    continue
+                HabitDay.objects.create(
+                    habit=habit,
+                    date=start + timedelta(days=offset),
+                    status=HabitDay.STATUS_COMPLETED,
+                )
+            rebuild_streak(habit)
+
+        for i, mood in enumerate(["good", "good", "bad"]):
+            MoodEntry.objects.create(
+                user=self.user,
+                mood=mood,
+                date=start + timedelta(days=i),
+                time=time(12, 0),
+            )
+
+        configs = [
+            ("any_habit_days", {"target": 100}),
+            ("any_habit_streak", {"target": 100}),
+            ("mood_logged_days", {"target": 100}),
+            ("xp_reached", {"target": 1000}),
+            ("level_reached", {"target": 10}),
+        ]
+        for habit in self.habits:
+            configs.append(("habit_days", {"target": 100, "habit_id": habit.id}))
+            configs.append(("habit_streak", {"target": 100, "habit_id": habit.id}))
+        for mood in ["good", "bad", "great"]:
+            configs.append(("specific_mood_count", {"target": 100, "mood": mood}))
+
+        self.achievements = [
+            Achievement.objects.create(
+                name=f"{condition_type}-{i}",
+                difficulty=self.diff,
+                condition_type=condition_type,
+                condition_config=config,
+            )
+            for i, (condition_type, config) in enumerate(configs)
+        ]
+
+    def test_batch_matches_single_evaluators(self):
+        values = evaluate_batch(self.user, self.achievements)
+
+        for achievement in self.achievements:
+            self.assertEqual(
+                values[achievement.id],
+                evaluate_condition(self.user, achievement),
+                achievement.name,
+            )
+
+    def test_full_check_uses_grouped_queries_and_bulk_writes(self):
+        # achievementy + stany + habit_days + streaki + mood + jeden INSERT
+        with self.assertNumQueries(6):
+            check_user_achievements(self.user)
+
+        self.assertEqual(
+            UserAchievement.objects.filter(user=self.user).count(),
+            len(self.achievements),
+        )
+
+
+# domyślny (produkcyjny) backend "thread", tylko krótsze okno łączenia
+@override_settings(ACHIEVEMENT_QUEUE={"WORKERS": 2, "COALESCE_SECONDS": 0.2})
+class JobQueueTests(TransactionTestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+    def _achievement(self, condition_type, **config):
+        return Achievement.objects.create(
+            name=condition_type,
+            difficulty=self.diff,
+            condition_type=condition_type,
+            condition_config=config,
+        )
+
+    def test_toggle_defers_evaluation_to_worker(self):
+        achievement = self._achievement("any_habit_days", target=2)
+        habit = Habit.objects.create(user=self.user, title="Run", difficulty=self.diff)
+
+        for day in ["2025-01-01", "2025-01-02"]:
+            res = self.client.post(
+                f"/api/habits/{habit.id}/toggle-day/",
+                {"date": day},
+                format="json",
+            )
+            self.assertEqual(res.status_code, 200)
+
+        self.assertTrue(job_queue.wait_until_idle(timeout=5))
+
+        ua = UserAchievement.objects.get(user=self.user, achievement=achievement)
+        self.assertEqual(ua.current_value, 2)
+        self.assertTrue(ua.is_completed)
+
+    def test_events_in_window_are_coalesced(self):
+        achievement = self._achievement("notes_count", target=10)
+
+        with mock.patch.object(
+            job_queue, "check_user_achievements", wraps=job_queue.check_user_achievements
+        ) as check, mock.patch.object(
+            job_queue, "handle_event", wraps=job_queue.handle_event
+        ) as single:
+            for i in range(3):
+                RandomNote.objects.create(user=self.user, content=str(i))
+                job_queue.schedule_event(self.user, EVENT_NOTE, delta=1)
+
+            self.assertTrue(job_queue.wait_until_idle(timeout=5))
+
+        single.assert_not_called()
+        check.assert_called_once()
+
+        ua = UserAchievement.objects.get(user=self.user, achievement=achievement)
+        self.assertEqual(ua.current_value, 3)
@@ -1,32 +1,32 @@
 from apps.achievements.services.achievement_engine import update_user_achievement
-from rest_framework import generics, status
+from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db import models
 
+from apps.achievements.services.job_queue import schedule_time_checks
+from apps.common.services import user_cache
+from apps.sync.mixins import SyncETagMixin
 from .models import Achievement, UserAchievement
 from .serializers import (
     AchievementSerializer,
     UserAchievementSerializer,
 )
 
-from apps.gamification.utils import get_user
 
 
-class AchievementListCreate(generics.ListCreateAPIView):
+class AchievementListCreate(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = AchievementSerializer
+    sync_tables = ("achievements",)
 
     def get_queryset(self):
-        user = get_user()
+        user = self.request.user
 
         # systemowe + custom usera
-        return Achievement.objects.filter(
-            models.Q(user__isnull=True) | models.Q(user=user)
-        )
+        return Achievement.objects.for_user(user).select_related("difficulty")
 
     def perform_create(self, serializer):
-        user = get_user()
+        user = self.request.user
         achievement = serializer.save(user=user)
 
         # auto create user state
@@ -41,14 +41,16 @@ class AchievementDetail(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = AchievementSerializer
 
     def get_queryset(self):
-        user = get_user()
-        return Achievement.objects.filter(
-            models.Q(user__isnull=True) | models.Q(user=user)
-        )
+        user = self.request.user
+
+        # systemowe tylko do odczytu — edycja/usuwanie wyłącznie własnych
+        if self.request.method in permissions.SAFE_METHODS:
+            return Achievement.objects.for_user(user)
+        return Achievement.objects.owned_by(user)
 
     def perform_update(self, serializer):
         achievement = serializer.save()
-        user = get_user()
+        user = self.request.user
 
         from apps.achievements.services.achievement_engine import (
             update_user_achievement,
@@ -62,12 +64,12 @@ class AchievementDetail(generics.RetrieveUpdateDestroyAPIView):
         ua.target_value = get_target_value(achievement)
         ua.is_completed = False
         ua.completed_at = None
-        ua.save(update_fields=["target_value", "is_completed", "completed_at"])
+        ua.save(update_fields=["target_value", "is_completed", "completed_at", "updated_at"])
 
         update_user_achievement(user, achievement)
 
     def perform_destroy(self, instance):
-        user = get_user()
+        user = self.request.user
 
         UserAchievement.objects.filter(
             user=user,
@@ -81,17 +83,28 @@ class UserAchievementList(generics.ListAPIView):
 
     def get_queryset(self):
         return UserAchievement.objects.filter(
-            user=get_user()
-        ).select_related("achievement")    
+            user=self.request.user
+        ).select_related("achievement__difficulty")
+
+    def list(self, request, *args, **kwargs):
+        schedule_time_checks(request.user)
+
+        data = user_cache.get_or_compute(
+            request.user,
+            "user_achievements",
+            (user_cache.ACHIEVEMENTS,),
+            lambda: list(self.get_serializer(self.get_queryset(), many=True).data),
+        )
+        return Response(data)
     
 
 
 class ManualUnlockAchievementView(APIView):
     def post(self, request, pk):
-        user = get_user()
+        user = request.user
 
         try:
-            achievement = Achievement.objects.get(pk=pk)
+            achievement = Achievement.objects.for_user(user).get(pk=pk)
         except Achievement.DoesNotExist:
             return Response({"detail": "Not found"}, status=404)
 
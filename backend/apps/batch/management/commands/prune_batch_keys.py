@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.batch.services.operations import prune_operations
+
+
+class Command(BaseCommand):
+    help = "Usuwa zapamiętane wyniki /api/batch/ starsze niż BATCH['KEY_DAYS']."
+
+    def handle(self, *args, **options):
+        deleted = prune_operations()
+        self.stdout.write(f"[BATCH] pruned {deleted} idempotency keys")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:30
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('gamification', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('op', models.CharField(max_length=40)),
+                ('status', models.PositiveSmallIntegerField()),
+                ('response', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='gamification.user')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='batchop_created_idx')],
+                'unique_together': {('user', 'key')},
+            },
+        ),
+    ]
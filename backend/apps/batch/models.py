@@ -0,0 +1,30 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from apps.common.managers import UserScopedManager
+
+
+class BatchOperation(models.Model):
+    """
+    Wynik operacji z /api/batch/ zapamiętany pod kluczem klienta.
+    Powtórzona kolejka (zerwane połączenie w trakcie) dostaje zapisany wynik
+    zamiast drugiego przyznania XP.
+    """
+
+    user = models.ForeignKey("gamification.User", on_delete=models.CASCADE)
+    key = models.CharField(max_length=64)
+    op = models.CharField(max_length=40)
+    status = models.PositiveSmallIntegerField()
+    response = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = UserScopedManager()
+
+    class Meta:
+        unique_together = ("user", "key")
+        indexes = [
+            models.Index(fields=["created_at"], name="batchop_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
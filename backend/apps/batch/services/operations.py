@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.achievements.services.achievement_engine import EVENT_NOTE
+from apps.achievements.services.job_queue import deferred_events, schedule_event
+from apps.batch.models import BatchOperation
+from apps.challenges.models import UserChallenge
+from apps.gamification.services.xp_batch import collect_xp
+from apps.goals.models import Goal
+from apps.habits.models import Habit
+from apps.habits.serializers import HabitDaySerializer
+from apps.habits.services.day_toggle import toggle_day
+from apps.mood.serializers import MoodEntrySerializer
+from apps.notes.serializers import RandomNoteSerializer
+from apps.todos.models import TodoTask
+
+
+def _config():
+    return getattr(settings, "BATCH", {})
+
+
+class BatchError(ValueError):
+    """
+    Niepoprawne żądanie jako całość — nic nie zostało wykonane.
+    """
+
+
+def _owned(model, user, pk):
+    obj = get_object_or_404(model.objects.for_user(user), pk=pk)
+    # ten sam obiekt usera co w batchu — bez dodatkowego zapytania
+    obj.user = user
+    return obj
+
+
+# --- operacje: (user, params, context) -> dict odpowiedzi ---
+
+def _toggle_habit_day(user, params, context):
+    habit = _owned(Habit, user, params.get("habit_id"))
+
+    date_str = params.get("date")
+    if date_str:
+        try:
+            day = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"date": "Invalid date format"})
+    else:
+        day = timezone.localdate()
+
+    obj, xp, already_completed = toggle_day(habit, day, params.get("status"))
+
+    return {
+        "day": HabitDaySerializer(obj).data,
+        "xp_gained": xp,
+        "already_completed": already_completed,
+    }
+
+
+def _complete_todo(user, params, context):
+    task = _owned(TodoTask, user, params.get("task_id"))
+    xp = task.complete()
+
+    return {"task_id": task.id, "xp_gained": xp or 0, "already_completed": xp is None}
+
+
+def _complete_goal(user, params, context):
+    goal = _owned(Goal, user, params.get("goal_id"))
+    xp = goal.complete()
+
+    return {"goal_id": goal.id, "xp_gained": xp or 0, "already_completed": xp is None}
+
+
+def _complete_challenge(user, params, context):
+    challenge = _owned(UserChallenge, user, params.get("user_challenge_id"))
+    xp = challenge.complete()
+
+    return {
+        "user_challenge_id": challenge.id,
+        "xp_gained": xp or 0,
+        "already_completed": xp is None,
+    }
+
+
+def _create_note(user, params, context):
+    serializer = RandomNoteSerializer(data=params, context=context)
+    serializer.is_valid(raise_exception=True)
+    serializer.save(user=user)
+
+    schedule_event(user, EVENT_NOTE, delta=1)
+
+    return serializer.data
+
+
+def _create_mood(user, params, context):
+    serializer = MoodEntrySerializer(data=params, context=context)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+    return serializer.data
+
+
+OPERATIONS = {
+    "habit.toggle_day": _toggle_habit_day,
+    "todo.complete": _complete_todo,
+    "goal.complete": _complete_goal,
+    "challenge.complete": _complete_challenge,
+    "note.create": _create_note,
+    "mood.create": _create_mood,
+}
+
+
+def _validate(operations):
+    if not isinstance(operations, list):
+        raise BatchError("`operations` must be a list")
+
+    limit = _config().get("MAX_OPERATIONS", 200)
+    if len(operations) > limit:
+        raise BatchError(f"Too many operations (max {limit})")
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise BatchError(f"Operation {index} must be an object")
+
+        if operation.get("op") not in OPERATIONS:
+            raise BatchError(f"Operation {index}: unknown op {operation.get('op')!r}")
+
+        key = operation.get("key")
+        if not isinstance(key, str) or not key or len(key) > 64:
+            raise BatchError(f"Operation {index}: `key` must be a string of 1-64 chars")
+
+
+def _run(user, operation, context, awards, jobs):
+    """
+    Jedna operacja w savepoincie -> (status, odpowiedź). Błąd cofa tylko ją,
+    razem z zebranymi przez nią nagrodami XP i eventami.
+    """
+
+    params = {name: value for name, value in operation.items() if name not in ("op", "key")}
+    marks = len(awards), len(jobs)
+
+    try:
+        with transaction.atomic():
+            return 200, OPERATIONS[operation["op"]](user, params, context)
+    # ValueError / TypeError: parametr złego typu (np. status={"a": 1}) — 400 tylko dla tej operacji
+    except (Http404, serializers.ValidationError, IntegrityError, ValueError, TypeError) as exc:
+        del awards[marks[0]:]
+        del jobs[marks[1]:]
+
+        if isinstance(exc, Http404):
+            return 404, {"detail": "Not found"}
+        if isinstance(exc, serializers.ValidationError):
+            return 400, exc.detail
+        if isinstance(exc, IntegrityError):
+            return 409, {"detail": "Conflict"}
+        return 400, {"detail": str(exc)}
+
+
+def apply_batch(user, operations, context=None):
+    """
+    Wykonuje listę operacji po kolei w jednej transakcji.
+
+    - `key` każdej operacji jest kluczem idempotencji: znany klucz zwraca zapisany
+      wynik (replayed=True) bez ponownego wykonania,
+    - XP ze wszystkich operacji idzie jednym add_xp_batch,
+    - achievementy są liczone raz, na końcu.
+    """
+
+    _validate(operations)
+    context = context or {}
+
+    keys = [operation["key"] for operation in operations]
+    known = {
+        done.key: done
+        for done in BatchOperation.objects.filter(user=user, key__in=keys)
+    }
+
+    results = []
+    recorded = []
+
+    with transaction.atomic(), deferred_events(user) as jobs, collect_xp(user) as awards:
+        for operation in operations:
+            key = operation["key"]
+
+            if key in known:
+                done = known[key]
+                results.append(
+                    {"key": key, "status": done.status, "data": done.response, "replayed": True}
+                )
+                continue
+
+            status, data = _run(user, operation, context, awards, jobs)
+
+            done = BatchOperation(
+                user=user,
+                key=key,
+                op=operation["op"],
+                status=status,
+                response=data,
+            )
+            known[key] = done
+            recorded.append(done)
+
+            results.append({"key": key, "status": status, "data": data, "replayed": False})
+
+        xp_gained = sum(xp for xp, _, _ in awards)
+
+        BatchOperation.objects.bulk_create(recorded)
+
+    return {
+        "results": results,
+        "xp_gained": xp_gained,
+        "total_xp": user.total_xp,
+        "current_level": user.current_level,
+    }
+
+
+def prune_operations(now=None):
+    horizon = (now or timezone.now()) - timedelta(days=_config().get("KEY_DAYS", 30))
+    deleted, _ = BatchOperation.objects.filter(created_at__lt=horizon).delete()
+    return deleted
@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.achievements.models import Achievement, UserAchievement
+from apps.achievements.services import job_queue
+from apps.batch.models import BatchOperation
+from apps.common.models import DifficultyType
+from apps.gamification.models import AuthToken, User, XPDailyRollup, XPLog
+from apps.habits.models import Habit, HabitDay
+from apps.mood.models import MoodEntry
+from apps.notes.models import RandomNote
+from apps.todos.models import TodoCategory, TodoTask
+
+
+@override_settings(ACHIEVEMENT_QUEUE={"BACKEND": "immediate"})
+class BatchTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+        self.client = APIClient()
+        token = AuthToken.issue(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        self.habit = Habit.objects.create(user=self.user, title="Read", difficulty=self.diff)
+        category = TodoCategory.objects.create(name="General", difficulty=self.diff)
+        self.task = TodoTask.objects.create(user=self.user, content="Call", category=category)
+
+        self.operations = [
+            {"op": "habit.toggle_day", "key": "a1", "habit_id": self.habit.id, "date": "2025-01-01"},
+            {"op": "habit.toggle_day", "key": "a2", "habit_id": self.habit.id, "date": "2025-01-02"},
+            {"op": "todo.complete", "key": "a3", "task_id": self.task.id},
+            {"op": "note.create", "key": "a4", "content": "offline"},
+            {"op": "mood.create", "key": "a5", "mood": "good", "date": "2025-01-02", "time": "08:00"},
+        ]
+
+    def _post(self, operations):
+        return self.client.post("/api/batch/", {"operations": operations}, format="json")
+
+    def test_operations_share_one_xp_write_and_one_achievement_pass(self):
+        achievement = Achievement.objects.create(
+            name="Two days",
+            difficulty=self.diff,
+            condition_type="any_habit_days",
+            condition_config={"target": 2},
+        )
+
+        with mock.patch.object(
+            job_queue, "check_user_achievements", wraps=job_queue.check_user_achievements
+        ) as check, mock.patch.object(
+            job_queue, "handle_event", wraps=job_queue.handle_event
+        ) as handle, CaptureQueriesContext(connection) as queries:
+            res = self._post(self.operations)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([r["status"] for r in res.data["results"]], [200] * 5)
+
+        # 2 dni + todo + mood
+        self.assertEqual(XPLog.objects.filter(user=self.user).count(), 4)
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "gamification_xplog"')]
+        self.assertEqual(len(inserts), 1)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.total_xp, res.data["xp_gained"])
+        self.assertEqual(res.data["total_xp"], self.user.total_xp)
+        self.assertEqual(
+            sum(XPDailyRollup.objects.filter(user=self.user).values_list("xp_sum", flat=True)),
+            self.user.total_xp,
+        )
+
+        self.assertEqual(check.call_count, 1)
+        handle.assert_not_called()
+        ua = UserAchievement.objects.get(user=self.user, achievement=achievement)
+        self.assertTrue(ua.is_completed)
+
+        self.assertTrue(TodoTask.objects.get(pk=self.task.pk).is_completed)
+        self.assertEqual(RandomNote.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(MoodEntry.objects.filter(user=self.user).count(), 1)
+
+    def test_replayed_keys_are_not_applied_twice(self):
+        first = self._post(self.operations)
+        total_xp = first.data["total_xp"]
+
+        second = self._post(self.operations)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(all(r["replayed"] for r in second.data["results"]))
+        self.assertEqual(second.data["results"][0]["data"], first.data["results"][0]["data"])
+        self.assertEqual(second.data["xp_gained"], 0)
+        self.assertEqual(second.data["total_xp"], total_xp)
+
+        self.assertEqual(
+            HabitDay.objects.get(habit=self.habit, date="2025-01-01").status,
+            HabitDay.STATUS_COMPLETED,
+        )
+        self.assertEqual(RandomNote.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(BatchOperation.objects.filter(user=self.user).count(), 5)
+
+    def test_failed_operation_is_isolated(self):
+        other = User.objects.create()
+        foreign = Habit.objects.create(user=other, title="Foreign", difficulty=self.diff)
+
+        res = self._post([
+            {"op": "habit.toggle_day", "key": "b1", "habit_id": foreign.id},
+            {"op": "mood.create", "key": "b2", "mood": "nope", "date": "2025-01-01", "time": "08:00"},
+            {"op": "habit.toggle_day", "key": "b4", "habit_id": self.habit.id, "status": {"a": 1}},
+            {"op": "todo.complete", "key": "b5", "task_id": {"a": 1}},
+            {"op": "todo.complete", "key": "b3", "task_id": self.task.id},
+        ])
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([r["status"] for r in res.data["results"]], [404, 400, 400, 400, 200])
+        self.assertFalse(HabitDay.objects.filter(habit=self.habit).exists())
+        self.assertFalse(HabitDay.objects.filter(habit=foreign).exists())
+        self.assertEqual(XPLog.objects.filter(user=self.user).count(), 1)
+
+    def test_malformed_batch_is_rejected_whole(self):
+        res = self._post(self.operations + [{"op": "habit.delete", "key": "x"}])
+
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(XPLog.objects.exists())
+        self.assertFalse(BatchOperation.objects.exists())
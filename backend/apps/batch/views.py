@@ -0,0 +1,34 @@
+from django.db import IntegrityError
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .services.operations import BatchError, apply_batch
+
+
+class BatchView(APIView):
+    """
+    POST /api/batch/  {"operations": [{"op": "todo.complete", "key": "<uuid>", "task_id": 5}, ...]}
+    Kolejka akcji z trybu offline — wykonana po kolei w jednej transakcji.
+    Każda operacja ma własny status w `results`; błąd jednej nie cofa pozostałych.
+    """
+
+    def post(self, request):
+        operations = request.data.get("operations") if hasattr(request.data, "get") else None
+
+        try:
+            result = apply_batch(
+                request.user,
+                operations,
+                context={"request": request},
+            )
+        except BatchError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            # ta sama kolejka wysłana równolegle — druga próba dostanie replay
+            return Response(
+                {"detail": "Batch already in progress"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(result, status=status.HTTP_200_OK)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0006_delete_challengehistory'),
+        ('gamification', '0008_authtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challengedefinition',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='custom_challenges', to='gamification.user'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0007_user_scoping'),
+        ('gamification', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userchallenge',
+            index=models.Index(fields=['user', 'challenge_type', 'is_completed'], name='uchallenge_user_type_done_idx'),
+        ),
+    ]
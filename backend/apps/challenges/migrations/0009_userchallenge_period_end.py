@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:33
+
+from datetime import datetime, time, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+PERIOD_DAYS = {"daily": 1, "weekly": 7}
+
+
+def fill_period_end(apps, schema_editor):
+    UserChallenge = apps.get_model("challenges", "UserChallenge")
+
+    challenges = list(
+        UserChallenge.objects.select_related("challenge_type").filter(period_end__isnull=True)
+    )
+
+    for challenge in challenges:
+        days = PERIOD_DAYS.get(challenge.challenge_type.name)
+        if days is None:
+            continue
+
+        end = challenge.start_date + timedelta(days=days)
+        challenge.period_end = timezone.make_aware(datetime.combine(end, time.min))
+
+    UserChallenge.objects.bulk_update(challenges, ["period_end"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0008_hot_path_indexes'),
+        ('gamification', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userchallenge',
+            name='period_end',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userchallenge',
+            index=models.Index(fields=['user', 'is_completed', 'period_end'], name='uchallenge_user_open_end_idx'),
+        ),
+        migrations.RunPython(fill_period_end, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0009_userchallenge_period_end'),
+        ('gamification', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challengetag',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='custom_challenge_tags', to='gamification.user'),
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 from apps.gamification.services.xp_calculator import calculate_xp
+from apps.common.managers import UserScopedManager
 
 class ChallengeType(models.Model):
     name = models.CharField(
@@ -20,6 +21,18 @@ class ChallengeType(models.Model):
 class ChallengeTag(models.Model):
     name = models.CharField(max_length=30, unique=True)
 
+    # systemowy czy customowy usera
+    user = models.ForeignKey(
+        "gamification.User",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="custom_challenge_tags",
+    )
+
+    objects = UserScopedManager()
+    user_scope_shared = True
+
     def __str__(self):
         return self.name
 
@@ -35,9 +48,21 @@ class ChallengeDefinition(models.Model):
         on_delete=models.PROTECT,
     )
     tags = models.ManyToManyField(ChallengeTag, blank=True)
+
+    # systemowy czy customowy usera
+    user = models.ForeignKey(
+        "gamification.User",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="custom_challenges",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedManager()
+    user_scope_shared = True
+
     def __str__(self):
         return self.title
 
@@ -59,25 +84,67 @@ class UserChallenge(models.Model):
     start_date = models.DateField(auto_now_add=True)
     weekly_deadline = models.DateField(null=True, blank=True)
 
+    # koniec okresu (północ czasu lokalnego) — liczony przy zapisie start_date
+    period_end = models.DateTimeField(null=True, blank=True)
+
     is_completed = models.BooleanField(default=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def start_weekly_if_needed(self):
-        if self.challenge_type.name == "weekly" and not self.weekly_deadline:
-            self.weekly_deadline = self.start_date + timedelta(days=7)
-            self.save(update_fields=["weekly_deadline"])
+    objects = UserScopedManager()
+
+    # dni trwania wyzwania od start_date
+    PERIOD_DAYS = {
+        "daily": 1,
+        "weekly": 7,
+    }
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "challenge_type", "is_completed"],
+                name="uchallenge_user_type_done_idx",
+            ),
+            models.Index(
+                fields=["user", "is_completed", "period_end"],
+                name="uchallenge_user_open_end_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+
+        # nowe albo ponownie rozpoczęte wyzwanie
+        if update_fields is None or "start_date" in update_fields:
+            self.set_period()
+
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "weekly_deadline", "period_end"}
+
+        super().save(*args, **kwargs)
+
+    def set_period(self):
+        start = self.start_date or timezone.localdate()
+        days = self.PERIOD_DAYS.get(self.challenge_type.name)
+
+        if days is None:
+            self.weekly_deadline = None
+            self.period_end = None
+            return
+
+        end = start + timedelta(days=days)
+        self.weekly_deadline = end if self.challenge_type.name == "weekly" else None
+        self.period_end = timezone.make_aware(datetime.combine(end, time.min))
 
     @property
     def weekly_progress_days(self):
-        if self.challenge_type.name != "weekly" or not self.weekly_deadline:
+        if self.challenge_type.name != "weekly" or not self.period_end:
             return None
 
-        today = timezone.now().date()
-        days_passed = (today - self.start_date).days + 1
+        days_left = (timezone.localtime(self.period_end).date() - timezone.localdate()).days
 
-        return max(1, min(7, days_passed))
+        return max(1, min(7, 8 - days_left))
 
     def complete(self):
         if self.is_completed:
@@ -40,6 +40,14 @@ class ChallengeDefinitionSerializer(serializers.ModelSerializer):
         required=False,
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # tylko tagi widoczne dla usera (systemowe + jego)
+        request = self.context.get("request")
+        if request is not None:
+            self.fields["tags_ids"].child_relation.queryset = ChallengeTag.objects.for_user(request.user)
+
     class Meta:
         model = ChallengeDefinition
         fields = [
@@ -62,7 +70,8 @@ class ChallengeDefinitionSerializer(serializers.ModelSerializer):
         return instance
 
 class UserChallengeSerializer(serializers.ModelSerializer):
-    challenge = serializers.SerializerMethodField()
+    # zagnieżdżony serializer buduje pola raz na listę, nie per wiersz
+    challenge = ChallengeDefinitionSerializer(source="definition", read_only=True)
     progress_days = serializers.SerializerMethodField()
     challenge_type = serializers.CharField(
         source="challenge_type.name",
@@ -77,12 +86,11 @@ class UserChallengeSerializer(serializers.ModelSerializer):
             "challenge_type",
             "start_date",
             "weekly_deadline",
+            "period_end",
             "progress_days",
             "is_completed",
         ]
-
-    def get_challenge(self, obj):
-        return ChallengeDefinitionSerializer(obj.definition).data
+        read_only_fields = ["period_end"]
 
     def get_progress_days(self, obj):
         return obj.weekly_progress_days
@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 from django.test import TestCase
-from apps.challenges.models import ChallengeDefinition, ChallengeType, UserChallenge
+from django.utils import timezone
+from apps.challenges.models import ChallengeDefinition, ChallengeTag, ChallengeType, UserChallenge
 from apps.common.models import DifficultyType
 from apps.gamification.models import User
 from rest_framework.test import APIClient
@@ -43,6 +46,24 @@ class UserChallengeUnitTests(TestCase):
 
         self.assertTrue(uc.is_completed)
 
+    def test_weekly_period_end_drives_progress_days(self):
+        weekly = ChallengeType.objects.create(name="weekly")
+        uc = UserChallenge.objects.create(
+            user=self.user,
+            definition=self.definition,
+            challenge_type=weekly,
+        )
+
+        self.assertEqual(uc.weekly_deadline, uc.start_date + timedelta(days=7))
+        self.assertEqual(timezone.localtime(uc.period_end).date(), uc.weekly_deadline)
+        self.assertEqual(uc.weekly_progress_days, 1)
+
+        uc.start_date -= timedelta(days=3)
+        uc.save(update_fields=["start_date"])
+        uc.refresh_from_db()
+
+        self.assertEqual(uc.weekly_progress_days, 4)
+
 
 class ChallengeIntegrationTests(TestCase):
 
@@ -76,4 +97,30 @@ class ChallengeIntegrationTests(TestCase):
         self.assertEqual(complete_res.status_code, 200)
 
         self.user.refresh_from_db()
-        self.assertGreater(self.user.total_xp, 0)
\ No newline at end of file
+        self.assertGreater(self.user.total_xp, 0)
+
+    def test_random_challenge_filters_by_tags(self):
+        health = ChallengeTag.objects.create(name="health")
+        mind = ChallengeTag.objects.create(name="mind")
+
+        tagged = ChallengeDefinition.objects.create(
+            title="Tagged",
+            difficulty=self.diff,
+            type=self.type,
+        )
+        tagged.tags.set([health, mind])
+
+        for _ in range(5):
+            res = self.client.get(
+                f"/api/challenges/random/?type=daily&tags={health.id},{mind.id}"
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.data["id"], tagged.id)
+
+        UserChallenge.objects.create(
+            user=self.user,
+            definition=tagged,
+            challenge_type=self.type,
+        )
+        res = self.client.get(f"/api/challenges/random/?tags={health.id}")
+        self.assertEqual(res.status_code, 404)
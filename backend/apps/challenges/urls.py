@@ -4,7 +4,7 @@ from .views import (
     ChallengeDetail,
     ChallengeTagListCreate,
     ChallengeTagDetail,
-    ChallengeTypeListCreate,
+    ChallengeTypeList,
     AssignChallengeView,
     RandomChallengeView,
     ActiveChallengesView,
@@ -19,7 +19,7 @@ urlpatterns = [
     path("tags/", ChallengeTagListCreate.as_view(), name="challenge-tags"),
     path("tags/<int:pk>/", ChallengeTagDetail.as_view(), name="challenge-tag-detail"),
 
-    path("types/", ChallengeTypeListCreate.as_view(), name="challenge-types"),
+    path("types/", ChallengeTypeList.as_view(), name="challenge-types"),
 
     path("assign/", AssignChallengeView.as_view(), name="challenge-assign"),
     path("random/", RandomChallengeView.as_view(), name="challenge-random"),
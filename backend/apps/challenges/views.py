@@ -1,8 +1,10 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status, generics
+from rest_framework import permissions, status, generics
 from django.utils import timezone
-import random
+from apps.common.services import user_cache
+from apps.common.services.random_pick import pick_random
+from apps.sync.mixins import SyncETagMixin
 
 from .models import (
     ChallengeDefinition,
@@ -16,40 +18,45 @@ from .serializers import (
     ChallengeTagSerializer,
     UserChallengeSerializer,
 )
-from apps.gamification.utils import get_user
 
 
 class ActiveChallengesView(APIView):
     def get(self, request):
-        user = get_user()
+        # progress_days zależy od dzisiejszej daty
+        data = user_cache.get_or_compute(
+            request.user,
+            "active_challenges",
+            (user_cache.CHALLENGES,),
+            lambda: self._build(request.user),
+            params=(timezone.now().date(),),
+        )
 
-        daily = UserChallenge.objects.filter(
-            user=user,
-            is_completed=False,
-            challenge_type__name="daily",
-        ).first()
+        return Response(data, status=status.HTTP_200_OK)
 
-        weekly = UserChallenge.objects.filter(
-            user=user,
-            is_completed=False,
-            challenge_type__name="weekly",
+    def _build(self, user):
+        # zagnieżdżony "challenge" (source="definition") czyta typ i trudność z select_related,
+        # tagi z prefetchu; progress_days liczone z period_end — stała liczba zapytań
+        qs = (
+            UserChallenge.objects.filter(user=user, is_completed=False)
+            .select_related("challenge_type", "definition__type", "definition__difficulty")
+            .prefetch_related("definition__tags")
         )
 
-        return Response(
-            {
-                "daily": UserChallengeSerializer(daily).data if daily else None,
-                "weekly": UserChallengeSerializer(weekly, many=True).data,
-            },
-            status=status.HTTP_200_OK,
-        )
+        daily = qs.filter(challenge_type__name="daily").first()
+        weekly = qs.filter(challenge_type__name="weekly")
+
+        return {
+            "daily": UserChallengeSerializer(daily).data if daily else None,
+            "weekly": UserChallengeSerializer(weekly, many=True).data,
+        }
 
 class AssignChallengeView(APIView):
     def post(self, request):
-        user = get_user()
+        user = request.user
         challenge_id = request.data.get("challenge")
 
         try:
-            definition = ChallengeDefinition.objects.get(pk=challenge_id)
+            definition = ChallengeDefinition.objects.for_user(user).get(pk=challenge_id)
         except ChallengeDefinition.DoesNotExist:
             return Response(
                 {"detail": "Challenge not found"},
@@ -88,10 +95,8 @@ class AssignChallengeView(APIView):
         if existing and existing.is_completed:
             existing.is_completed = False
             existing.start_date = timezone.now().date()
-            existing.weekly_deadline = None
-            existing.save(update_fields=["is_completed", "start_date", "weekly_deadline"])
-
-            existing.start_weekly_if_needed()
+            # save() przelicza weekly_deadline / period_end od nowego start_date
+            existing.save(update_fields=["is_completed", "start_date", "updated_at"])
 
             return Response(
                 UserChallengeSerializer(existing).data,
@@ -104,8 +109,6 @@ class AssignChallengeView(APIView):
             challenge_type=challenge_type,
         )
 
-        uc.start_weekly_if_needed()
-
         return Response(
             UserChallengeSerializer(uc).data,
             status=status.HTTP_201_CREATED,
@@ -114,19 +117,24 @@ class AssignChallengeView(APIView):
 
 class RandomChallengeView(APIView):
     def get(self, request):
-        user = get_user()
+        user = request.user
         type_name = request.GET.get("type")
         tags = request.GET.get("tags")
         difficulty_id = request.GET.get("difficulty_id")
 
-        qs = ChallengeDefinition.objects.all()
+        qs = ChallengeDefinition.objects.for_user(user)
 
         if type_name:
             qs = qs.filter(type__name__iexact=type_name)
 
         if tags:
             tag_ids = [int(x) for x in tags.split(",") if x.strip()]
-            qs = qs.filter(tags__in=tag_ids).distinct()
+
+            # subquery po tabeli m2m zamiast JOIN + DISTINCT
+            tagged = ChallengeDefinition.tags.through.objects.filter(
+                challengetag_id__in=tag_ids,
+            ).values("challengedefinition_id")
+            qs = qs.filter(id__in=tagged)
 
         active_defs = UserChallenge.objects.filter(
             user=user,
@@ -144,13 +152,13 @@ class RandomChallengeView(APIView):
         
             
 
-        if not qs.exists():
+        picked = pick_random(qs)
+        if picked is None:
             return Response(
                 {"error": "no_available"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        picked = random.choice(list(qs))
         return Response(
             ChallengeDefinitionSerializer(picked).data,
             status=status.HTTP_200_OK,
@@ -159,7 +167,7 @@ class RandomChallengeView(APIView):
 
 class CompleteUserChallengeView(APIView):
     def post(self, request, pk):
-        user = get_user()
+        user = request.user
 
         try:
             uc = UserChallenge.objects.get(pk=pk, user=user)
@@ -183,7 +191,7 @@ class CompleteUserChallengeView(APIView):
 
 class DiscardUserChallengeView(APIView):
     def post(self, request, pk):
-        user = get_user()
+        user = request.user
 
         try:
             uc = UserChallenge.objects.get(pk=pk, user=user)
@@ -199,29 +207,55 @@ class DiscardUserChallengeView(APIView):
         return Response({"detail": "discarded"}, status=status.HTTP_200_OK)
 
 
-class ChallengeListCreate(generics.ListCreateAPIView):
-    queryset = ChallengeDefinition.objects.all()
+class ChallengeListCreate(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = ChallengeDefinitionSerializer
+    sync_tables = ("challenge_definitions",)
+
+    def get_queryset(self):
+        # systemowe + custom usera
+        return (
+            ChallengeDefinition.objects.for_user(self.request.user)
+            .select_related("type", "difficulty")
+            .prefetch_related("tags")
+        )
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
 
 
 class ChallengeDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = ChallengeDefinition.objects.all()
     serializer_class = ChallengeDefinitionSerializer
 
+    def get_queryset(self):
+        # systemowe tylko do odczytu — edycja/usuwanie wyłącznie własnych
+        if self.request.method in permissions.SAFE_METHODS:
+            return ChallengeDefinition.objects.for_user(self.request.user)
+        return ChallengeDefinition.objects.owned_by(self.request.user)
+
 
 class ChallengeTagListCreate(generics.ListCreateAPIView):
-    queryset = ChallengeTag.objects.all()
     serializer_class = ChallengeTagSerializer
 
+    def get_queryset(self):
+        return ChallengeTag.objects.for_user(self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
 
 class ChallengeTagDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = ChallengeTag.objects.all()
     serializer_class = ChallengeTagSerializer
 
+    def get_queryset(self):
+        # systemowe tylko do odczytu — edycja/usuwanie wyłącznie własnych
+        if self.request.method in permissions.SAFE_METHODS:
+            return ChallengeTag.objects.for_user(self.request.user)
+        return ChallengeTag.objects.owned_by(self.request.user)
+
     def destroy(self, request, *args, **kwargs):
         tag = self.get_object()
 
-        if ChallengeTag.objects.count() <= 1:
+        if ChallengeTag.objects.for_user(request.user).count() <= 1:
             return Response(
                 {"detail": "Cannot delete the last remaining tag."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -236,7 +270,7 @@ class ChallengeTagDetail(generics.RetrieveUpdateDestroyAPIView):
         return super().destroy(request, *args, **kwargs)
 
 
-class ChallengeTypeListCreate(generics.ListCreateAPIView):
+# typy (daily / weekly) to stały słownik — tylko do odczytu
+class ChallengeTypeList(generics.ListAPIView):
     queryset = ChallengeType.objects.all()
     serializer_class = ChallengeTypeSerializer
-
@@ -0,0 +1,284 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.challenges.models import ChallengeDefinition, ChallengeType, UserChallenge
+from apps.common.models import DifficultyType
+from apps.gamification.models import User, XPLog
+from apps.goals.models import Goal, GoalPeriod
+from apps.habits.models import Habit, HabitDay
+from apps.mood.models import MoodEntry
+from apps.todos.models import TodoCategory, TodoTask
+
+
+# (model, nazwa indeksu) — indeksy z migracji hot_path_indexes.
+# Kolumny bool są na końcu: Django renderuje is_x=False jako NOT "is_x",
+# czego SQLite nie użyje do seeka — wtedy indeks filtruje je jako covering.
+BENCHMARKED_INDEXES = [
+    (TodoTask, "todo_user_cat_done_idx"),
+    (Goal, "goal_user_period_arch_idx"),
+    (Goal, "goal_user_done_idx"),
+    (UserChallenge, "uchallenge_user_type_done_idx"),
+    (HabitDay, "habitday_habit_status_idx"),
+    (MoodEntry, "mood_user_mood_idx"),
+    (XPLog, "xplog_user_created_idx"),
+]
+
+BATCH_SIZE = 5000
+
+
+def _index(model, name):
+    return next(index for index in model._meta.indexes if index.name == name)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeduje testową bazę (domyślnie 1M HabitDay) i porównuje plany zapytań "
+        "hot pathów bez i z indeksami złożonymi. Nie dotyka bazy aplikacji."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--habit-days", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--habits-per-user", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=20, help="Powtórzenia każdego zapytania.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+        try:
+            started = time.perf_counter()
+            context = self._seed(options)
+            self.stdout.write(f"seed: {time.perf_counter() - started:.1f}s")
+
+            queries = self._queries(context)
+
+            with connection.schema_editor() as editor:
+                for model, name in BENCHMARKED_INDEXES:
+                    editor.remove_index(model, _index(model, name))
+
+            before = self._measure(queries, options["repeat"])
+
+            with connection.schema_editor() as editor:
+                for model, name in BENCHMARKED_INDEXES:
+                    editor.add_index(model, _index(model, name))
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            after = self._measure(queries, options["repeat"])
+
+            for label in queries:
+                plan_before, ms_before = before[label]
+                plan_after, ms_after = after[label]
+
+                self.stdout.write(f"\n== {label}")
+                self.stdout.write(f"  bez indeksu: {ms_before:8.3f} ms  | {plan_before}")
+                self.stdout.write(f"  z indeksem:  {ms_after:8.3f} ms  | {plan_after}")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    # --- dane ---
+
+    def _seed(self, options):
+        rng = self.rng
+
+        difficulty = DifficultyType.objects.create(name="easy", order=1)
+        periods = [GoalPeriod.objects.create(name=name) for name in ["weekly", "monthly", "yearly"]]
+        types = [ChallengeType.objects.create(name=name) for name in ["daily", "weekly"]]
+        categories = [
+            TodoCategory.objects.create(name=f"Category {i}", difficulty=difficulty)
+            for i in range(5)
+        ]
+        definitions = ChallengeDefinition.objects.bulk_create(
+            ChallengeDefinition(
+                title=f"Challenge {i}",
+                difficulty=difficulty,
+                type=types[i % 2],
+            )
+            for i in range(50)
+        )
+
+        users = User.objects.bulk_create(User() for _ in range(options["users"]))
+
+        habits = Habit.objects.bulk_create(
+            Habit(user=user, title=f"Habit {i}", motivation_reason="", difficulty=difficulty)
+            for user in users
+            for i in range(options["habits_per_user"])
+        )
+
+        days_per_habit = max(1, options["habit_days"] // len(habits))
+        first_day = date.today() - timedelta(days=days_per_habit - 1)
+        statuses = [HabitDay.STATUS_COMPLETED] * 6 + [HabitDay.STATUS_SKIPPED, HabitDay.STATUS_EMPTY]
+
+        self._bulk(
+            HabitDay,
+            (
+                HabitDay(
+                    habit=habit,
+                    date=first_day + timedelta(days=offset),
+                    status=rng.choice(statuses),
+                )
+                for habit in habits
+                for offset in range(days_per_habit)
+            ),
+        )
+
+        per_user = max(1, options["habit_days"] // 20 // len(users))
+
+        self._bulk(
+            TodoTask,
+            (
+                TodoTask(
+                    user=user,
+                    content="task",
+                    category=rng.choice(categories),
+                    is_completed=rng.random() < 0.8,
+                )
+                for user in users
+                for _ in range(per_user)
+            ),
+        )
+        self._bulk(
+            Goal,
+            (
+                Goal(
+                    user=user,
+                    title="goal",
+                    motivation_reason="",
+                    period=rng.choice(periods),
+                    difficulty=difficulty,
+                    is_completed=rng.random() < 0.5,
+                    is_archived=rng.random() < 0.7,
+                )
+                for user in users
+                for _ in range(per_user // 5)
+            ),
+        )
+        self._bulk(
+            UserChallenge,
+            (
+                UserChallenge(
+                    user=user,
+                    definition=definition,
+                    challenge_type=definition.type,
+                    is_completed=rng.random() < 0.95,
+                )
+                for user in users
+                for definition in rng.choices(definitions, k=per_user // 5)
+            ),
+        )
+        self._bulk(
+            MoodEntry,
+            (
+                MoodEntry(
+                    user=user,
+                    mood=rng.choice(MoodEntry.MOOD_CHOICES)[0],
+                    date=first_day + timedelta(days=offset),
+                    time="12:00",
+                )
+                for user in users
+                for offset in range(days_per_habit)
+            ),
+        )
+        self._bulk(
+            XPLog,
+            (
+                XPLog(user=user, source="habit", xp=10)
+                for user in users
+                for _ in range(per_user * 2)
+            ),
+        )
+
+        # auto_now_add nadpisuje created_at przy insercie — rozkładamy wpisy na ostatni rok
+        now = timezone.now()
+        ids = list(XPLog.objects.order_by("id").values_list("id", flat=True))
+        chunk = max(1, len(ids) // 365)
+        for day in range(365):
+            part = ids[day * chunk:(day + 1) * chunk]
+            if part:
+                XPLog.objects.filter(id__range=(part[0], part[-1])).update(
+                    created_at=now - timedelta(days=day),
+                )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        return {
+            "user": users[0],
+            "habit": habits[0],
+            "category": categories[0],
+            "period": periods[0],
+            "challenge_type": types[0],
+            "today": date.today(),
+            "now": now,
+        }
+
+    def _bulk(self, model, objects):
+        batch = []
+
+        for obj in objects:
+            batch.append(obj)
+
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_create(batch)
+                batch = []
+
+        if batch:
+            model.objects.bulk_create(batch)
+
+    # --- zapytania ---
+
+    def _queries(self, c):
+        user = c["user"]
+
+        return {
+            "TodoTask(user, category, is_completed)": TodoTask.objects.filter(
+                user=user, is_completed=False, category=c["category"],
+            ),
+            "Goal(user, period, is_archived)": Goal.objects.filter(
+                user=user, is_archived=False, period=c["period"],
+            ),
+            "Goal(user, is_completed)": Goal.objects.filter(
+                user=user, is_completed=True,
+            ),
+            "UserChallenge(user, challenge_type, is_completed)": UserChallenge.objects.filter(
+                user=user, is_completed=False, challenge_type=c["challenge_type"],
+            ),
+            "HabitDay(habit, status, date)": HabitDay.objects.filter(
+                habit=c["habit"],
+                status=HabitDay.STATUS_COMPLETED,
+                date__range=(c["today"] - timedelta(days=30), c["today"]),
+            ),
+            "MoodEntry(user, mood)": MoodEntry.objects.filter(
+                user=user, mood="good",
+            ),
+            "XPLog(user, created_at)": XPLog.objects.filter(
+                user=user, created_at__gte=c["now"] - timedelta(days=7),
+            ),
+        }
+
+    def _measure(self, queries, repeat):
+        results = {}
+
+        for label, qs in queries.items():
+            qs = qs.order_by().values_list("id", flat=True)
+            plan = " / ".join(line.strip() for line in qs.explain().splitlines() if line.strip())
+
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(qs.all())
+                elapsed = (time.perf_counter() - started) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+
+            results[label] = (plan, best)
+
+        return results
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.services.synthetic_data import seed_load
+
+
+class Command(BaseCommand):
+    help = (
+        "Generuje duży, deterministyczny zbiór danych (habity ze streakami, todo, nastrój, cele, "
+        "challenge'e, sobriety, XP zgodne z total_xp) do odtwarzania problemów wydajności lokalnie."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--years", type=int, default=3)
+        parser.add_argument("--density", type=float, default=0.7, help="Aktywność userów, 0-1.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["years"] < 1:
+            raise CommandError("--users i --years muszą być dodatnie")
+        if not 0 < options["density"] <= 1:
+            raise CommandError("--density musi być w przedziale (0, 1]")
+
+        report = seed_load(
+            users=options["users"],
+            years=options["years"],
+            density=options["density"],
+            seed=options["seed"],
+        )
+
+        for table, rows in report["rows"].items():
+            self.stdout.write(f"{table:>20}: {rows}")
+
+        self.stdout.write(
+            f"{sum(report['rows'].values())} wierszy, generowanie {report['generate_seconds']}s, "
+            f"achievementy {report['achievements_seconds']}s"
+        )
+        ids = report["user_ids"]
+        self.stdout.write(f"userzy: {ids[0]}-{ids[-1]}")
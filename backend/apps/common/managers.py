@@ -0,0 +1,58 @@
+from django.db import models
+
+
+class UserScopedQuerySet(models.QuerySet):
+    """
+    .for_user(user) — dane jednego usera (do odczytu, razem ze wspólnymi).
+    .owned_by(user) — tylko wiersze usera, bez wspólnych (do zapisu/usuwania).
+
+    Model ustawia:
+      user_lookup = "user"            ścieżka do usera ("habit__user" dla HabitDay itp.)
+      user_scope_shared = True        wiersze z user=NULL są wspólne (systemowe) i widoczne dla wszystkich
+    """
+
+    def for_user(self, user):
+        lookup = getattr(self.model, "user_lookup", "user")
+
+        if getattr(self.model, "user_scope_shared", False):
+            return self.filter(
+                models.Q(**{f"{lookup}__isnull": True}) | models.Q(**{lookup: user})
+            )
+
+        return self.filter(**{lookup: user})
+
+    def owned_by(self, user):
+        lookup = getattr(self.model, "user_lookup", "user")
+        return self.filter(**{lookup: user})
+
+
+UserScopedManager = models.Manager.from_queryset(UserScopedQuerySet)
+
+
+def owner_id(instance, origin=None):
+    """
+    id usera, do którego należy wiersz (wg user_lookup modelu); None dla wierszy wspólnych.
+    origin — obiekt, od którego zaczęło się usuwanie (sygnał post_delete); przy kaskadzie
+    z rodzica pozwala nie pytać bazy o rodzica dla każdego dziecka.
+    """
+
+    lookup = getattr(type(instance), "user_lookup", "user")
+
+    if "__" not in lookup:
+        return getattr(instance, f"{lookup}_id")
+
+    parent_name, rest = lookup.split("__", 1)
+    field = instance._meta.get_field(parent_name)
+    parent = instance._state.fields_cache.get(parent_name)
+
+    if parent is None and isinstance(origin, field.related_model):
+        parent = origin
+
+    if parent is not None:
+        return owner_id(parent)
+
+    return (
+        field.related_model.objects.filter(pk=getattr(instance, field.attname))
+        .values_list(rest, flat=True)
+        .first()
+    )
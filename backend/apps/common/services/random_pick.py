@@ -0,0 +1,50 @@
+import random
+
+from django.db.models import Max, Min
+
+
+STRATEGY_OFFSET = "offset"
+STRATEGY_PK = "pk"
+
+
+def _pick_by_offset(qs, rng):
+    count = qs.count()
+
+    if not count:
+        return None
+
+    return qs.order_by("pk")[rng.randrange(count)]
+
+
+def _pick_by_pk(qs, rng):
+    bounds = qs.aggregate(low=Min("pk"), high=Max("pk"))
+
+    if bounds["low"] is None:
+        return None
+
+    target = rng.randint(bounds["low"], bounds["high"])
+
+    # dziura w id (usunięte wiersze / filtr) -> najbliższy następny, a jak brak to poprzedni
+    return (
+        qs.filter(pk__gte=target).order_by("pk").first()
+        or qs.filter(pk__lt=target).order_by("-pk").first()
+    )
+
+
+STRATEGIES = {
+    STRATEGY_OFFSET: _pick_by_offset,
+    STRATEGY_PK: _pick_by_pk,
+}
+
+
+def pick_random(qs, *, strategy=STRATEGY_OFFSET, rng=None):
+    """
+    Losowy wiersz z querysetu bez ładowania wszystkich do Pythona (None gdy pusty).
+
+    offset -> COUNT + jeden wiersz po OFFSET; równomierny rozkład
+    pk     -> MIN/MAX(pk) + seek po indeksie pk; O(log n) niezależnie od offsetu,
+              ale wiersze po dziurach w id są losowane częściej
+    rng    -> własny random.Random (np. z seedem), domyślnie moduł random
+    """
+
+    return STRATEGIES[strategy](qs, rng or random)
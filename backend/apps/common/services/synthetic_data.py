@@ -0,0 +1,591 @@
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta
+from functools import lru_cache
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.achievements.models import Achievement, UserAchievement
+from apps.achievements.services.achievement_engine import check_user_achievements
+from apps.challenges.models import ChallengeDefinition, ChallengeTag, ChallengeType, UserChallenge
+from apps.common.models import DifficultyType
+from apps.common.services import user_cache
+from apps.gamification.models import User, XPDailyRollup, XPLog
+from apps.gamification.services.level_calculator import calculate_level
+from apps.gamification.services.xp_calculator import calculate_xp
+from apps.goals.models import Goal, GoalPeriod, GoalStep, period_end_after
+from apps.habits.models import Habit, HabitDay, HabitStreak
+from apps.mood.models import MoodEntry
+from apps.notes.models import RandomNote
+from apps.settings.models import DashboardTile, ModuleDefinition, UserPreference
+from apps.sobriety.models import Sobriety, SobrietyRelapse
+from apps.todos.models import TodoCategory, TodoTask
+
+
+# wierszy na jedno executemany
+BATCH_SIZE = 5000
+
+# słowniki jak w scripts/seed_dev_data.py — seed_load dokłada się do istniejącej bazy dev
+DIFFICULTIES = [("Trivial", 1), ("Easy", 2), ("Medium", 3), ("Hard", 4)]
+GOAL_PERIODS = ["weekly", "monthly", "yearly"]
+CHALLENGE_TYPES = ["daily", "weekly"]
+
+# minimum definicji challenge'y per typ (dobierane syntetycznie, gdy baza ma mniej)
+MIN_DEFINITIONS = {"daily": 20, "weekly": 8}
+
+TILE_MODULES = {
+    "level_gamification": "gamification",
+    "biggest_streak": "habits",
+    "random_habit": "habits",
+    "random_todo": "todos",
+    "goal_week": "goals",
+    "goal_month": "goals",
+    "goal_year": "goals",
+    "daily_challenge": "challenges",
+    "weekly_challenge": "challenges",
+    "random_note": "notes",
+}
+
+PREFERENCE_KEYS = [key for key, _ in UserPreference.PREFERENCE_KEYS]
+
+# systemowe achievementy (name, condition_type, condition_config, trudność)
+ACHIEVEMENTS = [
+    ("First steps", "any_habit_days", {"target": 10}, "Easy"),
+    ("Habit hundred", "any_habit_days", {"target": 100}, "Medium"),
+    ("Habit thousand", "any_habit_days", {"target": 1000}, "Hard"),
+    ("Week streak", "any_habit_streak", {"target": 7}, "Easy"),
+    ("Month streak", "any_habit_streak", {"target": 30}, "Medium"),
+    ("Quarter streak", "any_habit_streak", {"target": 90}, "Hard"),
+    ("Task runner", "todo_completed", {"target": 100}, "Easy"),
+    ("Task machine", "todo_completed", {"target": 1000}, "Hard"),
+    ("Goal getter", "goal_completed", {"target": 10}, "Medium"),
+    ("Yearly goals", "goal_completed_by_period", {"target": 3, "period": "yearly"}, "Hard"),
+    ("Note taker", "notes_count", {"target": 50}, "Easy"),
+    ("Mood journal", "mood_logged_days", {"target": 100}, "Medium"),
+    ("Good days", "specific_mood_count", {"target": 50, "mood": "good"}, "Medium"),
+    ("Clean month", "any_sobriety_duration", {"target": 30, "unit": "days"}, "Medium"),
+    ("Level 10", "level_reached", {"target": 10}, "Medium"),
+    ("Level 50", "level_reached", {"target": 50}, "Hard"),
+    ("XP 10k", "xp_reached", {"target": 10_000}, "Hard"),
+]
+
+MOODS = [mood for mood, _ in MoodEntry.MOOD_CHOICES]
+
+
+@lru_cache(maxsize=None)
+def _xp(module, difficulty, period=None):
+    return calculate_xp(module=module, difficulty=difficulty.lower(), period=period)
+
+
+class _Table:
+    """
+    Wiersze jako krotki i INSERT przez executemany — bez instancji modeli i sygnałów.
+    Id nadajemy sami (od max(id) + 1), żeby od razu wiązać klucze obce.
+    """
+
+    def __init__(self, model, columns):
+        quote = connection.ops.quote_name
+        columns = ["id", *columns]
+
+        self.model = model
+        self.sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote(model._meta.db_table),
+            ", ".join(quote(column) for column in columns),
+            ", ".join(["%s"] * len(columns)),
+        )
+        self.next_id = (model._base_manager.aggregate(top=Max("id"))["top"] or 0) + 1
+        self.pending = []
+        self.rows = 0
+
+    def reserve(self):
+        pk = self.next_id
+        self.next_id += 1
+        return pk
+
+    def add(self, *values, pk=None):
+        pk = pk or self.reserve()
+        self.pending.append((pk, *values))
+
+        if len(self.pending) >= BATCH_SIZE:
+            self.flush()
+
+        return pk
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        with connection.cursor() as cursor:
+            cursor.executemany(self.sql, self.pending)
+
+        self.rows += len(self.pending)
+        self.pending = []
+
+
+class _Generator:
+
+    def __init__(self, rng, years, density, now):
+        self.rng = rng
+        self.density = density
+        # strefy raz na start — helpery django.utils.timezone są za wolne na miliony wierszy
+        self.tz = timezone.get_current_timezone()
+        self.db_tz = None if connection.features.supports_timezones else connection.timezone
+        self.now = now.astimezone(self.tz)
+        self.today = self.now.date()
+        self.first_day = self.today - timedelta(days=years * 365 - 1)
+        self.stamp = self._db(now)
+
+        self._dates = {}
+        self._catalog()
+
+        self.tables = {
+            "users": _Table(User, ["total_xp", "current_level", "created_at", "updated_at", "xp_multiplier"]),
+            "habits": _Table(Habit, [
+                "user_id", "title", "description", "motivation_reason", "color",
+                "difficulty_id", "is_active", "created_at", "updated_at",
+            ]),
+            "habit_days": _Table(HabitDay, ["habit_id", "date", "status", "xp_awarded", "created_at", "updated_at"]),
+            "habit_streaks": _Table(HabitStreak, [
+                "habit_id", "current_streak", "longest_streak", "last_completed_date", "run_start", "updated_at",
+            ]),
+            "xp_logs": _Table(XPLog, ["user_id", "source", "source_id", "xp", "created_at"]),
+            "xp_rollups": _Table(XPDailyRollup, ["user_id", "date", "source", "xp_sum", "event_count"]),
+            "todo_categories": _Table(TodoCategory, ["name", "difficulty_id", "color", "user_id", "updated_at"]),
+            "todo_tasks": _Table(TodoTask, [
+                "user_id", "content", "custom_difficulty_id", "category_id", "is_completed",
+                "completed_at", "order", "created_at", "updated_at",
+            ]),
+            "notes": _Table(RandomNote, ["user_id", "content", "created_at", "updated_at"]),
+            "mood_entries": _Table(MoodEntry, [
+                "user_id", "mood", "date", "time", "note", "xp_awarded", "created_at", "updated_at",
+            ]),
+            "goals": _Table(Goal, [
+                "user_id", "title", "description", "motivation_reason", "floor_goal", "target_goal",
+                "ceiling_goal", "period_id", "difficulty_id", "created_at", "updated_at",
+                "is_completed", "completed_at", "is_archived", "archived_at", "period_end",
+            ]),
+            "goal_steps": _Table(GoalStep, ["goal_id", "title", "is_completed", "order", "created_at", "updated_at"]),
+            "user_challenges": _Table(UserChallenge, [
+                "user_id", "definition_id", "challenge_type_id", "start_date", "weekly_deadline",
+                "period_end", "is_completed", "created_at", "updated_at",
+            ]),
+            "sobriety": _Table(Sobriety, [
+                "user_id", "name", "description", "motivation_reason", "started_at", "ended_at",
+                "is_active", "created_at", "updated_at",
+            ]),
+            "sobriety_relapses": _Table(SobrietyRelapse, ["sobriety_id", "occurred_at", "note", "updated_at"]),
+            "module_settings": _Table(ModuleDefinition, ["user_id", "module", "is_enabled", "updated_at"]),
+            "dashboard_tiles": _Table(DashboardTile, [
+                "user_id", "key", "name", "is_enabled", "module_dependency", "updated_at",
+            ]),
+            "preferences": _Table(UserPreference, ["user_id", "key", "value", "updated_at"]),
+        }
+
+    # --- słowniki ---
+
+    def _catalog(self):
+        self.difficulties = [
+            DifficultyType.objects.get_or_create(name=name, defaults={"order": order})[0]
+            for name, order in DIFFICULTIES
+        ]
+        self.by_name = {difficulty.name: difficulty for difficulty in self.difficulties}
+        self.periods = {name: GoalPeriod.objects.get_or_create(name=name)[0] for name in GOAL_PERIODS}
+        self.types = {name: ChallengeType.objects.get_or_create(name=name)[0] for name in CHALLENGE_TYPES}
+
+        tag, _ = ChallengeTag.objects.get_or_create(name="General")
+        self.definitions = {}
+
+        for name, challenge_type in self.types.items():
+            for i in range(MIN_DEFINITIONS[name]):
+                definition, created = ChallengeDefinition.objects.get_or_create(
+                    title=f"Synthetic {name} {i + 1}",
+                    defaults={"type": challenge_type, "difficulty": self.rng.choice(self.difficulties[1:])},
+                )
+                if created:
+                    definition.tags.add(tag)
+
+            self.definitions[name] = [
+                (definition.id, definition.difficulty.name)
+                for definition in ChallengeDefinition.objects.filter(type=challenge_type, user=None)
+                .select_related("difficulty")
+                .order_by("id")
+            ]
+
+        for name, condition_type, config, difficulty in ACHIEVEMENTS:
+            Achievement.objects.get_or_create(
+                name=name,
+                user=None,
+                defaults={
+                    "condition_type": condition_type,
+                    "condition_config": config,
+                    "difficulty": self.by_name[difficulty],
+                },
+            )
+
+    # --- wartości w formacie bazy ---
+
+    def _db(self, moment):
+        # jak adapt_datetimefield_value: bazy bez stref dostają naiwny czas w strefie połączenia
+        if self.db_tz is None:
+            return moment
+        return str(moment.astimezone(self.db_tz).replace(tzinfo=None))
+
+    def _date(self, day):
+        value = self._dates.get(day)
+        if value is None:
+            value = self._dates[day] = connection.ops.adapt_datefield_value(day)
+        return value
+
+    def _at(self, day, minutes):
+        moment = datetime.combine(day, dt_time(minutes // 60, minutes % 60), tzinfo=self.tz)
+        return min(moment, self.now)
+
+    def _days(self, first, last):
+        for offset in range((last - first).days + 1):
+            yield first + timedelta(days=offset)
+
+    # --- user ---
+
+    def user(self):
+        rng = self.rng
+        tables = self.tables
+
+        user_id = tables["users"].reserve()
+        created = self._at(self.first_day, 9 * 60)
+
+        self.user_id = user_id
+        self.total_xp = 0
+        self.rollups = {}
+
+        self._settings()
+        self._habits()
+        self._todos()
+        self._notes()
+        self._moods()
+        self._goals()
+        self._challenges()
+        self._sobriety()
+
+        for (day, source), (xp_sum, count) in sorted(self.rollups.items()):
+            tables["xp_rollups"].add(user_id, self._date(day), source, xp_sum, count)
+
+        tables["users"].add(
+            self.total_xp,
+            calculate_level(self.total_xp),
+            self._db(created),
+            self.stamp,
+            1.0,
+            pk=user_id,
+        )
+
+        return user_id
+
+    def _log(self, source, source_id, xp, moment, stamp=None):
+        # jak User.add_xp: zerowe XP nie trafia do logu
+        if xp <= 0:
+            return
+
+        self.tables["xp_logs"].add(self.user_id, source, source_id, xp, stamp or self._db(moment))
+        self.total_xp += xp
+
+        # momenty są w strefie lokalnej — dzień jak TruncDate w rebuild_rollups
+        key = (moment.date(), source)
+        xp_sum, count = self.rollups.get(key, (0, 0))
+        self.rollups[key] = (xp_sum + xp, count + 1)
+
+    def _settings(self):
+        tables = self.tables
+
+        for module, _ in ModuleDefinition.MODULE_CHOICES:
+            tables["module_settings"].add(self.user_id, module, True, self.stamp)
+
+        for key, name in DashboardTile.TILE_KEYS:
+            tables["dashboard_tiles"].add(self.user_id, key, name, True, TILE_MODULES.get(key), self.stamp)
+
+        for key in PREFERENCE_KEYS:
+            tables["preferences"].add(self.user_id, key, None, self.stamp)
+
+    def _habits(self):
+        """
+        Łańcuch Markowa per habit: w trakcie serii dzień jest ukończony z dużym
+        prawdopodobieństwem (mniejszym w weekend), po przerwie seria wraca z mniejszym.
+        """
+
+        rng = self.rng
+        tables = self.tables
+        density = self.density
+        total_days = (self.today - self.first_day).days
+
+        keep = 0.78 + 0.2 * density
+        resume = 0.15 + 0.4 * density
+
+        for i in range(3 + round(12 * density)):
+            difficulty = rng.choice(self.difficulties[1:])
+            xp = _xp("habits", difficulty.name)
+
+            start = self.first_day + timedelta(days=rng.randint(0, total_days // 2))
+            is_active = rng.random() < 0.85
+            end = self.today if is_active else start + timedelta(days=rng.randint(30, (self.today - start).days + 30))
+            end = min(end, self.today)
+
+            habit_id = tables["habits"].add(
+                self.user_id, f"Habit {i + 1}", "", "", "#908bab",
+                difficulty.id, is_active, self._db(self._at(start, 8 * 60)), self.stamp,
+            )
+
+            running = True
+            streak = longest = 0
+            run_start = last = None
+
+            for day in self._days(start, end):
+                weekend = day.weekday() >= 5
+                done = rng.random() < (keep - 0.1 * weekend if running else resume)
+                running = done
+
+                if not done:
+                    # część przerw jest jawnie pominięta, reszta to brak wpisu
+                    if rng.random() < 0.3:
+                        moment = self._db(self._at(day, 21 * 60))
+                        tables["habit_days"].add(habit_id, self._date(day), HabitDay.STATUS_SKIPPED, False, moment, moment)
+                    continue
+
+                moment = self._at(day, 6 * 60 + int(rng.random() * 17 * 60))
+                stamp = self._db(moment)
+                day_id = tables["habit_days"].add(habit_id, self._date(day), HabitDay.STATUS_COMPLETED, True, stamp, stamp)
+                self._log("habit", day_id, xp, moment, stamp)
+
+                # jak streaks.rebuild_streak
+                if last is not None and (day - last).days == 1:
+                    streak += 1
+                else:
+                    streak = 1
+                    run_start = day
+
+                longest = max(longest, streak)
+                last = day
+
+            tables["habit_streaks"].add(
+                habit_id, streak, longest,
+                self._date(last) if last else None,
+                self._date(run_start) if run_start else None,
+                self.stamp,
+            )
+
+    def _todos(self):
+        rng = self.rng
+        tables = self.tables
+        density = self.density
+
+        categories = []
+        for i in range(rng.randint(2, 6)):
+            difficulty = rng.choice(self.difficulties)
+            category_id = tables["todo_categories"].add(f"Category {i + 1}", difficulty.id, None, self.user_id, self.stamp)
+            categories.append((category_id, difficulty))
+
+        order = {category_id: 0 for category_id, _ in categories}
+
+        for day in self._days(self.first_day, self.today):
+            for _ in range(sum(rng.random() < density for _ in range(3))):
+                category_id, difficulty = rng.choice(categories)
+                custom = rng.choice(self.difficulties) if rng.random() < 0.2 else None
+
+                created = self._at(day, 7 * 60 + int(rng.random() * 15 * 60))
+                age = (self.today - day).days
+                done = rng.random() < (0.92 if age > 14 else 0.4)
+                completed = min(created + timedelta(days=rng.randint(0, 7), hours=rng.randint(0, 12)), self.now) if done else None
+
+                task_id = tables["todo_tasks"].add(
+                    self.user_id, "Task", custom.id if custom else None, category_id, done,
+                    self._db(completed) if done else None, order[category_id],
+                    self._db(created), self._db(completed or created),
+                )
+                order[category_id] += 1
+
+                if done:
+                    self._log("todo", task_id, _xp("todos", (custom or difficulty).name), completed)
+
+    def _notes(self):
+        rng = self.rng
+        chance = 0.3 * self.density
+
+        for day in self._days(self.first_day, self.today):
+            if rng.random() < chance:
+                stamp = self._db(self._at(day, int(rng.random() * 24 * 60)))
+                self.tables["notes"].add(self.user_id, "Note", stamp, stamp)
+
+    def _moods(self):
+        rng = self.rng
+        chance = 0.3 + 0.6 * self.density
+        level = 2
+
+        for day in self._days(self.first_day, self.today):
+            # nastrój dryfuje zamiast skakać losowo między dniami
+            level = min(len(MOODS) - 1, max(0, level + rng.choice((-1, 0, 0, 0, 1))))
+
+            if rng.random() >= chance:
+                continue
+
+            minutes = 7 * 60 + int(rng.random() * 16 * 60)
+            moment = self._at(day, minutes)
+            stamp = self._db(moment)
+            note = "Note" if rng.random() < 0.25 else ""
+
+            mood_id = self.tables["mood_entries"].add(
+                self.user_id, MOODS[level], self._date(day),
+                connection.ops.adapt_timefield_value(dt_time(minutes // 60, minutes % 60)),
+                note, True, stamp, stamp,
+            )
+            self._log("mood", mood_id, _xp("mood", "Medium" if note else "Easy"), moment, stamp)
+
+    def _goals(self):
+        rng = self.rng
+        tables = self.tables
+        chance = {"weekly": 0.3, "monthly": 0.5, "yearly": 0.8}
+
+        for name, period in self.periods.items():
+            moment = self._at(self.first_day, 10 * 60)
+
+            while moment <= self.now:
+                end = period_end_after(name, moment)
+
+                if rng.random() < chance[name] * self.density:
+                    created = min(moment + timedelta(hours=rng.randint(0, 48)), self.now)
+                    difficulty = rng.choice(self.difficulties[1:])
+                    expired = end <= self.now
+                    done = rng.random() < 0.6 and (expired or rng.random() < 0.3)
+                    completed = min(created + (end - created) * rng.random(), self.now) if done else None
+
+                    goal_id = tables["goals"].add(
+                        self.user_id, f"{name.title()} goal", "", "", "", "", "",
+                        period.id, difficulty.id, self._db(created), self._db(completed or created),
+                        done, self._db(completed) if done else None,
+                        expired, self._db(end) if expired else None, self._db(end),
+                    )
+
+                    for order in range(rng.randint(0, 4)):
+                        tables["goal_steps"].add(
+                            goal_id, f"Step {order + 1}", done or rng.random() < 0.5, order,
+                            self._db(created), self._db(created),
+                        )
+
+                    if done:
+                        self._log("goal", goal_id, _xp("goals", difficulty.name, name), completed)
+
+                moment = end
+
+    def _challenges(self):
+        """
+        Przeszłe challenge'e są ukończone (porzucone są kasowane), otwarty może być
+        tylko ten z bieżącego okresu — jak przy AssignChallengeView.
+        """
+
+        rng = self.rng
+        density = self.density
+
+        for day in self._days(self.first_day, self.today):
+            if rng.random() < 0.4 * density:
+                self._challenge("daily", day, done=day < self.today or rng.random() < 0.5)
+
+            if day.weekday() == 0 and rng.random() < 0.5 * density:
+                self._challenge("weekly", day, done=(self.today - day).days >= 7 or rng.random() < 0.3)
+
+    def _challenge(self, name, day, done):
+        definition_id, difficulty = self.rng.choice(self.definitions[name])
+        challenge_type = self.types[name]
+
+        end = day + timedelta(days=UserChallenge.PERIOD_DAYS[name])
+        created = self._at(day, 8 * 60)
+        completed = min(created + timedelta(hours=self.rng.randint(1, 24 * (end - day).days - 9)), self.now)
+
+        challenge_id = self.tables["user_challenges"].add(
+            self.user_id, definition_id, challenge_type.id, self._date(day),
+            self._date(end) if name == "weekly" else None,
+            self._db(datetime.combine(end, dt_time.min, tzinfo=self.tz)),
+            done, self._db(created), self._db(completed if done else created),
+        )
+
+        if done:
+            self._log("challenge", challenge_id, _xp("challenges", difficulty, name), completed)
+
+    def _sobriety(self):
+        rng = self.rng
+        total_days = (self.today - self.first_day).days
+
+        for i in range(rng.randint(0, 3)):
+            started = self._at(self.first_day + timedelta(days=rng.randint(0, total_days)), 12 * 60)
+            sobriety_id = self.tables["sobriety"].reserve()
+
+            moment = started
+            relapse = None
+            while True:
+                moment += timedelta(days=rng.expovariate(1 / (30 + 150 * self.density)))
+                if moment >= self.now:
+                    break
+
+                relapse = moment
+                self.tables["sobriety_relapses"].add(sobriety_id, self._db(relapse), "", self._db(relapse))
+
+            # po ostatnim nawrocie: restart (nowy start) albo zakończona
+            ended = relapse is not None and rng.random() < 0.3
+            if relapse is not None and not ended:
+                started = min(relapse + timedelta(days=1), self.now)
+
+            self.tables["sobriety"].add(
+                self.user_id, f"Sobriety {i + 1}", "", "", self._db(started),
+                self._db(relapse) if ended else None, not ended,
+                self._db(started), self.stamp,
+                pk=sobriety_id,
+            )
+
+    def flush(self):
+        for table in self.tables.values():
+            table.flush()
+
+        # SQLite przesuwa sekwencję sam; inne bazy trzeba dogonić po jawnych id
+        models = [table.model for table in self.tables.values()]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+        return {name: table.rows for name, table in self.tables.items()}
+
+
+def seed_load(*, users, years, density, seed, now=None):
+    """
+    Generuje `users` userów z `years` latami historii; `density` (0-1) to aktywność
+    (liczba habitów, szansa wpisu w dany dzień). Ten sam seed i dzień = te same dane.
+    Zwraca liczbę wierszy per tabela oraz czasy etapów.
+    """
+
+    started = time.perf_counter()
+
+    if connection.vendor == "sqlite":
+        # indeksy milionów wierszy nie mieszczą się w domyślnym cache stron (2 MB)
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size = -262144")
+
+    with transaction.atomic():
+        generator = _Generator(random.Random(seed), years, density, now or timezone.now())
+        user_ids = [generator.user() for _ in range(users)]
+        rows = generator.flush()
+
+        generated = time.perf_counter()
+
+        # achievementy przez ten sam silnik co import — UserAchievement zgodne z danymi
+        for user in User.objects.filter(pk__in=user_ids):
+            check_user_achievements(user)
+
+    rows["user_achievements"] = UserAchievement.objects.filter(user_id__in=user_ids).count()
+
+    for user_id in user_ids:
+        user_cache.bump(user_id, *user_cache.ALL_RESOURCES)
+
+    return {
+        "user_ids": user_ids,
+        "rows": rows,
+        "generate_seconds": round(generated - started, 2),
+        "achievements_seconds": round(time.perf_counter() - generated, 2),
+    }
@@ -0,0 +1,109 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+
+# zasoby, których wersje są liczone per user (zapis -> bump -> stare wpisy nieosiągalne)
+HABITS = "habits"
+TODOS = "todos"
+GOALS = "goals"
+CHALLENGES = "challenges"
+MOOD = "mood"
+XP = "xp"
+ACHIEVEMENTS = "achievements"
+
+ALL_RESOURCES = (HABITS, TODOS, GOALS, CHALLENGES, MOOD, XP, ACHIEVEMENTS)
+
+# wiersze wspólne (user=NULL, np. systemowe achievementy) bumpują wersję wszystkich userów
+SHARED = "*"
+
+
+def _config():
+    return getattr(settings, "USER_CACHE", {})
+
+
+def is_enabled():
+    return _config().get("ENABLED", False)
+
+
+def _cache():
+    return caches[_config().get("ALIAS", "default")]
+
+
+def _version_key(owner, resource):
+    return f"uc:v:{owner}:{resource}"
+
+
+def _fresh_version():
+    # nie 0: po wyrzuceniu klucza wersji z cache nie trafimy w stary wpis
+    return time.time_ns()
+
+
+def _versions(user_id, resources):
+    cache = _cache()
+    keys = [
+        _version_key(owner, resource)
+        for resource in resources
+        for owner in (user_id, SHARED)
+    ]
+
+    found = cache.get_many(keys)
+
+    for key in keys:
+        if key not in found:
+            cache.add(key, _fresh_version(), timeout=None)
+            found[key] = cache.get(key)
+
+    return [found[key] for key in keys]
+
+
+def _bump_now(owner, resources):
+    cache = _cache()
+
+    for resource in resources:
+        key = _version_key(owner, resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _fresh_version(), timeout=None)
+
+
+def bump(user_id, *resources):
+    """
+    Unieważnia zcache'owane odczyty usera zależne od `resources`.
+    user_id=None -> zmiana wspólnych danych, unieważnia wszystkich.
+
+    W transakcji bump jest powtarzany po commicie, żeby odczyt, który zdążył
+    zapisać w cache jeszcze niezacommitowany stan, też się przeterminował.
+    """
+
+    owner = SHARED if user_id is None else user_id
+
+    _bump_now(owner, resources)
+
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump_now(owner, resources))
+
+
+def get_or_compute(user, name, resources, compute, *, params=()):
+    """
+    Read-through: wynik `compute()` pod kluczem (user, name, wersje zasobów, params).
+    """
+
+    if not is_enabled():
+        return compute()
+
+    versions = "-".join(str(v) for v in _versions(user.id, resources))
+    suffix = ":".join(str(p) for p in params)
+    key = f"uc:{user.id}:{name}:{versions}:{suffix}"
+
+    cache = _cache()
+    value = cache.get(key)
+
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=_config().get("TIMEOUT", 24 * 60 * 60))
+
+    return value
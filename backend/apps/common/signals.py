@@ -0,0 +1,40 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from apps.common.services import user_cache
+from apps.common.managers import owner_id
+
+
+# model -> zasób, którego wersję bumpuje zapis / usunięcie wiersza
+TRACKED = {
+    "habits.Habit": user_cache.HABITS,
+    "habits.HabitDay": user_cache.HABITS,
+    "todos.TodoTask": user_cache.TODOS,
+    "goals.Goal": user_cache.GOALS,
+    "challenges.UserChallenge": user_cache.CHALLENGES,
+    "challenges.ChallengeDefinition": user_cache.CHALLENGES,
+    "mood.MoodEntry": user_cache.MOOD,
+    "gamification.XPLog": user_cache.XP,
+    "achievements.UserAchievement": user_cache.ACHIEVEMENTS,
+    "achievements.Achievement": user_cache.ACHIEVEMENTS,
+}
+
+
+def _make_receiver(resource):
+    def receiver(sender, instance, origin=None, **kwargs):
+        user_cache.bump(owner_id(instance, origin), resource)
+
+    return receiver
+
+
+def connect():
+    for label, resource in TRACKED.items():
+        receiver = _make_receiver(resource)
+        post_save.connect(receiver, sender=label, weak=False, dispatch_uid=f"user_cache:save:{label}")
+
+        # dzieci (HabitDay) znikają kaskadą z rodzica, który bumpuje ten sam zasób;
+        # receiver na dziecku wyłączyłby fast delete kaskady
+        if "__" in getattr(apps.get_model(label), "user_lookup", "user"):
+            continue
+
+        post_delete.connect(receiver, sender=label, weak=False, dispatch_uid=f"user_cache:delete:{label}")
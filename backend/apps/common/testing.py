@@ -0,0 +1,86 @@
+import unittest
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+
+
+class _ClearCachesResult:
+    """
+    Każdy test zaczyna z pustym cache — id userów powtarzają się między testami
+    (wycofane transakcje), więc wpisy user_cache poprzedniego testu byłyby trafieniami.
+    """
+
+    def startTest(self, test):
+        for cache in caches.all(initialized_only=True):
+            cache.clear()
+        super().startTest(test)
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Testy z tagiem "perf" (duży seed, budżety czasu) tylko na żądanie: manage.py test --tag perf
+    """
+
+    def __init__(self, *args, tags=None, exclude_tags=None, **kwargs):
+        if "perf" not in (tags or ()):
+            exclude_tags = {*(exclude_tags or ()), "perf"}
+
+        super().__init__(*args, tags=tags, exclude_tags=exclude_tags, **kwargs)
+
+    def get_resultclass(self):
+        base = super().get_resultclass() or unittest.TextTestResult
+        return type("TestResult", (_ClearCachesResult, base), {})
+
+    def teardown_databases(self, old_config, **kwargs):
+        # worker kolejki achievementów nie może trafić na usuniętą bazę testową
+        from apps.achievements.services.job_queue import wait_until_idle
+
+        wait_until_idle(timeout=10)
+        super().teardown_databases(old_config, **kwargs)
+
+
+class QueryScalingMixin:
+    """
+    Dla TestCase z self.client: liczba zapytań endpointu nie może rosnąć z liczbą wierszy.
+
+        self.assertConstantQueries("/api/goals/", lambda n: make_goals(n))
+
+    `grow(n)` dokłada n wierszy; GET jest powtarzany dla każdego rozmiaru z `scaling_sizes`,
+    za każdym razem z pustym cache.
+    """
+
+    scaling_sizes = (10, 1000)
+
+    def _count_queries(self, url):
+        # każdy pomiar na zimno — bez trafień i dławików z poprzedniego GET
+        for cache in caches.all(initialized_only=True):
+            cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200, f"GET {url} -> {response.status_code}")
+        return [query["sql"] for query in queries.captured_queries]
+
+    def assertConstantQueries(self, url, grow, sizes=None):
+        sizes = sizes or self.scaling_sizes
+        rows = 0
+        runs = []
+
+        for size in sizes:
+            grow(size - rows)
+            rows = size
+            runs.append((size, self._count_queries(url)))
+
+        (small, baseline), (large, queries) = runs[0], runs[-1]
+
+        if len(queries) != len(baseline):
+            listing = "\n".join(queries[:20])
+            self.fail(
+                f"GET {url}: {len(baseline)} queries for {small} rows, "
+                f"{len(queries)} for {large} rows (N+1?). First queries:\n{listing}"
+            )
+
+        return len(queries)
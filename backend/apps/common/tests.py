@@ -1,3 +1,405 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.common.models import DifficultyType
+from apps.common.services import user_cache
+from apps.common.services.random_pick import pick_random, STRATEGY_PK
+from apps.common.services.synthetic_data import seed_load
+from apps.common.testing import QueryScalingMixin
+from apps.achievements.models import Achievement, UserAchievement
+from apps.challenges.models import ChallengeDefinition, ChallengeTag, ChallengeType, UserChallenge
+from apps.gamification.models import AuthToken, User, XPDailyRollup, XPLog
+from apps.gamification.services.level_calculator import calculate_level
+from apps.goals.models import Goal, GoalPeriod, GoalStep
+from apps.habits.models import Habit, HabitDay, HabitStreak
+from apps.habits.services.streaks import rebuild_streak
+from apps.notes.models import RandomNote
+from apps.sobriety.models import Sobriety, SobrietyRelapse
+from apps.todos.models import TodoCategory, TodoTask
+from datetime import date, datetime, timezone as dt_timezone
+from io import StringIO
+import itertools
+import random
+
+
+class UserScopingTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create()
+        self.other = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+        self.client = APIClient()
+        token = AuthToken.issue(self.other)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def test_for_user_follows_user_lookup(self):
+        habit = Habit.objects.create(user=self.owner, title="Read", difficulty=self.diff)
+        HabitDay.objects.create(habit=habit, date=date(2025, 1, 1))
+
+        self.assertEqual(HabitDay.objects.for_user(self.owner).count(), 1)
+        self.assertEqual(HabitDay.objects.for_user(self.other).count(), 0)
+
+    def test_shared_rows_are_visible_to_everyone(self):
+        system = TodoCategory.objects.create(name="General", difficulty=self.diff)
+        custom = TodoCategory.objects.create(name="Mine", difficulty=self.diff, user=self.owner)
+
+        self.assertEqual(
+            set(TodoCategory.objects.for_user(self.owner)),
+            {system, custom},
+        )
+        self.assertEqual(list(TodoCategory.objects.for_user(self.other)), [system])
+
+    def test_detail_views_hide_other_users_rows(self):
+        sobriety = Sobriety.objects.create(user=self.owner, name="Coffee")
+
+        res = self.client.get(f"/api/sobriety/{sobriety.id}/")
+        self.assertEqual(res.status_code, 404)
+
+        res = self.client.post(f"/api/sobriety/{sobriety.id}/relapse/", {}, format="json")
+        self.assertEqual(res.status_code, 404)
+
+        sobriety.refresh_from_db()
+        self.assertTrue(sobriety.is_active)
+
+    def test_created_category_belongs_to_request_user(self):
+        res = self.client.post(
+            "/api/todos/categories/",
+            {"name": "Work", "difficulty_id": self.diff.id},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+
+        category = TodoCategory.objects.get(pk=res.data["id"])
+        self.assertEqual(category.user, self.other)
+
+    def test_shared_rows_are_read_only(self):
+        system = TodoCategory.objects.create(name="General", difficulty=self.diff)
+        TodoCategory.objects.create(name="Mine", difficulty=self.diff, user=self.other)
+        TodoTask.objects.create(user=self.owner, content="Theirs", category=system)
+        challenge = ChallengeDefinition.objects.create(
+            title="Walk",
+            description="",
+            type=ChallengeType.objects.create(name="Daily"),
+            difficulty=self.diff,
+        )
+        achievement = Achievement.objects.create(
+            name="First", description="", difficulty=self.diff, condition_type="manual"
+        )
+
+        res = self.client.get(f"/api/todos/categories/{system.id}/")
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.delete(f"/api/todos/categories/{system.id}/")
+        self.assertEqual(res.status_code, 404)
+        self.assertEqual(TodoTask.objects.filter(user=self.owner).count(), 1)
+
+        res = self.client.patch(f"/api/challenges/{challenge.id}/", {"title": "x"}, format="json")
+        self.assertEqual(res.status_code, 404)
+
+        res = self.client.delete(f"/api/achievements/{achievement.id}/")
+        self.assertEqual(res.status_code, 404)
+        self.assertTrue(Achievement.objects.filter(pk=achievement.id).exists())
+
+    def test_challenge_tags_and_types_are_scoped(self):
+        system = ChallengeTag.objects.create(name="General")
+        theirs = ChallengeTag.objects.create(name="Theirs", user=self.owner)
+
+        res = self.client.get("/api/challenges/tags/")
+        self.assertEqual([tag["id"] for tag in res.data], [system.id])
+
+        res = self.client.patch(f"/api/challenges/tags/{system.id}/", {"name": "x"}, format="json")
+        self.assertEqual(res.status_code, 404)
+        res = self.client.delete(f"/api/challenges/tags/{theirs.id}/")
+        self.assertEqual(res.status_code, 404)
+        self.assertTrue(ChallengeTag.objects.filter(pk=theirs.id).exists())
+
+        res = self.client.post("/api/challenges/tags/", {"name": "Mine"}, format="json")
+        self.assertEqual(res.status_code, 201)
+        mine = ChallengeTag.objects.get(pk=res.data["id"])
+        self.assertEqual(mine.user, self.other)
+
+        res = self.client.patch(f"/api/challenges/tags/{mine.id}/", {"name": "Mine 2"}, format="json")
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.post("/api/challenges/types/", {"name": "weekly"}, format="json")
+        self.assertEqual(res.status_code, 405)
+
+    def test_manual_unlock_hides_other_users_achievements(self):
+        achievement = Achievement.objects.create(
+            user=self.owner, name="Mine", description="", difficulty=self.diff, condition_type="manual"
+        )
+
+        res = self.client.post(f"/api/achievements/{achievement.id}/unlock/", {}, format="json")
+        self.assertEqual(res.status_code, 404)
+
+
+class RandomPickTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create()
+        self.notes = [
+            RandomNote.objects.create(user=self.user, content=str(i))
+            for i in range(10)
+        ]
+
+    def test_empty_queryset_returns_none(self):
+        qs = RandomNote.objects.filter(content="missing")
+
+        self.assertIsNone(pick_random(qs))
+        self.assertIsNone(pick_random(qs, strategy=STRATEGY_PK))
+
+    def test_offset_pick_fetches_single_row(self):
+        qs = RandomNote.objects.for_user(self.user)
+
+        # COUNT + jeden wiersz
+        with self.assertNumQueries(2):
+            picked = pick_random(qs, rng=random.Random(3))
+
+        self.assertIn(picked, self.notes)
+        self.assertEqual(picked, pick_random(qs, rng=random.Random(3)))
+
+    def test_pk_pick_falls_back_across_gaps(self):
+        keep = self.notes[4]
+        RandomNote.objects.exclude(pk=keep.pk).delete()
+
+        for seed in range(10):
+            picked = pick_random(
+                RandomNote.objects.all(),
+                strategy=STRATEGY_PK,
+                rng=random.Random(seed),
+            )
+            self.assertEqual(picked, keep)
+
+
+# domyślnie wyłączony (LocMemCache nie jest współdzielony między workerami)
+@override_settings(USER_CACHE={"ENABLED": True, "ALIAS": "default", "TIMEOUT": 60})
+class UserCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create()
+        self.other = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+        self.habit = Habit.objects.create(user=self.user, title="Read", difficulty=self.diff)
+
+    def _habit_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        return res, [q["sql"] for q in ctx.captured_queries if "habits_" in q["sql"]]
+
+    def test_repeated_read_is_cache_hit(self):
+        _, first = self._habit_queries("/api/habits/streaks/")
+        _, second = self._habit_queries("/api/habits/streaks/")
+
+        self.assertTrue(first)
+        self.assertEqual(second, [])
+
+    def test_habit_day_write_invalidates_streak_and_month(self):
+        today = date.today()
+        month = f"/api/habits/month/?month={today:%Y-%m}&compact=1"
+
+        self.assertEqual(self.client.get("/api/habits/streaks/").data["biggest_streak"], 0)
+        self.client.get(month)
+
+        self.client.post(
+            f"/api/habits/{self.habit.id}/toggle-day/",
+            data={"date": today.isoformat()},
+            format="json",
+        )
+
+        self.assertEqual(self.client.get("/api/habits/streaks/").data["biggest_streak"], 1)
+        statuses = self.client.get(month).data["habits"][0]["statuses"]
+        self.assertEqual(statuses[today.day - 1], "2")
+
+    def test_versions_are_per_user_and_shared_rows_bump_everyone(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        def read():
+            return user_cache.get_or_compute(
+                self.user, "probe", (user_cache.ACHIEVEMENTS,), compute
+            )
+
+        self.assertEqual(read(), 1)
+
+        user_cache.bump(self.other.id, user_cache.ACHIEVEMENTS)
+        self.assertEqual(read(), 1)
+
+        # systemowy achievement (user=NULL) dotyczy wszystkich
+        Achievement.objects.create(name="First", condition_type="manual", difficulty=self.diff)
+        self.assertEqual(read(), 2)
+
+
+# liczymy zapytania ścieżki bez cache — powtórzony GET byłby trafieniem
+@override_settings(USER_CACHE={"ENABLED": False})
+class ListQueryScalingTests(QueryScalingMixin, TestCase):
+    """
+    Każda lista ma stałą liczbę zapytań — 10 i 1000 wierszy to ta sama liczba SQL.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create()
+        self.client = APIClient()
+        token = AuthToken.issue(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.serial = itertools.count()
+
+    def _difficulties(self, n):
+        # osobny wiersz na rekord — leniwe FK nie trafią w żaden cache
+        serials = [next(self.serial) for _ in range(n)]
+        return DifficultyType.objects.bulk_create(
+            DifficultyType(name=f"d{serial}", order=serial) for serial in serials
+        )
+
+    def test_habits(self):
+        def grow(n):
+            Habit.objects.bulk_create(
+                Habit(user=self.user, title=f"h{i}", difficulty=diff)
+                for i, diff in enumerate(self._difficulties(n))
+            )
+
+        self.assertConstantQueries("/api/habits/", grow)
+
+    def _grow_todos(self, n):
+        diffs = self._difficulties(n)
+        categories = TodoCategory.objects.bulk_create(
+            TodoCategory(user=self.user, name=f"c{i}", difficulty=diff)
+            for i, diff in enumerate(diffs)
+        )
+        TodoTask.objects.bulk_create(
+            TodoTask(user=self.user, content="t", category=category, custom_difficulty=diff)
+            for category, diff in zip(categories, diffs)
+        )
+
+    def test_todo_categories(self):
+        self.assertConstantQueries("/api/todos/categories/", self._grow_todos)
+
+    def test_todo_tasks(self):
+        self.assertConstantQueries("/api/todos/tasks/", self._grow_todos)
+
+    def test_goals_with_steps(self):
+        period = GoalPeriod.objects.create(name="monthly")
+
+        def grow(n):
+            goals = Goal.objects.bulk_create(
+                Goal(user=self.user, title="g", motivation_reason="m", period=period, difficulty=diff)
+                for diff in self._difficulties(n)
+            )
+            GoalStep.objects.bulk_create(
+                GoalStep(goal=goal, title="s", order=order)
+                for goal in goals
+                for order in range(2)
+            )
+
+        self.assertConstantQueries("/api/goals/", grow)
+
+    def _grow_challenges(self, n):
+        weekly, _ = ChallengeType.objects.get_or_create(name="weekly")
+        tags = [ChallengeTag.objects.get_or_create(name=name)[0] for name in ("a", "b")]
+
+        definitions = ChallengeDefinition.objects.bulk_create(
+            ChallengeDefinition(title=f"c{next(self.serial)}", difficulty=diff, type=weekly)
+            for diff in self._difficulties(n)
+        )
+        ChallengeDefinition.tags.through.objects.bulk_create(
+            ChallengeDefinition.tags.through(challengedefinition=definition, challengetag=tag)
+            for definition in definitions
+            for tag in tags
+        )
+        UserChallenge.objects.bulk_create(
+            UserChallenge(user=self.user, definition=definition, challenge_type=weekly)
+            for definition in definitions
+        )
+
+    def test_challenge_definitions(self):
+        self.assertConstantQueries("/api/challenges/", self._grow_challenges)
+
+    def test_active_challenges(self):
+        self.assertConstantQueries("/api/challenges/active/", self._grow_challenges)
+
+    def test_sobriety_with_relapses(self):
+        def grow(n):
+            sobrieties = Sobriety.objects.bulk_create(
+                Sobriety(user=self.user, name="s", motivation_reason="m") for _ in range(n)
+            )
+            SobrietyRelapse.objects.bulk_create(
+                SobrietyRelapse(sobriety=sobriety) for sobriety in sobrieties
+            )
+
+        self.assertConstantQueries("/api/sobriety/", grow)
+
+    def _grow_achievements(self, n):
+        achievements = Achievement.objects.bulk_create(
+            Achievement(user=self.user, name="a", condition_type="manual", difficulty=diff)
+            for diff in self._difficulties(n)
+        )
+        UserAchievement.objects.bulk_create(
+            UserAchievement(user=self.user, achievement=achievement, target_value=1)
+            for achievement in achievements
+        )
+
+    def test_achievements(self):
+        self.assertConstantQueries("/api/achievements/", self._grow_achievements)
+
+    def test_user_achievements(self):
+        self.assertConstantQueries("/api/achievements/user/", self._grow_achievements)
+
+
+class SeedLoadTests(TestCase):
+
+    def test_generated_history_is_consistent(self):
+        call_command("seed_load", users=2, years=1, density=0.6, seed=3, stdout=StringIO())
+
+        users = User.objects.exclude(xplog=None).distinct()
+        self.assertEqual(users.count(), 2)
+
+        for user in users:
+            logged = XPLog.objects.filter(user=user).aggregate(total=Sum("xp"))["total"]
+            rolled = XPDailyRollup.objects.filter(user=user).aggregate(total=Sum("xp_sum"))["total"]
+
+            self.assertEqual(user.total_xp, logged)
+            self.assertEqual(rolled, logged)
+            self.assertEqual(user.current_level, calculate_level(logged))
+
+            open_challenges = (
+                UserChallenge.objects.filter(user=user, is_completed=False)
+                .values("challenge_type")
+                .annotate(n=Count("id"))
+            )
+            self.assertTrue(all(row["n"] == 1 for row in open_challenges))
+
+        # zmaterializowane streaki = pełne przeliczenie z historii
+        for habit in Habit.objects.filter(user__in=users):
+            seeded = HabitStreak.objects.get(habit=habit)
+            rebuilt = rebuild_streak(habit)
+            self.assertEqual(
+                (seeded.current_streak, seeded.longest_streak, seeded.last_completed_date),
+                (rebuilt.current_streak, rebuilt.longest_streak, rebuilt.last_completed_date),
+            )
+
+        self.assertTrue(UserAchievement.objects.filter(user__in=users).exists())
+
+    def test_same_seed_generates_same_history(self):
+        now = datetime(2025, 6, 1, 12, tzinfo=dt_timezone.utc)
+
+        first, = seed_load(users=1, years=1, density=0.5, seed=9, now=now)["user_ids"]
+        second, = seed_load(users=1, years=1, density=0.5, seed=9, now=now)["user_ids"]
+
+        def history(user_id):
+            return (
+                User.objects.get(pk=user_id).total_xp,
+                list(HabitDay.objects.filter(habit__user_id=user_id).values_list("date", "status")),
+                list(TodoTask.objects.filter(user_id=user_id).values_list("is_completed", "completed_at")),
+            )
+
+        self.assertEqual(history(first), history(second))
@@ -0,0 +1,468 @@
+"""
+Budżety wydajności endpointów: liczba zapytań i czas na dużym seedzie
+(5 lat dni 30 habitów, 10k todo, 2k notatek, 1k wpisów nastroju, 200 achievementów).
+
+    python manage.py test --tag perf
+    PERF_RECORD=1 python manage.py test --tag perf   # nadpisuje perf_budgets.json
+
+Każdy URL z backend/urls.py ma swój przypadek w CASES. Zapisy idą w transakcji
+wycofywanej po pomiarze, więc każde powtórzenie widzi te same dane.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import statistics
+import time
+from datetime import datetime, time as dt_time, timedelta
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.achievements.models import Achievement
+from apps.achievements.services.achievement_engine import check_user_achievements
+from apps.challenges.models import ChallengeDefinition, ChallengeTag, ChallengeType, UserChallenge
+from apps.common.models import DifficultyType
+from apps.gamification.models import AuthToken, User, XPLog
+from apps.gamification.services.level_calculator import calculate_level
+from apps.gamification.services.xp_rollup import rebuild_rollups
+from apps.goals.models import Goal, GoalPeriod, GoalStep, period_end_after
+from apps.habits.models import Habit, HabitDay
+from apps.habits.services.streaks import rebuild_streak
+from apps.mood.models import MoodEntry
+from apps.notes.models import RandomNote
+from apps.settings.models import DashboardTile, ModuleDefinition, UserPreference
+from apps.settings.services import data_export
+from apps.sobriety.models import Sobriety, SobrietyRelapse
+from apps.todos.models import TodoCategory, TodoTask
+
+
+BUDGETS_PATH = Path(__file__).with_name("perf_budgets.json")
+
+RECORD = os.environ.get("PERF_RECORD") == "1"
+REPEAT = int(os.environ.get("PERF_REPEAT", 3))
+
+# przy PERF_RECORD: budżet czasu = zmierzona mediana * zapas, nie mniej niż minimum
+MS_HEADROOM = 3
+MS_FLOOR = 50
+
+YEARS = 5
+HABITS = 30
+TODOS = 10_000
+NOTES = 2_000
+MOODS = 1_000
+ACHIEVEMENTS = 200
+
+# (metoda, route z urls.py, parametry route -> klucz z self.ids, dane żądania)
+CASES = [
+    ("GET", "api/achievements/", {}, None),
+    ("GET", "api/achievements/<int:pk>/", {"pk": "achievement"}, None),
+    ("GET", "api/achievements/user/", {}, None),
+    ("POST", "api/achievements/<int:pk>/unlock/", {"pk": "manual_achievement"}, None),
+
+    ("POST", "api/batch/", {}, "batch"),
+
+    ("GET", "api/challenges/", {}, None),
+    ("GET", "api/challenges/<int:pk>/", {"pk": "definition"}, None),
+    ("GET", "api/challenges/tags/", {}, None),
+    ("GET", "api/challenges/tags/<int:pk>/", {"pk": "tag"}, None),
+    ("GET", "api/challenges/types/", {}, None),
+    ("POST", "api/challenges/assign/", {}, "assign"),
+    ("GET", "api/challenges/random/", {}, None),
+    ("GET", "api/challenges/active/", {}, None),
+    ("POST", "api/challenges/user-challenges/<int:pk>/complete/", {"pk": "user_challenge"}, None),
+    ("POST", "api/challenges/user-challenges/<int:pk>/discard/", {"pk": "user_challenge"}, None),
+
+    ("GET", "api/common/difficulties/", {}, None),
+
+    ("GET", "api/dashboard/", {}, None),
+
+    ("GET", "api/gamification/me/", {}, None),
+    ("GET", "api/gamification/xp-history/", {}, "xp_history"),
+
+    ("GET", "api/goals/", {}, None),
+    ("GET", "api/goals/<int:pk>/", {"pk": "goal"}, None),
+    ("POST", "api/goals/<int:pk>/complete/", {"pk": "goal"}, None),
+    ("GET", "api/goals/periods/", {}, None),
+    ("GET", "api/goals/random/", {}, None),
+    ("POST", "api/goals/<int:pk>/archive/", {"pk": "goal"}, None),
+    ("POST", "api/goals/<int:pk>/steps/", {"pk": "goal"}, {"title": "step"}),
+    ("POST", "api/goals/steps/<int:pk>/toggle/", {"pk": "goal_step"}, None),
+    ("PATCH", "api/goals/steps/<int:pk>/", {"pk": "goal_step"}, {"title": "renamed"}),
+
+    ("GET", "api/habits/", {}, None),
+    ("GET", "api/habits/<int:pk>/", {"pk": "habit"}, None),
+    ("POST", "api/habits/<int:habit_id>/toggle-day/", {"habit_id": "habit"}, "toggle_day"),
+    ("GET", "api/habits/month/", {}, None),
+    ("GET", "api/habits/year/", {}, None),
+    ("GET", "api/habits/streaks/", {}, None),
+    ("GET", "api/habits/random/", {}, None),
+
+    ("GET", "api/mood/", {}, None),
+    ("GET", "api/mood/<int:pk>/", {"pk": "mood"}, None),
+    ("GET", "api/mood/types/", {}, None),
+
+    ("GET", "api/notes/", {}, None),
+    ("GET", "api/notes/random/", {}, None),
+    ("GET", "api/notes/<int:pk>/", {"pk": "note"}, None),
+
+    ("GET", "api/settings/modules/", {}, None),
+    ("GET", "api/settings/dashboard-tiles/", {}, None),
+    ("PATCH", "api/settings/dashboard-tiles/<int:pk>/", {"pk": "tile"}, {"is_enabled": False}),
+    ("PATCH", "api/settings/modules/<int:pk>/", {"pk": "module"}, {"is_enabled": False}),
+    ("GET", "api/settings/export/", {}, None),
+    ("POST", "api/settings/import/", {}, "import"),
+    ("GET", "api/settings/preferences/", {}, None),
+    ("PATCH", "api/settings/preferences/<int:pk>/", {"pk": "preference"}, {"value": "1"}),
+
+    ("GET", "api/sobriety/", {}, None),
+    ("GET", "api/sobriety/<int:pk>/", {"pk": "sobriety"}, None),
+    ("POST", "api/sobriety/<int:sobriety_id>/relapse/", {"sobriety_id": "sobriety"}, {"note": "x"}),
+    ("POST", "api/sobriety/<int:sobriety_id>/restart/", {"sobriety_id": "sobriety"}, None),
+
+    ("GET", "api/sync/", {}, None),
+
+    ("GET", "api/todos/categories/", {}, None),
+    ("GET", "api/todos/categories/<int:pk>/", {"pk": "category"}, None),
+    ("GET", "api/todos/tasks/", {}, None),
+    ("GET", "api/todos/tasks/<int:pk>/", {"pk": "task"}, None),
+    ("POST", "api/todos/tasks/<int:pk>/complete/", {"pk": "task"}, None),
+    ("GET", "api/todos/tasks/random/", {}, None),
+    (
+        "GET",
+        "api/todos/categories/<int:category_id>/has-uncompleted/",
+        {"category_id": "category"},
+        None,
+    ),
+    ("POST", "api/todos/reorder/", {}, "reorder"),
+]
+
+
+def _api_routes(patterns=None, prefix=""):
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        route = prefix + str(pattern.pattern)
+
+        if isinstance(pattern, URLResolver):
+            yield from _api_routes(pattern.url_patterns, route)
+        elif route.startswith("api/"):
+            yield route
+
+
+def _insert_raw(model, objs):
+    """
+    INSERT z zachowaniem created_at (bulk_create nadpisałby auto_now_add) — jak przy imporcie.
+    """
+
+    fields = model._meta.concrete_fields
+    size = connection.ops.bulk_batch_size(fields, objs) or len(objs)
+
+    for start in range(0, len(objs), size):
+        model._base_manager._insert(objs[start:start + size], fields=fields, raw=True)
+
+
+def _seed(user, rng):
+    """
+    Historia jednego usera w skali kilku lat używania aplikacji. Zwraca id obiektów dla CASES.
+    """
+
+    today = timezone.localdate()
+    now = timezone.now()
+    first_day = today - timedelta(days=YEARS * 365 - 1)
+
+    difficulties = DifficultyType.objects.bulk_create(
+        DifficultyType(name=name, order=order)
+        for order, name in enumerate(["trivial", "easy", "medium", "hard"], start=1)
+    )
+    periods = [GoalPeriod.objects.create(name=name) for name in ["weekly", "monthly", "yearly"]]
+    daily, weekly = [ChallengeType.objects.create(name=name) for name in ["daily", "weekly"]]
+    tags = ChallengeTag.objects.bulk_create(ChallengeTag(name=f"tag {i}") for i in range(5))
+
+    ModuleDefinition.objects.bulk_create(
+        ModuleDefinition(user=user, module=module) for module, _ in ModuleDefinition.MODULE_CHOICES
+    )
+    DashboardTile.objects.bulk_create(
+        DashboardTile(user=user, key=key, name=name) for key, name in DashboardTile.TILE_KEYS
+    )
+    preference = UserPreference.objects.create(user=user, key="hide_quick_add_difficulty")
+
+    # habity: seria wykonań przerywana pominięciami i pustymi dniami
+    habits = Habit.objects.bulk_create(
+        Habit(user=user, title=f"Habit {i}", motivation_reason="", difficulty=rng.choice(difficulties))
+        for i in range(HABITS)
+    )
+    days = []
+    xp_logs = []
+
+    for habit in habits:
+        rate = rng.uniform(0.5, 0.95)
+
+        for offset in range((today - first_day).days + 1):
+            day = first_day + timedelta(days=offset)
+            roll = rng.random()
+
+            if roll < rate:
+                days.append(HabitDay(habit=habit, date=day, status=HabitDay.STATUS_COMPLETED, xp_awarded=True))
+                xp_logs.append(XPLog(
+                    user=user,
+                    source="habit",
+                    source_id=habit.id,
+                    xp=10,
+                    created_at=timezone.make_aware(datetime.combine(day, dt_time(20))),
+                ))
+            elif roll < rate + 0.05:
+                days.append(HabitDay(habit=habit, date=day, status=HabitDay.STATUS_SKIPPED))
+
+    HabitDay.objects.bulk_create(days)
+    _insert_raw(XPLog, xp_logs)
+
+    total_xp = sum(log.xp for log in xp_logs)
+    User.objects.filter(pk=user.pk).update(total_xp=total_xp, current_level=calculate_level(total_xp))
+    rebuild_rollups(user.id)
+
+    for habit in habits:
+        rebuild_streak(habit)
+
+    categories = TodoCategory.objects.bulk_create(
+        TodoCategory(user=user, name=f"Category {i}", difficulty=rng.choice(difficulties))
+        for i in range(10)
+    )
+    tasks = TodoTask.objects.bulk_create(
+        TodoTask(
+            user=user,
+            content=f"Task {i}",
+            category=rng.choice(categories),
+            is_completed=done,
+            completed_at=now if done else None,
+            order=i,
+        )
+        for i, done in ((i, rng.random() < 0.8) for i in range(TODOS))
+    )
+    open_task = next(task for task in tasks if not task.is_completed)
+
+    notes = RandomNote.objects.bulk_create(RandomNote(user=user, content=f"Note {i}") for i in range(NOTES))
+
+    moods = MoodEntry.objects.bulk_create(
+        MoodEntry(
+            user=user,
+            mood=rng.choice(MoodEntry.MOOD_CHOICES)[0],
+            date=today - timedelta(days=i),
+            time="12:00",
+            xp_awarded=True,
+        )
+        for i in range(MOODS)
+    )
+
+    goals = Goal.objects.bulk_create(
+        Goal(
+            user=user,
+            title=f"Goal {i}",
+            motivation_reason="",
+            period=periods[i % 3],
+            period_end=period_end_after(periods[i % 3].name, now),
+            difficulty=rng.choice(difficulties),
+            is_completed=i % 4 == 0,
+            is_archived=i >= 20,
+        )
+        for i in range(120)
+    )
+    steps = GoalStep.objects.bulk_create(
+        GoalStep(goal=goal, title=f"Step {order}", order=order)
+        for goal in goals
+        for order in range(3)
+    )
+    open_goal = next(goal for goal in goals if not goal.is_completed and not goal.is_archived)
+
+    definitions = ChallengeDefinition.objects.bulk_create(
+        ChallengeDefinition(
+            title=f"Challenge {i}",
+            difficulty=rng.choice(difficulties),
+            type=daily if i % 2 else weekly,
+        )
+        for i in range(60)
+    )
+    ChallengeDefinition.tags.through.objects.bulk_create(
+        ChallengeDefinition.tags.through(challengedefinition=definition, challengetag=rng.choice(tags))
+        for definition in definitions
+    )
+    user_challenges = [
+        UserChallenge(user=user, definition=definition, challenge_type=definition.type, is_completed=True)
+        for definition in definitions[2:]
+    ]
+    # otwarty tylko daily — assign weekly przechodzi pełną ścieżką
+    user_challenges.append(UserChallenge(user=user, definition=definitions[1], challenge_type=daily))
+    for challenge in user_challenges:
+        challenge.set_period()
+    UserChallenge.objects.bulk_create(user_challenges)
+
+    sobrieties = Sobriety.objects.bulk_create(
+        Sobriety(user=user, name=f"Sobriety {i}", motivation_reason="", started_at=now - timedelta(days=400))
+        for i in range(5)
+    )
+    SobrietyRelapse.objects.bulk_create(
+        SobrietyRelapse(sobriety=sobriety, occurred_at=now - timedelta(days=day))
+        for sobriety in sobrieties
+        for day in range(20, 400, 20)
+    )
+
+    condition_types = [key for key, _ in Achievement.CONDITION_TYPES if key != "manual"]
+    achievements = Achievement.objects.bulk_create(
+        Achievement(
+            name=f"Achievement {i}",
+            difficulty=rng.choice(difficulties),
+            condition_type=condition_types[i % len(condition_types)],
+            condition_config={
+                "target": rng.choice([1, 10, 100, 1000, 10_000]),
+                "habit_id": habits[i % HABITS].id,
+                "sobriety_id": sobrieties[i % len(sobrieties)].id,
+                "period": periods[i % 3].name,
+                "mood": "good",
+            },
+        )
+        for i in range(ACHIEVEMENTS - 1)
+    )
+    manual = Achievement.objects.create(name="Manual", difficulty=difficulties[0], condition_type="manual")
+    check_user_achievements(user)
+
+    return {
+        "achievement": achievements[0].id,
+        "manual_achievement": manual.id,
+        "definition": definitions[0].id,
+        "weekly_definition": definitions[0].id,
+        "tag": tags[0].id,
+        "user_challenge": UserChallenge.objects.get(user=user, is_completed=False).id,
+        "goal": open_goal.id,
+        "goal_step": steps[0].id,
+        "habit": habits[0].id,
+        "mood": moods[0].id,
+        "note": notes[0].id,
+        "tile": DashboardTile.objects.filter(user=user).first().id,
+        "module": ModuleDefinition.objects.filter(user=user).first().id,
+        "preference": preference.id,
+        "sobriety": sobrieties[0].id,
+        "category": open_task.category_id,
+        "task": open_task.id,
+        "tasks": [task.id for task in tasks if task.category_id == open_task.category_id][:50],
+        "today": today,
+    }
+
+
+# ewaluacja achievementów i kafelki dashboardu w wątku requestu: ich zapytania
+# wliczają się do budżetu endpointu (i widzą niezacommitowany seed TestCase)
+@tag("perf")
+@override_settings(ACHIEVEMENT_QUEUE={"BACKEND": "immediate"}, DASHBOARD={"TILE_WORKERS": 1})
+class EndpointBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        started = time.perf_counter()
+
+        cls.user = User.objects.create()
+        cls.token = AuthToken.issue(cls.user).key
+        cls.ids = _seed(cls.user, random.Random(1))
+        cls.export = "".join(data_export.export_chunks(cls.user)).encode()
+
+        cls.seed_seconds = time.perf_counter() - started
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+    def _payload(self, data):
+        ids = self.ids
+        today = ids["today"]
+
+        if data == "batch":
+            return {"operations": [
+                {"op": "habit.toggle_day", "key": "p1", "habit_id": ids["habit"], "date": str(today)},
+                {"op": "todo.complete", "key": "p2", "task_id": ids["task"]},
+                {"op": "note.create", "key": "p3", "content": "offline"},
+            ]}
+        if data == "assign":
+            return {"challenge": ids["weekly_definition"]}
+        if data == "xp_history":
+            return {"bucket": "week", "from": str(today - timedelta(days=YEARS * 365))}
+        if data == "toggle_day":
+            return {"date": str(today)}
+        if data == "reorder":
+            return {
+                "category_id": ids["category"],
+                "items": [{"id": pk, "order": order} for order, pk in enumerate(reversed(ids["tasks"]))],
+            }
+        return data
+
+    def _request(self, method, url, data):
+        if data == "import":
+            return self.client.post(url, self.export, content_type=data_export.CONTENT_TYPE)
+
+        data = self._payload(data)
+
+        if method == "GET":
+            return self.client.get(url, data)
+
+        return getattr(self.client, method.lower())(url, data, format="json")
+
+    def _measure(self, method, route, args, data):
+        url = "/" + re.sub(r"<int:(\w+)>", lambda m: str(self.ids[args[m.group(1)]]), route)
+
+        queries = None
+        timings = []
+
+        for _ in range(REPEAT):
+            with transaction.atomic():
+                started = time.perf_counter()
+
+                with CaptureQueriesContext(connection) as captured, \
+                        self.captureOnCommitCallbacks(execute=True):
+                    response = self._request(method, url, data)
+
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+
+                timings.append((time.perf_counter() - started) * 1000)
+                transaction.set_rollback(True)
+
+            self.assertLess(response.status_code, 400, f"{method} {url}: {response.status_code} {getattr(response, 'data', '')}")
+            queries = len(captured) if queries is None else max(queries, len(captured))
+
+        return queries, statistics.median(timings)
+
+    def test_every_api_route_has_a_case(self):
+        self.assertEqual(sorted(set(_api_routes())), sorted({route for _, route, _, _ in CASES}))
+
+    def test_endpoints_within_budget(self):
+        budgets = json.loads(BUDGETS_PATH.read_text()) if BUDGETS_PATH.exists() else {}
+        measured = {}
+
+        for method, route, args, data in CASES:
+            key = f"{method} /{route}"
+            queries, ms = self._measure(method, route, args, data)
+            measured[key] = {"queries": queries, "ms": round(ms, 1)}
+
+            if RECORD:
+                continue
+
+            with self.subTest(key):
+                self.assertIn(key, budgets, "brak budżetu — uruchom z PERF_RECORD=1")
+                budget = budgets[key]
+                self.assertLessEqual(queries, budget["queries"], f"zapytania: {measured[key]} > {budget}")
+                self.assertLessEqual(ms, budget["ms"], f"czas: {measured[key]} > {budget}")
+
+        if RECORD:
+            BUDGETS_PATH.write_text(json.dumps(
+                {
+                    key: {
+                        "queries": result["queries"],
+                        "ms": max(MS_FLOOR, math.ceil(result["ms"] * MS_HEADROOM / 10) * 10),
+                    }
+                    for key, result in measured.items()
+                },
+                indent=2,
+            ) + "\n")
+            print(f"\nseed {self.seed_seconds:.1f}s, zapisano {BUDGETS_PATH.name}")
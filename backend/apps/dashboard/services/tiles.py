@@ -0,0 +1,183 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.challenges.models import UserChallenge
+from apps.challenges.serializers import UserChallengeSerializer
+from apps.common.services.random_pick import pick_random
+from apps.gamification.services.level_calculator import level_progress
+from apps.goals.models import Goal
+from apps.goals.serializers import GoalSerializer
+from apps.habits.services.habit_calendar import random_habit_summary
+from apps.habits.services.streaks import best_streak
+from apps.notes.models import RandomNote
+from apps.notes.serializers import RandomNoteSerializer
+from apps.settings.models import DashboardTile, ModuleDefinition
+from apps.todos.models import TodoTask
+from apps.todos.serializers import TodoTaskSerializer
+
+
+@dataclass
+class TileContext:
+    user: object
+    today: object
+    seed: str
+
+    def rng(self, key):
+        # losowania powtarzalne dla seeda — ten sam stan danych daje ten sam ETag
+        return random.Random(f"{self.seed}:{key}")
+
+
+# --- kafelki: każdy zwraca to samo co jego dotychczasowy endpoint ---
+
+def _level(ctx):
+    user = ctx.user
+    return {
+        "total_xp": user.total_xp,
+        "current_level": user.current_level,
+        "xp_multiplier": user.xp_multiplier,
+        "level_progress": level_progress(user.total_xp),
+    }
+
+
+def _biggest_streak(ctx):
+    return best_streak(ctx.user, ctx.today)
+
+
+def _random_habit(ctx):
+    return random_habit_summary(ctx.user, ctx.today, rng=ctx.rng("random_habit"))
+
+
+def _random_todo(ctx):
+    task = pick_random(
+        TodoTask.objects.filter(user=ctx.user, is_completed=False),
+        rng=ctx.rng("random_todo"),
+    )
+    return TodoTaskSerializer(task).data if task else None
+
+
+def _random_goal(key, period):
+    def tile(ctx):
+        goal = pick_random(
+            Goal.objects.filter(user=ctx.user, is_completed=False, period__name__iexact=period),
+            rng=ctx.rng(key),
+        )
+        return GoalSerializer(goal).data if goal else None
+
+    return tile
+
+
+def _open_challenges(ctx, period):
+    return (
+        UserChallenge.objects.filter(
+            user=ctx.user,
+            is_completed=False,
+            challenge_type__name=period,
+        )
+        .select_related("challenge_type", "definition__type", "definition__difficulty")
+        .prefetch_related("definition__tags")
+    )
+
+
+def _daily_challenge(ctx):
+    daily = _open_challenges(ctx, "daily").first()
+    return UserChallengeSerializer(daily).data if daily else None
+
+
+def _weekly_challenge(ctx):
+    return UserChallengeSerializer(_open_challenges(ctx, "weekly"), many=True).data
+
+
+def _random_note(ctx):
+    note = pick_random(RandomNote.objects.for_user(ctx.user), rng=ctx.rng("random_note"))
+    return RandomNoteSerializer(note).data if note else None
+
+
+# kolejność = kolejność w DashboardTile.TILE_KEYS
+TILES = {
+    "level_gamification": _level,
+    "biggest_streak": _biggest_streak,
+    "random_habit": _random_habit,
+    "random_todo": _random_todo,
+    "goal_week": _random_goal("goal_week", "weekly"),
+    "goal_month": _random_goal("goal_month", "monthly"),
+    "goal_year": _random_goal("goal_year", "yearly"),
+    "daily_challenge": _daily_challenge,
+    "weekly_challenge": _weekly_challenge,
+    "random_note": _random_note,
+}
+
+
+def enabled_tile_keys(user):
+    """
+    Klucze włączonych kafelków, których moduł (jeśli jest zależność) też jest włączony.
+    """
+
+    modules = dict(
+        ModuleDefinition.objects.for_user(user).values_list("module", "is_enabled")
+    )
+
+    enabled = {
+        key
+        for key, is_enabled, dependency in DashboardTile.objects.for_user(user).values_list(
+            "key", "is_enabled", "module_dependency"
+        )
+        if is_enabled and (not dependency or modules.get(dependency))
+    }
+
+    return [key for key in TILES if key in enabled]
+
+
+# --- równoległe liczenie ---
+
+_executor = None
+
+
+def _workers():
+    return getattr(settings, "DASHBOARD", {}).get("TILE_WORKERS", 1)
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_workers(),
+            thread_name_prefix="dashboard",
+        )
+
+    return _executor
+
+
+def _render_in_worker(key, ctx):
+    try:
+        return TILES[key](ctx)
+    finally:
+        # wątek puli ma własne połączenie — nie zostawiamy go otwartego między requestami
+        connection.close()
+
+
+def render_tiles(user, keys, *, seed=None):
+    """
+    key -> dane kafelka dla podanych kluczy. Przy TILE_WORKERS > 1 kafelki liczone
+    są równolegle w puli wątków, inaczej po kolei w wątku requestu.
+    seed=None -> losowania stałe w obrębie dnia (user + data).
+    """
+
+    today = timezone.now().date()
+
+    # bez seeda: jedno losowanie na usera i dzień (zmienia się o północy albo razem z danymi)
+    if seed is None:
+        seed = f"{user.id}:{today.isoformat()}"
+
+    ctx = TileContext(user=user, today=today, seed=seed)
+
+    if _workers() <= 1 or len(keys) <= 1:
+        return {key: TILES[key](ctx) for key in keys}
+
+    futures = {key: _get_executor().submit(_render_in_worker, key, ctx) for key in keys}
+    return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.common.models import DifficultyType
+from apps.dashboard.services import tiles
+from apps.gamification.models import User
+from apps.habits.models import Habit
+from apps.notes.models import RandomNote
+from apps.settings.models import DashboardTile, ModuleDefinition
+from apps.todos.models import TodoCategory, TodoTask
+
+
+def _seed_dashboard(user):
+    diff = DifficultyType.objects.create(name="easy", order=1)
+    category = TodoCategory.objects.create(name="General", difficulty=diff)
+
+    for module in ["habits", "todos", "notes", "gamification"]:
+        ModuleDefinition.objects.create(user=user, module=module, is_enabled=module != "notes")
+
+    tiles = [
+        ("level_gamification", "gamification", True),
+        ("biggest_streak", "habits", True),
+        ("random_todo", "todos", True),
+        ("random_note", "notes", True),
+        ("goal_week", None, False),
+    ]
+    for key, dependency, is_enabled in tiles:
+        DashboardTile.objects.create(
+            user=user,
+            key=key,
+            name=key,
+            is_enabled=is_enabled,
+            module_dependency=dependency,
+        )
+
+    Habit.objects.create(user=user, title="Read", motivation_reason="", difficulty=diff)
+    RandomNote.objects.create(user=user, content="hidden")
+    for i in range(5):
+        TodoTask.objects.create(user=user, content=f"task {i}", category=category)
+
+
+# TestCase trzyma dane w niezacommitowanej transakcji — wątki puli by ich nie widziały
+@override_settings(DASHBOARD={"TILE_WORKERS": 1})
+class DashboardViewTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(total_xp=150)
+        _seed_dashboard(self.user)
+
+    def test_renders_only_enabled_tiles(self):
+        res = self.client.get("/api/dashboard/")
+
+        self.assertEqual(res.status_code, 200)
+        # random_note: moduł notes wyłączony, goal_week: kafelek wyłączony
+        self.assertEqual(res.data["tiles"], ["level_gamification", "biggest_streak", "random_todo"])
+        self.assertEqual(set(res.data["data"]), set(res.data["tiles"]))
+        self.assertEqual(res.data["data"]["level_gamification"]["total_xp"], 150)
+
+    def test_tiles_match_standalone_endpoints(self):
+        res = self.client.get("/api/dashboard/")
+        streak = self.client.get("/api/habits/streaks/")
+
+        self.assertEqual(res.data["data"]["biggest_streak"], streak.data)
+        self.assertIn(
+            res.data["data"]["random_todo"]["id"],
+            TodoTask.objects.values_list("id", flat=True),
+        )
+
+    def test_random_tiles_are_stable_within_a_day(self):
+        first = self.client.get("/api/dashboard/")
+
+        res = self.client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 304)
+
+        # inny seed = nowe losowanie
+        other = [self.client.get(f"/api/dashboard/?seed={i}")["ETag"] for i in range(5)]
+        self.assertTrue(any(etag != first["ETag"] for etag in other))
+
+    def test_seed_makes_response_cacheable(self):
+        first = self.client.get("/api/dashboard/?seed=abc")
+        second = self.client.get("/api/dashboard/?seed=abc")
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+        res = self.client.get("/api/dashboard/?seed=abc", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 304)
+
+        self.user.add_xp(xp=10, source="habit")
+
+        res = self.client.get("/api/dashboard/?seed=abc", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], first["ETag"])
+
+
+# domyślna (produkcyjna) pula wątków; achievementy w requeście, bez workera
+# działającego jeszcze po wyczyszczeniu tabel przez TransactionTestCase
+@override_settings(ACHIEVEMENT_QUEUE={"BACKEND": "immediate"})
+class ConcurrentDashboardTests(TransactionTestCase):
+
+    def test_thread_pool_matches_sequential(self):
+        user = User.objects.create()
+        _seed_dashboard(user)
+        client = APIClient()
+
+        with mock.patch.object(
+            tiles, "_render_in_worker", wraps=tiles._render_in_worker
+        ) as in_worker:
+            threaded = client.get("/api/dashboard/?seed=1")
+
+        self.assertEqual(in_worker.call_count, len(threaded.data["tiles"]))
+
+        with self.settings(DASHBOARD={"TILE_WORKERS": 1}):
+            sequential = client.get("/api/dashboard/?seed=1")
+
+        self.assertEqual(threaded.data, sequential.data)
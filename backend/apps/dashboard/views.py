@@ -0,0 +1,45 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.achievements.services.job_queue import schedule_time_checks
+
+from .services.tiles import enabled_tile_keys, render_tiles
+
+
+def _etag(data):
+    payload = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return '"%s"' % hashlib.md5(payload.encode()).hexdigest()
+
+
+class DashboardView(APIView):
+    """
+    Wszystkie włączone kafelki home screena w jednym requeście.
+    Losowania (random habit/todo/goal/note) są stałe w obrębie dnia; ?seed=... je zmienia
+    (np. "losuj ponownie"). ETag to hash gotowej odpowiedzi: niezmieniony dashboard
+    zwraca 304 na If-None-Match — oszczędza transfer i parsowanie po stronie klienta,
+    ale kafelki i tak są liczone.
+    """
+
+    def get(self, request):
+        # home screen = otwarcie aplikacji; sobriety_duration dojrzewa bez zapisów
+        schedule_time_checks(request.user)
+
+        keys = enabled_tile_keys(request.user)
+        seed = request.query_params.get("seed")
+
+        data = {
+            "tiles": keys,
+            "data": render_tiles(request.user, keys, seed=seed),
+        }
+
+        etag = _etag(data)
+
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        return Response(data, status=status.HTTP_200_OK, headers={"ETag": etag})
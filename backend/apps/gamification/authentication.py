@@ -0,0 +1,50 @@
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.gamification.models import AuthToken
+from apps.gamification.utils import get_user
+
+
+class TokenAuthentication(BaseAuthentication):
+    """
+    Authorization: Token <key> -> AuthToken.user
+    """
+
+    keyword = "Token"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid token header")
+
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid token header")
+
+        token = AuthToken.objects.select_related("user").filter(key=key).first()
+        if token is None:
+            raise AuthenticationFailed("Invalid token")
+
+        return token.user, token
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class SingleUserAuthentication(BaseAuthentication):
+    """
+    Tryb jednego usera (aplikacja lokalna bez logowania): request bez tokena
+    dostaje pierwszego usera z bazy. Wyłączane przez SINGLE_USER_MODE = False.
+    """
+
+    def authenticate(self, request):
+        if not getattr(settings, "SINGLE_USER_MODE", True):
+            return None
+
+        return get_user(), None
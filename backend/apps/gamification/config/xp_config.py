@@ -28,3 +28,12 @@ GOAL_PERIOD_MULTIPLIER = {
 }
 
 BASE_LEVEL_XP = 100
+
+# krzywa poziomów (services/level_calculator.CURVES):
+#   linear      — poziom n kosztuje base_xp * n
+#   flat        — każdy poziom kosztuje base_xp
+#   exponential — poziom n kosztuje base_xp * growth^(n-1), np. {"type": "exponential", "base_xp": 100, "growth": 1.2}
+LEVEL_CURVE = {"type": "linear", "base_xp": BASE_LEVEL_XP}
+
+# ile progów trzymać w prekomputowanej tabeli
+LEVEL_TABLE_SIZE = 1000
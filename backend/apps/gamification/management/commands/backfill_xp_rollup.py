@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.gamification.services.xp_rollup import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Przebudowuje XPDailyRollup z całej historii XPLog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Tylko dla jednego usera (id).")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_rollups(options["user"], batch_size=options["batch_size"])
+
+        self.stdout.write(f"[XP ROLLUP] {total} rows")
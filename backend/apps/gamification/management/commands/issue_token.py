@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gamification.models import AuthToken, User
+
+
+class Command(BaseCommand):
+    help = "Wystawia token API dla usera (nagłówek Authorization: Token <key>)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Id usera (domyślnie tworzy nowego).")
+        parser.add_argument("--name", default="", help="Opis tokena, np. nazwa urządzenia.")
+
+    def handle(self, *args, **options):
+        if options["user"] is None:
+            user = User.objects.create()
+        else:
+            user = User.objects.filter(pk=options["user"]).first()
+            if user is None:
+                raise CommandError(f"User {options['user']} does not exist")
+
+        token = AuthToken.issue(user, name=options["name"])
+
+        self.stdout.write(f"user={user.id} token={token.key}")
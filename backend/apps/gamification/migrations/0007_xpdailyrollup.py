@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0006_user_xp_multiplier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XPDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('source', models.CharField(max_length=30)),
+                ('xp_sum', models.BigIntegerField(default=0)),
+                ('event_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='gamification.user')),
+            ],
+            options={
+                'unique_together': {('user', 'date', 'source')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0008_authtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='xplog',
+            index=models.Index(fields=['user', 'created_at'], name='xplog_user_created_idx'),
+        ),
+    ]
@@ -1,5 +1,11 @@
-from django.db import models
+import secrets
+
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
+from django.utils import timezone
+from apps.gamification.services import xp_batch
 from apps.gamification.services.level_calculator import calculate_level
+from apps.common.managers import UserScopedManager
 
 class User(models.Model):
     total_xp = models.BigIntegerField(default=0)
@@ -8,6 +14,38 @@ class User(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     xp_multiplier = models.FloatField(default=1.0)
 
+    # request.user w DRF (IsAuthenticated sprawdza is_authenticated)
+    is_authenticated = True
+    is_anonymous = False
+
+    def _increment_total(self, xp):
+        # inkrement po stronie bazy — równoległe add_xp (kilku workerów / urządzeń)
+        # nie nadpisują sobie wyniku; UPDATE jako pierwszy bierze blokadę zapisu
+        User.objects.filter(pk=self.pk).update(
+            total_xp=F("total_xp") + xp,
+            updated_at=timezone.now(),
+        )
+
+        total_xp = (
+            User.objects.select_for_update()
+            .values_list("total_xp", flat=True)
+            .get(pk=self.pk)
+        )
+        current_level = calculate_level(total_xp)
+
+        User.objects.filter(pk=self.pk).exclude(current_level=current_level).update(
+            current_level=current_level,
+        )
+
+        self.total_xp = total_xp
+        self.current_level = current_level
+
+    def _schedule_xp_event(self):
+        # 🔥 achievement hook — lokalny import żeby uniknąć circular import
+        from apps.achievements.services.achievement_engine import EVENT_XP
+        from apps.achievements.services.job_queue import schedule_event
+        schedule_event(self, EVENT_XP)
+
     def add_xp(self, *, xp: int, source: str, source_id: int | None = None):
 
         # nic nie rób jeśli xp=0 (ważne)
@@ -18,20 +56,34 @@ class User(models.Model):
                 "current_level": self.current_level,
             }
 
-        self.total_xp += xp
-        self.current_level = calculate_level(self.total_xp)
-        self.save(update_fields=["total_xp", "current_level", "updated_at"])
+        # w bloku xp_batch.collect_xp tylko zapamiętujemy nagrodę — zapis hurtem na końcu
+        awards = xp_batch.collecting(self.pk)
+        if awards is not None:
+            awards.append((xp, source, source_id))
+            return {
+                "xp_gained": xp,
+                "total_xp": self.total_xp,
+                "current_level": self.current_level,
+            }
+
+        with transaction.atomic():
+            self._increment_total(xp)
 
-        XPLog.objects.create(
-            user=self,
-            source=source,
-            source_id=source_id,
-            xp=xp,
-        )
+            log = XPLog.objects.create(
+                user=self,
+                source=source,
+                source_id=source_id,
+                xp=xp,
+            )
 
-        # 🔥 achievement hook — lokalny import żeby uniknąć circular import
-        from apps.achievements.services.achievement_engine import check_user_achievements
-        check_user_achievements(self)
+            XPDailyRollup.record(
+                user=self,
+                date=timezone.localdate(log.created_at),
+                source=source,
+                xp=xp,
+            )
+
+        self._schedule_xp_event()
 
         return {
             "xp_gained": xp,
@@ -39,6 +91,37 @@ class User(models.Model):
             "current_level": self.current_level,
         }
 
+    def add_xp_batch(self, awards):
+        """
+        Wiele nagród naraz — lista (xp, source, source_id).
+        Jeden UPDATE usera, jeden INSERT do XPLog i jeden zapis rollupu per źródło.
+        """
+
+        awards = [award for award in awards if award[0] > 0]
+        if not awards:
+            return 0
+
+        with transaction.atomic():
+            self._increment_total(sum(xp for xp, _, _ in awards))
+
+            logs = XPLog.objects.bulk_create(
+                XPLog(user=self, source=source, source_id=source_id, xp=xp)
+                for xp, source, source_id in awards
+            )
+
+            per_source = {}
+            for xp, source, _ in awards:
+                xp_sum, count = per_source.get(source, (0, 0))
+                per_source[source] = (xp_sum + xp, count + 1)
+
+            day = timezone.localdate(logs[0].created_at)
+            for source, (xp_sum, count) in per_source.items():
+                XPDailyRollup.record(user=self, date=day, source=source, xp=xp_sum, count=count)
+
+        self._schedule_xp_event()
+
+        return sum(xp for xp, _, _ in awards)
+
 
 class XPLog(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -46,3 +129,73 @@ class XPLog(models.Model):
     source_id = models.IntegerField(null=True, blank=True)
     xp = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = UserScopedManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="xplog_user_created_idx"),
+        ]
+
+
+class XPDailyRollup(models.Model):
+    """
+    Dzienna suma XP per źródło — utrzymywana razem z XPLog,
+    żeby wykresy XP w czasie nie skanowały całego ledgera.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    source = models.CharField(max_length=30)
+    xp_sum = models.BigIntegerField(default=0)
+    event_count = models.IntegerField(default=0)
+
+    objects = UserScopedManager()
+
+    class Meta:
+        unique_together = ("user", "date", "source")
+
+    @classmethod
+    def record(cls, *, user, date, source, xp, count=1):
+        filters = {"user": user, "date": date, "source": source}
+
+        updated = cls.objects.filter(**filters).update(
+            xp_sum=F("xp_sum") + xp,
+            event_count=F("event_count") + count,
+        )
+        if updated:
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(**filters, xp_sum=xp, event_count=count)
+        except IntegrityError:
+            # równoległy zapis utworzył wiersz pierwszy
+            cls.objects.filter(**filters).update(
+                xp_sum=F("xp_sum") + xp,
+                event_count=F("event_count") + count,
+            )
+
+    def __str__(self):
+        return f"{self.user_id}:{self.date}:{self.source}={self.xp_sum}"
+
+
+class AuthToken(models.Model):
+    """
+    Token API — jeden user może mieć kilka (telefon, tablet...).
+    Nagłówek: Authorization: Token <key>
+    """
+
+    key = models.CharField(max_length=40, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tokens")
+    name = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = UserScopedManager()
+
+    @classmethod
+    def issue(cls, user, name=""):
+        return cls.objects.create(user=user, key=secrets.token_hex(20), name=name)
+
+    def __str__(self):
+        return f"{self.user_id}:{self.name or self.key[:8]}"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import User, XPLog
+from .services.level_calculator import level_progress
 
 class XPLogSerializer(serializers.ModelSerializer):
     class Meta:
@@ -9,6 +10,7 @@ class XPLogSerializer(serializers.ModelSerializer):
 
 class UserSerializer(serializers.ModelSerializer):
     logs = XPLogSerializer(many=True, read_only=True, source="xplog_set")
+    level_progress = serializers.SerializerMethodField()
 
     class Meta:
         model = User
@@ -19,6 +21,10 @@ class UserSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "xp_multiplier",
+            "level_progress",
             "logs",
         ]
 
+    def get_level_progress(self, obj):
+        return level_progress(obj.total_xp)
+
@@ -1,11 +1,145 @@
-from apps.gamification.config.xp_config import BASE_LEVEL_XP
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from math import isqrt, log
+
+from apps.gamification.config.xp_config import LEVEL_CURVE, LEVEL_TABLE_SIZE
+
+
+class LevelCurve(ABC):
+    """
+    xp_for_level(n) = łączne XP potrzebne, żeby mieć poziom n (poziom 1 = 0 XP).
+    """
+
+    @abstractmethod
+    def xp_for_level(self, level: int) -> int:
+        ...
+
+    def level_for_xp(self, total_xp: int) -> int:
+        # ogólny fallback: szukanie wykładnicze + binarne po xp_for_level
+        hi = 2
+        while self.xp_for_level(hi) <= total_xp:
+            hi *= 2
+
+        lo = hi // 2
+        while lo < hi - 1:
+            mid = (lo + hi) // 2
+            if self.xp_for_level(mid) <= total_xp:
+                lo = mid
+            else:
+                hi = mid
+
+        return lo
+
+
+class LinearCurve(LevelCurve):
+    """
+    Poziom n -> n+1 kosztuje base_xp * n (100, 200, 300...).
+    """
+
+    def __init__(self, base_xp: int):
+        self.base_xp = base_xp
+
+    def xp_for_level(self, level: int) -> int:
+        n = max(0, level - 1)
+        return self.base_xp * n * (n + 1) // 2
+
+    def level_for_xp(self, total_xp: int) -> int:
+        # największe n, dla którego base * n(n+1)/2 <= xp  ->  n(n+1) <= 2xp // base
+        q = 2 * max(0, total_xp) // self.base_xp
+        return (isqrt(4 * q + 1) - 1) // 2 + 1
+
+
+class FlatCurve(LevelCurve):
+    """
+    Każdy poziom kosztuje tyle samo.
+    """
+
+    def __init__(self, base_xp: int):
+        self.base_xp = base_xp
+
+    def xp_for_level(self, level: int) -> int:
+        return self.base_xp * max(0, level - 1)
+
+    def level_for_xp(self, total_xp: int) -> int:
+        return max(0, total_xp) // self.base_xp + 1
+
+
+class ExponentialCurve(LevelCurve):
+    """
+    Poziom n -> n+1 kosztuje base_xp * growth^(n-1).
+    """
+
+    def __init__(self, base_xp: int, growth: float):
+        self.base_xp = base_xp
+        self.growth = growth
+
+    def xp_for_level(self, level: int) -> int:
+        n = max(0, level - 1)
+        return int(self.base_xp * (self.growth ** n - 1) / (self.growth - 1))
+
+    def level_for_xp(self, total_xp: int) -> int:
+        total_xp = max(0, total_xp)
+        level = int(log(total_xp * (self.growth - 1) / self.base_xp + 1, self.growth)) + 1
+
+        # korekta zaokrągleń float
+        while self.xp_for_level(level + 1) <= total_xp:
+            level += 1
+        while level > 1 and self.xp_for_level(level) > total_xp:
+            level -= 1
+
+        return level
+
+
+CURVES = {
+    "linear": LinearCurve,
+    "flat": FlatCurve,
+    "exponential": ExponentialCurve,
+}
+
+
+def build_curve(config: dict) -> LevelCurve:
+    params = dict(config)
+    return CURVES[params.pop("type")](**params)
+
+
+CURVE = build_curve(LEVEL_CURVE)
+
+# LEVEL_THRESHOLDS[i] = XP potrzebne na poziom i + 1
+LEVEL_THRESHOLDS = [CURVE.xp_for_level(level) for level in range(1, LEVEL_TABLE_SIZE + 1)]
+
 
 def calculate_level(total_xp: int) -> int:
-    level = 1
-    xp = total_xp
+    return CURVE.level_for_xp(total_xp)
+
+
+def xp_for_level(level: int) -> int:
+    if 1 <= level <= LEVEL_TABLE_SIZE:
+        return LEVEL_THRESHOLDS[level - 1]
+    return CURVE.xp_for_level(level)
+
+
+def level_progress(total_xp: int) -> dict:
+    level = calculate_level(total_xp)
+    level_start = xp_for_level(level)
+    next_level = xp_for_level(level + 1)
+
+    return {
+        "level": level,
+        "xp_into_level": total_xp - level_start,
+        "xp_to_next": next_level - total_xp,
+        "level_xp": next_level - level_start,
+    }
+
+
+def calculate_levels(xp_values) -> list[int]:
+    """
+    Bulk: poziom dla wielu wartości XP (leaderboard, przeliczenie po zmianie krzywej).
+    W zakresie tabeli to bisect, powyżej — wzór zamknięty.
+    """
 
-    while xp >= BASE_LEVEL_XP * level:
-        xp -= BASE_LEVEL_XP * level
-        level += 1
+    max_xp = LEVEL_THRESHOLDS[-1]
 
-    return level
+    return [
+        bisect_right(LEVEL_THRESHOLDS, xp) if 0 <= xp < max_xp else calculate_level(xp)
+        for xp in xp_values
+    ]
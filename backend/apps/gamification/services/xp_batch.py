@@ -0,0 +1,38 @@
+import threading
+from contextlib import contextmanager
+
+
+# user_id -> lista (xp, source, source_id) zbierana w bieżącym wątku
+_state = threading.local()
+
+
+def _collectors():
+    if not hasattr(_state, "awards"):
+        _state.awards = {}
+    return _state.awards
+
+
+def collecting(user_id):
+    """
+    Lista, do której User.add_xp ma dopisać nagrodę, albo None (zwykły zapis).
+    """
+
+    return _collectors().get(user_id)
+
+
+@contextmanager
+def collect_xp(user):
+    """
+    add_xp tego usera w bloku tylko zbiera nagrody, a na wyjściu idą
+    jednym add_xp_batch. Wyjątek w bloku = nic nie zapisujemy.
+    """
+
+    collectors = _collectors()
+    awards = collectors[user.pk] = []
+
+    try:
+        yield awards
+    finally:
+        del collectors[user.pk]
+
+    user.add_xp_batch(awards)
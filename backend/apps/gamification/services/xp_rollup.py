@@ -0,0 +1,50 @@
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from apps.gamification.models import XPLog, XPDailyRollup
+
+
+def rebuild_rollups(user_id=None, *, batch_size=1000):
+    """
+    Przebudowuje XPDailyRollup z XPLog (wszyscy albo jeden user). Zwraca liczbę wierszy.
+    Wywołuj w transakcji.
+    """
+
+    logs = XPLog.objects.all()
+    rollups = XPDailyRollup.objects.all()
+
+    if user_id is not None:
+        logs = logs.filter(user_id=user_id)
+        rollups = rollups.filter(user_id=user_id)
+
+    rows = (
+        logs.annotate(day=TruncDate("created_at"))
+        .values("user_id", "day", "source")
+        .annotate(xp_sum=Sum("xp"), event_count=Count("id"))
+        .order_by("user_id", "day", "source")
+    )
+
+    rollups.delete()
+
+    total = 0
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(
+            XPDailyRollup(
+                user_id=row["user_id"],
+                date=row["day"],
+                source=row["source"],
+                xp_sum=row["xp_sum"],
+                event_count=row["event_count"],
+            )
+        )
+
+        if len(batch) >= batch_size:
+            XPDailyRollup.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+
+    XPDailyRollup.objects.bulk_create(batch)
+    total += len(batch)
+
+    return total
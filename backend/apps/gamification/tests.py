@@ -1,7 +1,24 @@
-from django.test import TestCase
+from unittest import mock
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.db import connection, OperationalError
 from apps.gamification.services.xp_calculator import calculate_xp
-from apps.gamification.services.level_calculator import calculate_level
-from apps.gamification.models import User, XPLog
+from apps.gamification.services.level_calculator import (
+    calculate_level,
+    calculate_levels,
+    level_progress,
+    xp_for_level,
+    LinearCurve,
+    FlatCurve,
+    ExponentialCurve,
+)
+from apps.gamification.models import AuthToken, User, XPLog, XPDailyRollup
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from datetime import timedelta
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+import time
 
 
 class XPServiceTests(TestCase):
@@ -35,6 +52,39 @@ class LevelCalculationTests(TestCase):
     def test_level_increases_with_xp(self):
         self.assertGreaterEqual(calculate_level(500), calculate_level(0))
 
+    def test_closed_form_matches_iterative_loop(self):
+        def iterative(total_xp, base=100):
+            level = 1
+            xp = total_xp
+            while xp >= base * level:
+                xp -= base * level
+                level += 1
+            return level
+
+        for xp in list(range(0, 5000)) + [10**6, 10**9 + 7]:
+            self.assertEqual(calculate_level(xp), iterative(xp), xp)
+
+    def test_bulk_levels_match_single(self):
+        xps = [0, 99, 100, 299, 300, 5050, 10**12]
+        self.assertEqual(calculate_levels(xps), [calculate_level(xp) for xp in xps])
+
+    def test_level_progress(self):
+        progress = level_progress(350)
+
+        self.assertEqual(progress["level"], 3)
+        self.assertEqual(xp_for_level(3), 300)
+        self.assertEqual(progress["xp_into_level"], 50)
+        self.assertEqual(progress["xp_to_next"], 250)
+        self.assertEqual(progress["level_xp"], 300)
+
+    def test_other_curves_are_consistent_with_thresholds(self):
+        for curve in [LinearCurve(70), FlatCurve(250), ExponentialCurve(100, 1.3)]:
+            for level in range(1, 60):
+                threshold = curve.xp_for_level(level)
+                self.assertEqual(curve.level_for_xp(threshold), level)
+                if threshold > 0:
+                    self.assertEqual(curve.level_for_xp(threshold - 1), level - 1)
+
 
 class UserAddXPTests(TestCase):
 
@@ -58,3 +108,146 @@ class UserAddXPTests(TestCase):
         user.refresh_from_db()
 
         self.assertEqual(user.total_xp, 0)
+
+
+class XPRollupTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create()
+
+    def test_add_xp_maintains_daily_rollup(self):
+        self.user.add_xp(xp=10, source="habit")
+        self.user.add_xp(xp=15, source="habit")
+        self.user.add_xp(xp=5, source="todo")
+
+        habit = XPDailyRollup.objects.get(user=self.user, source="habit")
+        self.assertEqual(habit.xp_sum, 25)
+        self.assertEqual(habit.event_count, 2)
+        self.assertEqual(XPDailyRollup.objects.count(), 2)
+
+    def test_backfill_rebuilds_rollup_from_ledger(self):
+        now = timezone.now()
+        for days_ago, xp in [(0, 10), (0, 20), (3, 5)]:
+            log = XPLog.objects.create(user=self.user, source="goal", xp=xp)
+            XPLog.objects.filter(pk=log.pk).update(created_at=now - timedelta(days=days_ago))
+
+        call_command("backfill_xp_rollup", stdout=StringIO())
+
+        rollups = XPDailyRollup.objects.order_by("date")
+        self.assertEqual([(r.xp_sum, r.event_count) for r in rollups], [(5, 1), (30, 2)])
+
+    def test_xp_history_buckets(self):
+        today = timezone.localdate()
+        XPDailyRollup.objects.create(user=self.user, date=today, source="habit", xp_sum=10, event_count=1)
+        XPDailyRollup.objects.create(user=self.user, date=today, source="todo", xp_sum=5, event_count=2)
+        XPDailyRollup.objects.create(
+            user=self.user,
+            date=today - timedelta(days=40),
+            source="habit",
+            xp_sum=100,
+            event_count=3,
+        )
+
+        res = self.client.get("/api/gamification/xp-history/")
+        self.assertEqual(len(res.data["points"]), 1)
+        self.assertEqual(res.data["points"][0]["xp"], 15)
+        self.assertEqual(res.data["points"][0]["by_source"], {"habit": 10, "todo": 5})
+
+        start = (today - timedelta(days=60)).isoformat()
+        res = self.client.get(f"/api/gamification/xp-history/?from={start}&bucket=month")
+        self.assertEqual(sum(p["xp"] for p in res.data["points"]), 115)
+        self.assertEqual(sum(p["events"] for p in res.data["points"]), 6)
+
+
+class ConcurrentXPTests(TransactionTestCase):
+
+    WORKERS = 8
+    CALLS_PER_WORKER = 10
+
+    def _worker(self, user_id, xp):
+        try:
+            for _ in range(self.CALLS_PER_WORKER):
+                while True:
+                    try:
+                        # każdy wątek z własną (nieaktualną) kopią usera
+                        user = User.objects.get(pk=user_id)
+                        user.add_xp(xp=xp, source="stress")
+                        break
+                    except OperationalError:
+                        # sqlite: "database table is locked" — spróbuj ponownie
+                        time.sleep(0.001)
+        finally:
+            connection.close()
+
+    def test_parallel_add_xp_does_not_lose_updates(self):
+        user = User.objects.create()
+
+        # bez achievementów: ich ewaluacja idzie po commicie XP, więc "table is locked"
+        # z niej powtórzyłby już zapisane add_xp (a worker kolejki przeżyłby test)
+        with mock.patch.object(User, "_schedule_xp_event"), \
+                ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            futures = [
+                pool.submit(self._worker, user.id, worker + 1)
+                for worker in range(self.WORKERS)
+            ]
+            for future in futures:
+                future.result()
+
+        user.refresh_from_db()
+        ledger = sum(XPLog.objects.filter(user=user).values_list("xp", flat=True))
+        rollup = sum(XPDailyRollup.objects.filter(user=user).values_list("xp_sum", flat=True))
+
+        self.assertEqual(XPLog.objects.filter(user=user).count(), self.WORKERS * self.CALLS_PER_WORKER)
+        self.assertEqual(user.total_xp, ledger)
+        self.assertEqual(rollup, ledger)
+        self.assertEqual(user.current_level, calculate_level(ledger))
+
+
+class AuthenticationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.first = User.objects.create(total_xp=10)
+        self.second = User.objects.create(total_xp=20)
+
+    def test_token_selects_its_user(self):
+        token = AuthToken.issue(self.second, name="phone")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        res = self.client.get("/api/gamification/me/")
+        self.assertEqual(res.data["id"], self.second.id)
+
+        self.client.post("/api/notes/", {"content": "hello"}, format="json")
+        self.assertEqual(self.second.randomnote_set.count(), 1)
+        self.assertEqual(self.first.randomnote_set.count(), 0)
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token nope")
+        res = self.client.get("/api/gamification/me/")
+        self.assertEqual(res.status_code, 401)
+
+    def test_single_user_fallback(self):
+        res = self.client.get("/api/gamification/me/")
+        self.assertEqual(res.data["id"], self.first.id)
+
+    @override_settings(SINGLE_USER_MODE=False)
+    def test_token_required_without_single_user_mode(self):
+        res = self.client.get("/api/gamification/me/")
+        self.assertEqual(res.status_code, 401)
+
+    def test_user_resolved_once_per_request(self):
+        token = AuthToken.issue(self.second)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        # token + ETag listy (kursor sync) + notes
+        with self.assertNumQueries(3):
+            self.client.get("/api/notes/")
+
+    def test_issue_token_command(self):
+        out = StringIO()
+        call_command("issue_token", user=self.first.id, name="tablet", stdout=out)
+
+        token = AuthToken.objects.get(user=self.first)
+        self.assertEqual(token.name, "tablet")
+        self.assertIn(token.key, out.getvalue())
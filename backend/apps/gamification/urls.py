@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import CurrentUserView
+from .views import CurrentUserView, XPHistoryView
 
 urlpatterns = [
     path("me/", CurrentUserView.as_view(), name="current-user"),
+    path("xp-history/", XPHistoryView.as_view(), name="xp-history"),
 ]
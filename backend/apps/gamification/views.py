@@ -1,15 +1,20 @@
+from datetime import datetime, timedelta
+
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from .models import XPDailyRollup
 from .serializers import UserSerializer
-from apps.gamification.utils import get_user
 
 class CurrentUserView(APIView):
     def get(self, request):
-        user = get_user()
+        user = request.user
         return Response(UserSerializer(user).data)
 
     def patch(self, request):
-        user = get_user()
+        user = request.user
         multiplier = request.data.get("xp_multiplier")
 
         if multiplier not in [0.5, 1.0, 1.5, 2.0]:
@@ -23,3 +28,65 @@ class CurrentUserView(APIView):
 
         return Response(UserSerializer(user).data)
 
+
+class XPHistoryView(APIView):
+    BUCKETS = {
+        "day": None,
+        "week": TruncWeek,
+        "month": TruncMonth,
+    }
+
+    def get(self, request):
+        bucket = request.query_params.get("bucket", "day")
+        if bucket not in self.BUCKETS:
+            return Response(
+                {"detail": "bucket must be day/week/month"},
+                status=400,
+            )
+
+        try:
+            date_to = self._parse_date(request.query_params.get("to")) or timezone.localdate()
+            date_from = (
+                self._parse_date(request.query_params.get("from"))
+                or date_to - timedelta(days=29)
+            )
+        except ValueError:
+            return Response({"detail": "Invalid date format"}, status=400)
+
+        qs = XPDailyRollup.objects.filter(
+            user=request.user,
+            date__range=(date_from, date_to),
+        )
+
+        trunc = self.BUCKETS[bucket]
+        qs = qs.annotate(period=trunc("date") if trunc else F("date"))
+
+        rows = (
+            qs.values("period", "source")
+            .annotate(xp=Sum("xp_sum"), events=Sum("event_count"))
+            .order_by("period", "source")
+        )
+
+        points = {}
+        for row in rows:
+            point = points.setdefault(
+                row["period"],
+                {"period": row["period"], "xp": 0, "events": 0, "by_source": {}},
+            )
+            point["xp"] += row["xp"]
+            point["events"] += row["events"]
+            point["by_source"][row["source"]] = row["xp"]
+
+        return Response(
+            {
+                "bucket": bucket,
+                "from": date_from,
+                "to": date_to,
+                "points": list(points.values()),
+            }
+        )
+
+    def _parse_date(self, value):
+        if not value:
+            return None
+        return datetime.strptime(value, "%Y-%m-%d").date()
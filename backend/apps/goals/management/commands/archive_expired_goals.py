@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gamification.models import User
+from apps.goals.services.goal_archive import archive_expired_goals
+
+
+class Command(BaseCommand):
+    help = "Archiwizuje cele, których okres (tydzień / miesiąc / rok) już minął. Uruchamiać z crona, np. co godzinę."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Tylko dla jednego usera (id).")
+
+    def handle(self, *args, **options):
+        user = None
+
+        if options["user"] is not None:
+            user = User.objects.filter(pk=options["user"]).first()
+            if user is None:
+                raise CommandError(f"User {options['user']} does not exist")
+
+        archived = archive_expired_goals(user=user)
+        self.stdout.write(f"[GOALS] archived {archived} expired goals")
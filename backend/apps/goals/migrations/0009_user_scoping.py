@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_difficultytype_order'),
+        ('gamification', '0008_authtoken'),
+        ('goals', '0008_goal_archived_at_goal_ceiling_goal_goal_floor_goal_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'created_at'], name='goals_goal_user_id_449354_idx'),
+        ),
+    ]
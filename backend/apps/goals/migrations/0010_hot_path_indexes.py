@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_difficultytype_order'),
+        ('gamification', '0009_hot_path_indexes'),
+        ('goals', '0009_user_scoping'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'period', 'is_archived'], name='goal_user_period_arch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'is_completed'], name='goal_user_done_idx'),
+        ),
+    ]
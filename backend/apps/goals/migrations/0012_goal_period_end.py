@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:33
+
+from datetime import date, datetime, time, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_period_end(apps, schema_editor):
+    # kopia period_end_after z modelu — migracja nie może zależeć od bieżącego kodu
+    Goal = apps.get_model("goals", "Goal")
+
+    goals = list(Goal.objects.select_related("period").filter(period_end__isnull=True))
+
+    for goal in goals:
+        day = timezone.localtime(goal.created_at).date()
+        name = goal.period.name
+
+        if name == "weekly":
+            end = day + timedelta(days=7 - day.weekday())
+        elif name == "monthly":
+            end = (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+        elif name == "yearly":
+            end = date(day.year + 1, 1, 1)
+        else:
+            continue
+
+        goal.period_end = timezone.make_aware(datetime.combine(end, time.min))
+
+    Goal.objects.bulk_update(goals, ["period_end"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_difficultytype_order'),
+        ('gamification', '0009_hot_path_indexes'),
+        ('goals', '0011_sync_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='period_end',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['is_archived', 'period_end'], name='goal_arch_period_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'period_end'], name='goal_user_period_end_idx'),
+        ),
+        migrations.RunPython(fill_period_end, migrations.RunPython.noop),
+    ]
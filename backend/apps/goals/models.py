@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
-from datetime import date
+from datetime import date, datetime, time, timedelta
+from apps.gamification.services.xp_calculator import calculate_xp
+from apps.common.managers import UserScopedManager
 
 class GoalPeriod(models.Model):
     name = models.CharField(
@@ -17,6 +19,26 @@ class GoalPeriod(models.Model):
     def __str__(self):
         return self.name
 
+
+def period_end_after(period_name, moment):
+    """
+    Początek następnego tygodnia ISO / miesiąca / roku (czas lokalny) po `moment` —
+    wtedy cel z tego okresu wygasa. None dla nieznanego okresu.
+    """
+
+    day = timezone.localtime(moment).date()
+
+    if period_name == "weekly":
+        end = day + timedelta(days=7 - day.weekday())
+    elif period_name == "monthly":
+        end = (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+    elif period_name == "yearly":
+        end = date(day.year + 1, 1, 1)
+    else:
+        return None
+
+    return timezone.make_aware(datetime.combine(end, time.min))
+
 class Goal(models.Model):
     user = models.ForeignKey("gamification.User", on_delete=models.CASCADE)
 
@@ -41,28 +63,71 @@ class Goal(models.Model):
     is_archived = models.BooleanField(default=False)
     archived_at = models.DateTimeField(null=True, blank=True)
 
+    # koniec okresu liczonego od created_at — liczony przy zapisie (save), nie per odczyt
+    period_end = models.DateTimeField(null=True, blank=True)
+
+    objects = UserScopedManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["user", "period", "is_archived"], name="goal_user_period_arch_idx"),
+            models.Index(fields=["user", "is_completed"], name="goal_user_done_idx"),
+            models.Index(fields=["is_archived", "period_end"], name="goal_arch_period_end_idx"),
+            models.Index(fields=["user", "period_end"], name="goal_user_period_end_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+
+        # nowy cel, zmiana okresu albo reset kotwicy (odarchiwizowanie)
+        if update_fields is None or {"period", "created_at"} & set(update_fields):
+            self.period_end = period_end_after(self.period.name, self.created_at or timezone.now())
+
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "period_end"}
+
+        super().save(*args, **kwargs)
+
     def has_period_expired(self):
-        today = timezone.now().date()
+        return self.period_end is not None and self.period_end <= timezone.now()
+
+    def complete(self):
+        """
+        None gdy cel już był ukończony, inaczej przyznane XP.
+        """
 
-        if self.period.name == "weekly":
-            # jeśli tydzień się zmienił (ISO week)
-            return today.isocalendar()[1] != self.created_at.date().isocalendar()[1]
+        if self.is_completed:
+            return None
 
-        if self.period.name == "monthly":
-            return (
-                today.month != self.created_at.month
-                or today.year != self.created_at.year
-            )
+        xp = calculate_xp(
+            module="goals",
+            difficulty=self.difficulty.name.lower(),
+            period=self.period.name.lower(),
+            user=self.user,
+        )
 
-        if self.period.name == "yearly":
-            return today.year != self.created_at.year
+        self.user.add_xp(
+            xp=xp,
+            source="goal",
+            source_id=self.id,
+        )
 
-        return False
+        self.is_completed = True
+        self.completed_at = timezone.now()
+        self.save(update_fields=["is_completed", "completed_at", "updated_at"])
+
+        # lokalny import — achievements importują modele celów
+        from apps.achievements.services.achievement_engine import EVENT_GOAL
+        from apps.achievements.services.job_queue import schedule_event
+        schedule_event(self.user, EVENT_GOAL, delta=1, period=self.period.name)
+
+        return xp
 
     def archive(self):
         self.is_archived = True
         self.archived_at = timezone.now()
-        self.save(update_fields=["is_archived", "archived_at"])
+        self.save(update_fields=["is_archived", "archived_at", "updated_at"])
 
     def __str__(self):
         return self.title
@@ -79,6 +144,10 @@ class GoalStep(models.Model):
     order = models.IntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
+    user_lookup = "goal__user"
 
     class Meta:
         ordering = ["order"]
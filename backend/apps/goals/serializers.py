@@ -2,7 +2,6 @@ from rest_framework import serializers
 from .models import Goal, GoalPeriod, GoalStep
 from apps.common.models import DifficultyType
 from apps.common.serializers import DifficultyTypeSerializer
-from apps.gamification.utils import get_user
 
 
 class GoalPeriodSerializer(serializers.ModelSerializer):
@@ -65,14 +64,16 @@ class GoalSerializer(serializers.ModelSerializer):
 
             "is_archived",
             "archived_at",
+            "period_end",
 
             "created_at",
             "updated_at",
 
             "steps",
         ]
+        read_only_fields = ["period_end"]
 
     def create(self, validated_data):
-        validated_data["user"] = get_user()
+        validated_data["user"] = self.context["request"].user
         return super().create(validated_data)
 
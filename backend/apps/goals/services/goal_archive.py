@@ -0,0 +1,46 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.common.services import user_cache
+from apps.goals.models import Goal
+
+
+def expired_goals(now=None):
+    """
+    Niezarchiwizowane cele po końcu swojego okresu — zakres po indeksie (is_archived, period_end).
+    """
+
+    return Goal.objects.filter(is_archived=False, period_end__lte=now or timezone.now())
+
+
+def archived_q(now=None):
+    """
+    Zarchiwizowany albo już po końcu okresu — odczyty traktują wygasły cel jak zarchiwizowany,
+    zanim archive_expired_goals (cron) zapisze to w bazie. Odczyt niczego nie zapisuje.
+    """
+
+    return Q(is_archived=True) | Q(period_end__lte=now or timezone.now())
+
+
+def archive_expired_goals(now=None, user=None):
+    """
+    Archiwizuje wszystkie wygasłe cele jednym UPDATE. Zwraca liczbę celów.
+    """
+
+    now = now or timezone.now()
+
+    qs = expired_goals(now)
+    if user is not None:
+        qs = qs.filter(user=user)
+
+    # update() nie wysyła sygnałów — cache userów bumpujemy sami
+    user_ids = list(qs.values_list("user_id", flat=True).distinct())
+    if not user_ids:
+        return 0
+
+    archived = qs.update(is_archived=True, archived_at=now, updated_at=now)
+
+    for user_id in user_ids:
+        user_cache.bump(user_id, user_cache.GOALS)
+
+    return archived
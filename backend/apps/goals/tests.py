@@ -1,3 +1,106 @@
+from datetime import date, datetime
+from io import StringIO
+
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.common.models import DifficultyType
+from apps.gamification.models import User
+from apps.goals.models import Goal, GoalPeriod
+from apps.goals.services.goal_archive import archive_expired_goals
+
+
+def _at(day):
+    return timezone.make_aware(datetime(day.year, day.month, day.day, 12))
+
+
+class GoalArchiveTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+        self.periods = {
+            name: GoalPeriod.objects.create(name=name)
+            for name in ("weekly", "monthly", "yearly")
+        }
+
+    def _goal(self, period, created):
+        goal = Goal.objects.create(
+            user=self.user,
+            title=f"{period} {created}",
+            motivation_reason="why",
+            period=self.periods[period],
+            difficulty=self.diff,
+        )
+        # save() z created_at przelicza period_end
+        goal.created_at = _at(created)
+        goal.save(update_fields=["created_at"])
+        return goal
+
+    def test_sweep_archives_goals_from_previous_periods(self):
+        # środa 2025-01-08; 2024-01-03 to ten sam numer tygodnia ISO rok wcześniej
+        now = _at(date(2025, 1, 8))
+
+        expired = [
+            self._goal("weekly", date(2025, 1, 5)),
+            self._goal("weekly", date(2024, 1, 3)),
+            self._goal("monthly", date(2024, 12, 31)),
+            self._goal("yearly", date(2024, 6, 1)),
+        ]
+        current = [
+            self._goal("weekly", date(2025, 1, 6)),
+            self._goal("monthly", date(2025, 1, 1)),
+            self._goal("yearly", date(2025, 1, 2)),
+        ]
+
+        self.assertEqual(archive_expired_goals(now), len(expired))
+
+        archived = set(Goal.objects.filter(is_archived=True).values_list("pk", flat=True))
+        self.assertEqual(archived, {goal.pk for goal in expired})
+        self.assertTrue(all(goal.pk not in archived for goal in current))
+        self.assertIsNotNone(Goal.objects.get(pk=expired[0].pk).archived_at)
+
+        # drugi przebieg nic nie zmienia
+        self.assertEqual(archive_expired_goals(now), 0)
+
+    def test_period_end_follows_calendar_and_unarchive(self):
+        goal = self._goal("weekly", date(2024, 12, 31))
+        self.assertEqual(goal.period_end, timezone.make_aware(datetime(2025, 1, 6)))
+
+        goal = self._goal("monthly", date(2024, 12, 31))
+        self.assertEqual(goal.period_end, timezone.make_aware(datetime(2025, 1, 1)))
+        self.assertTrue(goal.has_period_expired())
+
+        Goal.objects.filter(pk=goal.pk).update(is_archived=True)
+        res = self.client.post(f"/api/goals/{goal.pk}/archive/")
+        self.assertEqual(res.status_code, 200)
+
+        goal.refresh_from_db()
+        self.assertFalse(goal.is_archived)
+        self.assertGreater(goal.period_end, timezone.now())
+        self.assertFalse(goal.has_period_expired())
+
+    def test_command_archives_and_rejects_unknown_user(self):
+        goal = self._goal("weekly", date(2020, 1, 1))
+
+        with self.assertRaises(CommandError):
+            call_command("archive_expired_goals", user=self.user.pk + 100, stdout=StringIO())
+        self.assertFalse(Goal.objects.get(pk=goal.pk).is_archived)
+
+        call_command("archive_expired_goals", user=self.user.pk, stdout=StringIO())
+        self.assertTrue(Goal.objects.get(pk=goal.pk).is_archived)
+
+    def test_list_filters_expired_goals_without_writing(self):
+        expired = self._goal("weekly", date(2020, 1, 1))
+        current = self._goal("yearly", timezone.now().date())
+
+        active = self.client.get("/api/goals/", {"archived": "false"})
+        archived = self.client.get("/api/goals/", {"archived": "true"})
 
-# Create your tests here.
+        self.assertEqual([goal["id"] for goal in active.data], [current.pk])
+        self.assertEqual([goal["id"] for goal in archived.data], [expired.pk])
+        # odczyt nie ma skutków ubocznych — archiwizuje dopiero komenda
+        self.assertFalse(Goal.objects.get(pk=expired.pk).is_archived)
@@ -1,45 +1,47 @@
 from django.utils import timezone
-from apps.gamification.services.xp_calculator import calculate_xp
-from apps.achievements.services.achievement_engine import check_user_achievements
+from apps.achievements.services.achievement_engine import EVENT_GOAL
+from apps.achievements.services.job_queue import schedule_event
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-import random
+from apps.common.services.random_pick import pick_random
+from apps.sync.mixins import SyncETagMixin
+from apps.sync.services.changes import record_deletion
 from django.db import models
 
 from .models import Goal, GoalPeriod, GoalStep
+from .services.goal_archive import archived_q
 from .serializers import (
     GoalSerializer,
     GoalPeriodSerializer,
     GoalStepSerializer,
 )
-from apps.gamification.utils import get_user
 
 
-class GoalListCreate(generics.ListCreateAPIView):
+class GoalListCreate(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = GoalSerializer
+    sync_tables = ("goals", "goal_steps")
 
     def get_queryset(self):
-        user = get_user()
+        user = self.request.user
         period = self.request.query_params.get("period")
         archived = self.request.query_params.get("archived")
 
-        qs = Goal.objects.filter(user=user)
-
-        # 🔥 auto-archiwizacja
-        for goal in qs.filter(is_archived=False):
-            if goal.has_period_expired():
-                goal.archive()
-
-        qs = qs.order_by("-created_at")
+        qs = (
+            Goal.objects.for_user(user)
+            .select_related("period", "difficulty")
+            .prefetch_related("steps")
+            .order_by("-created_at")
+        )
 
         if period:
             qs = qs.filter(period__name__iexact=period)
 
+        # wygasłe cele archiwizuje komenda archive_expired_goals (cron) — tu tylko filtr
         if archived == "true":
-            qs = qs.filter(is_archived=True)
+            qs = qs.filter(archived_q())
         elif archived == "false":
-            qs = qs.filter(is_archived=False)
+            qs = qs.exclude(archived_q())
 
         return qs
 
@@ -48,7 +50,19 @@ class GoalDetail(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = GoalSerializer
 
     def get_queryset(self):
-        return Goal.objects.filter(user=get_user())
+        return Goal.objects.for_user(self.request.user)
+
+    def perform_update(self, serializer):
+        goal = serializer.save()
+        schedule_event(goal.user, EVENT_GOAL)
+
+    def perform_destroy(self, instance):
+        user = instance.user
+        was_completed = instance.is_completed
+        instance.delete()
+
+        if was_completed:
+            schedule_event(user, EVENT_GOAL)
     
 class GoalPeriodList(generics.ListAPIView):
     queryset = GoalPeriod.objects.all()
@@ -58,7 +72,7 @@ class GoalPeriodList(generics.ListAPIView):
 class CompleteGoalView(APIView):
     def post(self, request, pk):
         try:
-            goal = Goal.objects.get(pk=pk, user=get_user())
+            goal = Goal.objects.get(pk=pk, user=request.user)
         except Goal.DoesNotExist:
             return Response(
                 {"detail": "Goal not found."},
@@ -74,26 +88,7 @@ class CompleteGoalView(APIView):
                 status=status.HTTP_200_OK,
             )
 
-        xp = calculate_xp(
-            module="goals",
-            difficulty=goal.difficulty.name.lower(),
-            period=goal.period.name.lower(),
-            user=goal.user,
-        )
-
-        goal.user.add_xp(
-            xp=xp,
-            source="goal",
-            source_id=goal.id,
-        )
-
-        goal.is_completed = True
-        goal.completed_at = timezone.now()
-        goal.save(update_fields=["is_completed", "completed_at", "updated_at"])
-
-        from apps.achievements.services.achievement_engine import check_user_achievements
-
-        check_user_achievements(goal.user)
+        xp = goal.complete()
 
         return Response(
             {
@@ -108,20 +103,20 @@ class CompleteGoalView(APIView):
 class RandomGoalView(APIView):
     def get(self, request):
         period = request.GET.get("period")
-        qs = Goal.objects.filter(user=get_user(), is_completed=False)
+        qs = Goal.objects.filter(user=request.user, is_completed=False)
         if period:
             qs = qs.filter(period__name__iexact=period)
 
-        if not qs.exists():
+        picked = pick_random(qs)
+        if picked is None:
             return Response(None, status=status.HTTP_200_OK)
 
-        picked = random.choice(list(qs))
         return Response(GoalSerializer(picked).data, status=status.HTTP_200_OK)
     
 class ToggleArchiveGoalView(APIView):
     def post(self, request, pk):
         try:
-            goal = Goal.objects.get(pk=pk, user=get_user())
+            goal = Goal.objects.get(pk=pk, user=request.user)
         except Goal.DoesNotExist:
             return Response(
                 {"detail": "Goal not found."},
@@ -160,7 +155,7 @@ class ToggleArchiveGoalView(APIView):
 class AddGoalStepView(APIView):
     def post(self, request, pk):
         try:
-            goal = Goal.objects.get(pk=pk, user=get_user())
+            goal = Goal.objects.get(pk=pk, user=request.user)
         except Goal.DoesNotExist:
             return Response(
                 {"detail": "Goal not found."},
@@ -185,7 +180,7 @@ class AddGoalStepView(APIView):
 class ToggleGoalStepView(APIView):
     def post(self, request, pk):
         try:
-            step = GoalStep.objects.get(pk=pk, goal__user=get_user())
+            step = GoalStep.objects.get(pk=pk, goal__user=request.user)
         except GoalStep.DoesNotExist:
             return Response(
                 {"detail": "Step not found."},
@@ -193,7 +188,7 @@ class ToggleGoalStepView(APIView):
             )
 
         step.is_completed = not step.is_completed
-        step.save(update_fields=["is_completed"])
+        step.save(update_fields=["is_completed", "updated_at"])
 
         return Response(
             {
@@ -206,22 +201,25 @@ class ToggleGoalStepView(APIView):
 class UpdateDeleteGoalStepView(APIView):
     def patch(self, request, pk):
         try:
-            step = GoalStep.objects.get(pk=pk, goal__user=get_user())
+            step = GoalStep.objects.get(pk=pk, goal__user=request.user)
         except GoalStep.DoesNotExist:
             return Response({"detail": "Step not found."}, status=404)
 
         title = request.data.get("title")
         if title is not None:
             step.title = title
-            step.save(update_fields=["title"])
+            step.save(update_fields=["title", "updated_at"])
 
         return Response(GoalStepSerializer(step).data)
 
     def delete(self, request, pk):
         try:
-            step = GoalStep.objects.get(pk=pk, goal__user=get_user())
+            step = GoalStep.objects.get(pk=pk, goal__user=request.user)
         except GoalStep.DoesNotExist:
             return Response({"detail": "Step not found."}, status=404)
 
+        step_id = step.id
         step.delete()
+        # GoalStep nie ma receivera post_delete (fast delete kaskady z celu)
+        record_deletion("goal_steps", step_id, request.user.id)
         return Response(status=204)    
\ No newline at end of file
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0002_alter_habit_motivation_reason'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HabitStreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_streak', models.IntegerField(default=0)),
+                ('longest_streak', models.IntegerField(default=0)),
+                ('last_completed_date', models.DateField(blank=True, null=True)),
+                ('run_start', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('habit', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='streak', to='habits.habit')),
+            ],
+        ),
+    ]
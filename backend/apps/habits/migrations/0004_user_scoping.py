@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_difficultytype_order'),
+        ('gamification', '0008_authtoken'),
+        ('habits', '0003_habitstreak'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['user', 'is_active'], name='habits_habi_user_id_f5e729_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0004_user_scoping'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habitday',
+            index=models.Index(fields=['habit', 'status', 'date'], name='habitday_habit_status_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0005_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habitday',
+            index=models.Index(fields=['updated_at'], name='habitday_updated_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from apps.common.managers import UserScopedManager
 
 class Habit(models.Model):
     user = models.ForeignKey("gamification.User", on_delete=models.CASCADE)
@@ -11,8 +12,13 @@ class Habit(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedManager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "is_active"]),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.user_id})"
@@ -37,9 +43,47 @@ class HabitDay(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedManager()
+    user_lookup = "habit__user"
+
     class Meta:
         unique_together = ("habit", "date")
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["habit", "status", "date"], name="habitday_habit_status_idx"),
+            # /api/sync/ — zmiany od kursora
+            models.Index(fields=["updated_at"], name="habitday_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.habit_id} - {self.date} : {self.get_status_display()}"
+
+
+class HabitStreak(models.Model):
+    """
+    Zmaterializowany streak habitu — aktualizowany przy toggle-day,
+    żeby odczyt nie wymagał przechodzenia całej historii HabitDay.
+    """
+
+    habit = models.OneToOneField(Habit, on_delete=models.CASCADE, related_name="streak")
+
+    # długość ostatniego ciągu (kończącego się na last_completed_date)
+    current_streak = models.IntegerField(default=0)
+    longest_streak = models.IntegerField(default=0)
+
+    last_completed_date = models.DateField(null=True, blank=True)
+    run_start = models.DateField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
+    user_lookup = "habit__user"
+
+    def is_alive(self, today):
+        # ciąg jest "aktualny" jeśli ostatnio ukończono dziś albo wczoraj
+        if not self.last_completed_date:
+            return False
+        return (today - self.last_completed_date).days <= 1
+
+    def __str__(self):
+        return f"{self.habit_id}: {self.current_streak}/{self.longest_streak}"
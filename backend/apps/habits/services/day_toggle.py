@@ -0,0 +1,79 @@
+from django.db import transaction
+
+from apps.achievements.services.achievement_engine import EVENT_HABIT_DAY
+from apps.achievements.services.job_queue import schedule_event
+from apps.gamification.services.xp_calculator import calculate_xp
+from apps.habits.models import HabitDay
+from apps.habits.services.habit_calendar import invalidate_year_bitsets
+from apps.habits.services.streaks import apply_day_change
+
+
+def _next_status(current):
+    # cykl: pusty -> ukończony -> pominięty -> pusty
+    if current == HabitDay.STATUS_EMPTY:
+        return HabitDay.STATUS_COMPLETED
+    if current == HabitDay.STATUS_COMPLETED:
+        return HabitDay.STATUS_SKIPPED
+    return HabitDay.STATUS_EMPTY
+
+
+def toggle_day(habit, day, status=None):
+    """
+    Ustawia status dnia (albo przełącza cyklicznie, gdy status=None), przyznaje XP
+    za pierwsze ukończenie i aktualizuje streak / bitset roku.
+    Zwraca (habit_day, xp_gained, already_completed).
+    """
+
+    with transaction.atomic():
+        obj, _ = HabitDay.objects.select_for_update().get_or_create(
+            habit=habit,
+            date=day,
+            defaults={
+                "status": HabitDay.STATUS_EMPTY,
+                "xp_awarded": False,
+            },
+        )
+
+        xp_added = 0
+        was_completed = obj.status == HabitDay.STATUS_COMPLETED
+        already_completed = was_completed and obj.xp_awarded
+
+        new_status = _next_status(obj.status) if status is None else int(status)
+
+        obj.status = new_status
+        obj.save(update_fields=["status", "updated_at"])
+
+        transaction.on_commit(
+            lambda: invalidate_year_bitsets([habit.id], [day.year])
+        )
+
+        if new_status == HabitDay.STATUS_COMPLETED and not obj.xp_awarded:
+            xp_amount = calculate_xp(
+                module="habits",
+                difficulty=habit.difficulty.name.lower(),
+                user=habit.user,
+            )
+
+            habit.user.add_xp(
+                xp=xp_amount,
+                source="habit",
+                source_id=obj.id,
+            )
+
+            obj.xp_awarded = True
+            obj.save(update_fields=["xp_awarded", "updated_at"])
+            xp_added = xp_amount
+
+        is_completed = new_status == HabitDay.STATUS_COMPLETED
+
+        if was_completed != is_completed:
+            apply_day_change(habit, day, was_completed, is_completed)
+
+            schedule_event(
+                habit.user,
+                EVENT_HABIT_DAY,
+                delta=1 if is_completed else -1,
+                habit_id=habit.id,
+            )
+
+    return obj, xp_added, already_completed
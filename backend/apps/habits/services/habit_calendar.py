@@ -0,0 +1,177 @@
+import base64
+import calendar
+import time
+from datetime import date
+
+from django.core.cache import cache
+
+from apps.common.services.random_pick import pick_random
+from apps.habits.models import Habit, HabitDay
+
+
+YEAR_SLOTS = 366
+YEAR_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def status_arrays(habit_ids, first_date, last_date):
+    """
+    habit_id -> (statusy, xp_awarded) jako listy indeksowane dniem od first_date.
+    Jedno zapytanie dla wszystkich habitów z zakresu.
+    """
+
+    size = (last_date - first_date).days + 1
+
+    arrays = {
+        habit_id: ([HabitDay.STATUS_EMPTY] * size, [False] * size)
+        for habit_id in habit_ids
+    }
+
+    rows = HabitDay.objects.filter(
+        habit_id__in=habit_ids,
+        date__range=(first_date, last_date),
+    ).values_list("habit_id", "date", "status", "xp_awarded")
+
+    for habit_id, day, status, xp_awarded in rows:
+        statuses, xp = arrays[habit_id]
+        index = (day - first_date).days
+        statuses[index] = status
+        xp[index] = xp_awarded
+
+    return arrays
+
+
+def encode_statuses(statuses):
+    # "0120..." — jedna cyfra na dzień (HabitDay.STATUS_*)
+    return "".join(str(status) for status in statuses)
+
+
+def encode_flags(flags):
+    return "".join("1" if flag else "0" for flag in flags)
+
+
+def random_habit_summary(user, today, rng=None):
+    """
+    Losowy aktywny habit + ile dni ukończono w bieżącym miesiącu (None gdy brak habitów).
+    """
+
+    picked = pick_random(Habit.objects.filter(user=user, is_active=True), rng=rng)
+    if picked is None:
+        return None
+
+    _, last_day = calendar.monthrange(today.year, today.month)
+    first_date = date(today.year, today.month, 1)
+    last_date = date(today.year, today.month, last_day)
+
+    done = HabitDay.objects.filter(
+        habit=picked,
+        date__range=(first_date, last_date),
+        status=HabitDay.STATUS_COMPLETED,
+    ).count()
+
+    return {
+        "id": picked.id,
+        "title": picked.title,
+        "reason": picked.motivation_reason,
+        "done": done,
+        "total": last_day,
+    }
+
+
+# --- rok jako bitset: slot = dzień roku - 1 (w latach nieprzestępnych slot 365 jest pusty) ---
+
+def _year_version_key(habit_id, year):
+    return f"habits:year-version:{habit_id}:{year}"
+
+
+def _year_cache_key(habit_id, year, version):
+    return f"habits:year:{habit_id}:{year}:{version}"
+
+
+def _fresh_version():
+    # nie 0: po wyrzuceniu klucza wersji z cache nie trafimy w stary wpis
+    return time.time_ns()
+
+
+def _year_versions(habit_ids, year):
+    keys = {habit_id: _year_version_key(habit_id, year) for habit_id in habit_ids}
+    found = cache.get_many(keys.values())
+
+    for key in keys.values():
+        if key not in found:
+            cache.add(key, _fresh_version(), timeout=None)
+            found[key] = cache.get(key)
+
+    return {habit_id: found[key] for habit_id, key in keys.items()}
+
+
+def _slot(day):
+    return day.timetuple().tm_yday - 1
+
+
+def year_bitsets(habit_ids, year):
+    """
+    habit_id -> (completed_bits, skipped_bits) jako inty (bit i = slot i).
+    Z cache, a brakujące habity jednym zapytaniem.
+
+    Wpisy są wersjonowane per (habit, rok): wersja jest czytana przed zapytaniem,
+    więc bitset zbudowany ze stanu sprzed równoległego toggle-day ląduje pod starą
+    wersją i nikt go już nie odczyta.
+    """
+
+    versions = _year_versions(habit_ids, year)
+    keys = {
+        habit_id: _year_cache_key(habit_id, year, version)
+        for habit_id, version in versions.items()
+    }
+    cached = cache.get_many(keys.values())
+
+    result = {}
+    missing = []
+
+    for habit_id, key in keys.items():
+        if key in cached:
+            result[habit_id] = tuple(cached[key])
+        else:
+            missing.append(habit_id)
+
+    if missing:
+        built = {habit_id: [0, 0] for habit_id in missing}
+
+        rows = HabitDay.objects.filter(
+            habit_id__in=missing,
+            date__range=(date(year, 1, 1), date(year, 12, 31)),
+            status__in=[HabitDay.STATUS_COMPLETED, HabitDay.STATUS_SKIPPED],
+        ).values_list("habit_id", "date", "status")
+
+        for habit_id, day, status in rows:
+            index = 0 if status == HabitDay.STATUS_COMPLETED else 1
+            built[habit_id][index] |= 1 << _slot(day)
+
+        cache.set_many(
+            {keys[habit_id]: bits for habit_id, bits in built.items()},
+            timeout=YEAR_CACHE_TIMEOUT,
+        )
+
+        result.update({habit_id: tuple(bits) for habit_id, bits in built.items()})
+
+    return result
+
+
+def invalidate_year_bitsets(habit_ids, years):
+    """
+    Nowa wersja bitsetów (toggle-day po commicie, import) — stare wpisy są nieosiągalne
+    i wygasają same.
+    """
+
+    for habit_id in habit_ids:
+        for year in years:
+            key = _year_version_key(habit_id, year)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, _fresh_version(), timeout=None)
+
+
+def encode_bitset(bits):
+    # 46 bajtów little-endian (bit i -> bajt i // 8, bit i % 8) w base64
+    return base64.b64encode(bits.to_bytes((YEAR_SLOTS + 7) // 8, "little")).decode()
@@ -0,0 +1,196 @@
+from datetime import timedelta
+
+from apps.habits.models import Habit, HabitDay, HabitStreak
+
+
+# ile dni ładujemy naraz przy szukaniu końca ciągu
+WINDOW_DAYS = 31
+
+
+def _completed_dates(habit_id, first, last):
+    return set(
+        HabitDay.objects.filter(
+            habit_id=habit_id,
+            status=HabitDay.STATUS_COMPLETED,
+            date__range=(first, last),
+        ).values_list("date", flat=True)
+    )
+
+
+def _run_length(habit_id, start, step):
+    """
+    Ile kolejnych ukończonych dni zaczynając od `start` idąc w stronę `step` (+1 / -1).
+    Czyta historię oknami po WINDOW_DAYS, więc koszt zależy od długości ciągu, nie historii.
+    """
+
+    length = 0
+    cursor = start
+
+    while True:
+        edge = cursor + timedelta(days=(WINDOW_DAYS - 1) * step)
+        dates = _completed_dates(habit_id, min(cursor, edge), max(cursor, edge))
+
+        for offset in range(WINDOW_DAYS):
+            if cursor + timedelta(days=offset * step) not in dates:
+                return length
+            length += 1
+
+        cursor += timedelta(days=WINDOW_DAYS * step)
+
+
+def rebuild_streak(habit):
+    """
+    Pełne przeliczenie z historii — dla habitów bez zmaterializowanego streaka
+    i gdy zmiana mogła skrócić najdłuższy ciąg.
+    """
+
+    dates = (
+        HabitDay.objects.filter(habit=habit, status=HabitDay.STATUS_COMPLETED)
+        .order_by("date")
+        .values_list("date", flat=True)
+    )
+
+    longest = 0
+    cur = 0
+    run_start = None
+    last_date = None
+
+    for d in dates.iterator(chunk_size=2000):
+        if last_date and (d - last_date).days == 1:
+            cur += 1
+        else:
+            cur = 1
+            run_start = d
+
+        longest = max(longest, cur)
+        last_date = d
+
+    streak, _ = HabitStreak.objects.update_or_create(
+        habit=habit,
+        defaults={
+            "current_streak": cur,
+            "longest_streak": longest,
+            "last_completed_date": last_date,
+            "run_start": run_start,
+        },
+    )
+
+    # odśwież cache reverse one-to-one (mógł zapamiętać brak streaka)
+    habit.streak = streak
+
+    return streak
+
+
+def get_streak(habit):
+    try:
+        return habit.streak
+    except HabitStreak.DoesNotExist:
+        return rebuild_streak(habit)
+
+
+def longest_streaks(habits):
+    """
+    habit_id -> longest_streak. Habity powinny mieć select_related("streak").
+    """
+
+    return {habit.id: get_streak(habit).longest_streak for habit in habits}
+
+
+def best_streak(user, today):
+    """
+    Habit z najdłuższym streakiem wśród aktywnych (kafelek "biggest streak").
+    """
+
+    habits = Habit.objects.filter(user=user, is_active=True).select_related("streak")
+
+    best = {
+        "habit_id": None,
+        "title": None,
+        "biggest_streak": 0,
+        "current_streak": 0,
+    }
+
+    for h in habits:
+        streak = get_streak(h)
+
+        if streak.longest_streak > best["biggest_streak"]:
+            best.update(
+                {
+                    "habit_id": h.id,
+                    "title": h.title,
+                    "biggest_streak": streak.longest_streak,
+                    "current_streak": (
+                        streak.current_streak if streak.is_alive(today) else 0
+                    ),
+                }
+            )
+
+    return best
+
+
+def apply_day_change(habit, day, was_completed, is_completed):
+    """
+    Inkrementalna aktualizacja po zmianie statusu jednego dnia
+    (HabitDay musi być już zapisany). Czyta tylko ciągi sąsiadujące z `day`.
+    """
+
+    if was_completed == is_completed:
+        return get_streak(habit)
+
+    streak = HabitStreak.objects.select_for_update().filter(habit=habit).first()
+
+    if streak is None:
+        return rebuild_streak(habit)
+
+    left = _run_length(habit.id, day - timedelta(days=1), -1)
+    right = _run_length(habit.id, day + timedelta(days=1), 1)
+    run_end = day + timedelta(days=right)
+
+    if is_completed:
+        merged = left + 1 + right
+        streak.longest_streak = max(streak.longest_streak, merged)
+
+        if streak.last_completed_date is None or run_end >= streak.last_completed_date:
+            streak.current_streak = merged
+            streak.last_completed_date = run_end
+            streak.run_start = day - timedelta(days=left)
+
+    else:
+        # rozbity mógł być najdłuższy ciąg — nie wiemy jaki jest następny
+        if streak.longest_streak == left + 1 + right:
+            return rebuild_streak(habit)
+
+        if streak.last_completed_date == run_end:
+            if right:
+                streak.current_streak = right
+                streak.run_start = day + timedelta(days=1)
+            elif left:
+                streak.current_streak = left
+                streak.last_completed_date = day - timedelta(days=1)
+                streak.run_start = day - timedelta(days=left)
+            else:
+                previous = (
+                    HabitDay.objects.filter(
+                        habit=habit,
+                        status=HabitDay.STATUS_COMPLETED,
+                        date__lt=day,
+                    )
+                    .order_by("-date")
+                    .values_list("date", flat=True)
+                    .first()
+                )
+
+                if previous is None:
+                    streak.current_streak = 0
+                    streak.last_completed_date = None
+                    streak.run_start = None
+                else:
+                    length = _run_length(habit.id, previous, -1)
+                    streak.current_streak = length
+                    streak.last_completed_date = previous
+                    streak.run_start = previous - timedelta(days=length - 1)
+
+    streak.save()
+    habit.streak = streak
+
+    return streak
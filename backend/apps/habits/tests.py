@@ -1,8 +1,14 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 from apps.gamification.models import User
 from apps.common.models import DifficultyType
-from apps.habits.models import Habit
+from apps.habits.models import Habit, HabitDay, HabitStreak
+from apps.habits.services import habit_calendar
+from apps.habits.services.streaks import rebuild_streak
+from datetime import date, timedelta
+from django.core.cache import cache
+import base64
+import random
 
 
 class HabitIntegrationTests(TestCase):
@@ -43,3 +49,164 @@ class HabitIntegrationTests(TestCase):
         self.user.refresh_from_db()
 
         self.assertEqual(self.user.total_xp, xp_after_first)
+
+
+class HabitStreakTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+        self.user = User.objects.create()
+        self.habit = Habit.objects.create(
+            user=self.user,
+            title="Meditation",
+            difficulty=self.diff
+        )
+
+    def _set(self, day, status):
+        self.client.post(
+            f"/api/habits/{self.habit.id}/toggle-day/",
+            data={"date": day.isoformat(), "status": status},
+            format="json",
+        )
+
+    def _snapshot(self, streak):
+        return (
+            streak.current_streak,
+            streak.longest_streak,
+            streak.last_completed_date,
+            streak.run_start,
+        )
+
+    def test_incremental_streak_matches_full_rebuild(self):
+        rng = random.Random(7)
+        start = date(2025, 1, 1)
+
+        for _ in range(120):
+            day = start + timedelta(days=rng.randrange(40))
+            status = rng.choice([HabitDay.STATUS_COMPLETED, HabitDay.STATUS_SKIPPED])
+            self._set(day, status)
+
+            incremental = self._snapshot(HabitStreak.objects.get(habit=self.habit))
+            rebuilt = self._snapshot(rebuild_streak(self.habit))
+            self.assertEqual(incremental, rebuilt)
+
+    def test_streak_view_reads_materialized_streak(self):
+        today = date.today()
+        for offset in range(3):
+            self._set(today - timedelta(days=offset), HabitDay.STATUS_COMPLETED)
+
+        with self.assertNumQueries(2):
+            res = self.client.get("/api/habits/streaks/")
+
+        self.assertEqual(res.data["biggest_streak"], 3)
+        self.assertEqual(res.data["current_streak"], 3)
+
+
+class HabitMonthViewTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+        self.user = User.objects.create()
+
+        self.habits = [
+            Habit.objects.create(user=self.user, title=f"H{i}", difficulty=self.diff)
+            for i in range(5)
+        ]
+        HabitDay.objects.create(
+            habit=self.habits[0],
+            date=date(2025, 2, 3),
+            status=HabitDay.STATUS_COMPLETED,
+            xp_awarded=True,
+        )
+        HabitDay.objects.create(
+            habit=self.habits[0],
+            date=date(2025, 2, 4),
+            status=HabitDay.STATUS_SKIPPED,
+        )
+
+    def test_month_uses_constant_queries(self):
+        # user + habity z difficulty + jedno zapytanie o dni
+        with self.assertNumQueries(3):
+            res = self.client.get("/api/habits/month/?month=2025-02")
+
+        self.assertEqual(len(res.data["habits"]), 5)
+        habit = next(h for h in res.data["habits"] if h["id"] == self.habits[0].id)
+        self.assertEqual(len(habit["days"]), 28)
+        self.assertEqual(habit["days"][2]["status"], HabitDay.STATUS_COMPLETED)
+        self.assertTrue(habit["days"][2]["xp_awarded"])
+
+    def test_compact_month_returns_status_strings(self):
+        res = self.client.get("/api/habits/month/?month=2025-02&compact=1")
+
+        habit = next(h for h in res.data["habits"] if h["id"] == self.habits[0].id)
+        self.assertNotIn("days", habit)
+        self.assertEqual(habit["statuses"], "0021" + "0" * 24)
+        self.assertEqual(habit["xp_awarded"], "001" + "0" * 25)
+
+
+# toggle-day z wykonanymi callbackami commitu — achievementy w requeście, nie w workerze
+@override_settings(ACHIEVEMENT_QUEUE={"BACKEND": "immediate"})
+class HabitYearViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+        self.user = User.objects.create()
+        self.habit = Habit.objects.create(user=self.user, title="H", difficulty=self.diff)
+
+    def _bits(self, encoded):
+        return int.from_bytes(base64.b64decode(encoded), "little")
+
+    def test_year_bitmap_is_cached_and_invalidated_on_toggle(self):
+        HabitDay.objects.create(
+            habit=self.habit,
+            date=date(2024, 1, 1),
+            status=HabitDay.STATUS_COMPLETED,
+        )
+        HabitDay.objects.create(
+            habit=self.habit,
+            date=date(2024, 12, 31),
+            status=HabitDay.STATUS_SKIPPED,
+        )
+
+        res = self.client.get("/api/habits/year/?year=2024")
+        habit = res.data["habits"][0]
+        self.assertEqual(res.data["days_in_year"], 366)
+        self.assertEqual(self._bits(habit["completed"]), 1)
+        self.assertEqual(self._bits(habit["skipped"]), 1 << 365)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/habits/{self.habit.id}/toggle-day/",
+                data={"date": "2024-01-02"},
+                format="json",
+            )
+
+        # user + habity + dni habitu przebudowane po toggle
+        with self.assertNumQueries(3):
+            res = self.client.get("/api/habits/year/?year=2024")
+
+        self.assertEqual(self._bits(res.data["habits"][0]["completed"]), 0b11)
+
+        # user + habity, dni z cache
+        with self.assertNumQueries(2):
+            self.client.get("/api/habits/year/?year=2024")
+
+    def test_bitmap_built_before_toggle_commit_is_not_served(self):
+        # odczyt "w locie": wersja pobrana przed toggle, zapis do cache po commicie
+        version = habit_calendar._year_versions([self.habit.id], 2024)[self.habit.id]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/habits/{self.habit.id}/toggle-day/",
+                data={"date": "2024-01-02"},
+                format="json",
+            )
+
+        cache.set(habit_calendar._year_cache_key(self.habit.id, 2024, version), (0, 0))
+
+        bits = habit_calendar.year_bitsets([self.habit.id], 2024)
+        self.assertEqual(bits[self.habit.id], (0b10, 0))
@@ -4,6 +4,7 @@ from .views import (
     HabitDetail,
     HabitDayToggleView,
     HabitMonthView,
+    HabitYearView,
     HabitStreakView,
     RandomHabitSummaryView,
 )
@@ -14,6 +15,7 @@ urlpatterns = [
     path("<int:pk>/", HabitDetail.as_view(), name="habit-detail"),
     path("<int:habit_id>/toggle-day/", HabitDayToggleView.as_view(), name="habit-toggle-day"),
     path("month/", HabitMonthView.as_view(), name="habit-month"),
+    path("year/", HabitYearView.as_view(), name="habit-year"),
     path("streaks/", HabitStreakView.as_view(), name="habit-streaks"),
     path("random/", RandomHabitSummaryView.as_view(), name="habit-random-summary"),
 ]
\ No newline at end of file
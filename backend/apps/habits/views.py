@@ -1,33 +1,54 @@
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db import transaction
 from datetime import datetime, date
 from django.utils import timezone
 import calendar
-import random
 
 from .models import Habit, HabitDay
 from .serializers import HabitSerializer, HabitDaySerializer
-from apps.gamification.services.xp_calculator import calculate_xp
-from apps.gamification.utils import get_user
-
-
-class HabitListCreate(generics.ListCreateAPIView):
+from .services.day_toggle import toggle_day
+from .services.streaks import best_streak
+from .services.habit_calendar import (
+    status_arrays,
+    encode_statuses,
+    encode_flags,
+    year_bitsets,
+    encode_bitset,
+    random_habit_summary,
+)
+from apps.achievements.services.achievement_engine import EVENT_HABIT_DAY
+from apps.achievements.services.job_queue import schedule_event
+from apps.common.services import user_cache
+from apps.sync.mixins import SyncETagMixin
+
+
+class HabitListCreate(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = HabitSerializer
+    sync_tables = ("habits",)
 
     def get_queryset(self):
-        return Habit.objects.filter(user=get_user(), is_active=True)
+        return Habit.objects.filter(
+            user=self.request.user,
+            is_active=True,
+        ).select_related("difficulty")
 
     def perform_create(self, serializer):
-        serializer.save(user=get_user())
+        serializer.save(user=self.request.user)
 
 
 class HabitDetail(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = HabitSerializer
 
     def get_queryset(self):
-        return Habit.objects.filter(user=get_user())
+        return Habit.objects.for_user(self.request.user)
+
+    def perform_destroy(self, instance):
+        user = instance.user
+        habit_id = instance.id
+        instance.delete()
+
+        schedule_event(user, EVENT_HABIT_DAY, habit_id=habit_id)
 
 
 class HabitDayToggleView(APIView):
@@ -47,52 +68,11 @@ class HabitDayToggleView(APIView):
             d = timezone.now().date()
 
         try:
-            habit = Habit.objects.get(pk=habit_id, user=get_user())
+            habit = Habit.objects.get(pk=habit_id, user=request.user)
         except Habit.DoesNotExist:
             return Response({"detail": "Habit not found"}, status=404)
 
-        with transaction.atomic():
-            obj, _ = HabitDay.objects.select_for_update().get_or_create(
-                habit=habit,
-                date=d,
-                defaults={
-                    "status": HabitDay.STATUS_EMPTY,
-                    "xp_awarded": False,
-                },
-            )
-
-            xp_added = 0
-            already_completed = obj.status == HabitDay.STATUS_COMPLETED and obj.xp_awarded
-
-            if status_val is None:
-                if obj.status == HabitDay.STATUS_EMPTY:
-                    new_status = HabitDay.STATUS_COMPLETED
-                elif obj.status == HabitDay.STATUS_COMPLETED:
-                    new_status = HabitDay.STATUS_SKIPPED
-                else:
-                    new_status = HabitDay.STATUS_EMPTY
-            else:
-                new_status = int(status_val)
-
-            obj.status = new_status
-            obj.save(update_fields=["status", "updated_at"])
-
-            if new_status == HabitDay.STATUS_COMPLETED and not obj.xp_awarded:
-                xp_amount = calculate_xp(
-                    module="habits",
-                    difficulty=habit.difficulty.name.lower(),
-                    user=habit.user,
-                )
-
-                habit.user.add_xp(
-                    xp=xp_amount,
-                    source="habit",
-                    source_id=obj.id,
-                )
-
-                obj.xp_awarded = True
-                obj.save(update_fields=["xp_awarded"])
-                xp_added = xp_amount
+        obj, xp_added, already_completed = toggle_day(habit, d, status_val)
 
         return Response(
             {
@@ -123,113 +103,110 @@ class HabitMonthView(APIView):
             )
 
         _, last_day = calendar.monthrange(year, mon)
+
+        compact = request.query_params.get("compact") in ("1", "true")
+
+        payload = user_cache.get_or_compute(
+            request.user,
+            "habit_month",
+            (user_cache.HABITS,),
+            lambda: self._build(request.user, year, mon, last_day, compact),
+            params=(year, mon, compact),
+        )
+
+        return Response({**payload, "month": month_q})
+
+    def _build(self, user, year, mon, last_day, compact):
         first_date = date(year, mon, 1)
         last_date = date(year, mon, last_day)
 
-        habits = Habit.objects.filter(user=get_user(), is_active=True)
-        result = []
+        habits = list(
+            Habit.objects.filter(
+                user=user,
+                is_active=True,
+            ).select_related("difficulty")
+        )
 
-        for h in habits:
-            days_qs = HabitDay.objects.filter(
-                habit=h,
-                date__range=(first_date, last_date),
-            )
-            days_map = {hd.date: hd for hd in days_qs}
+        arrays = status_arrays([h.id for h in habits], first_date, last_date)
+        dates = [
+            date(year, mon, day).isoformat()
+            for day in range(1, last_day + 1)
+        ]
+
+        result = HabitSerializer(habits, many=True).data
 
-            days = []
-            for day in range(1, last_day + 1):
-                d = date(year, mon, day)
-                hd = days_map.get(d)
-                days.append(
+        for habit_data in result:
+            statuses, xp_awarded = arrays[habit_data["id"]]
+
+            if compact:
+                # jedna cyfra na dzień miesiąca zamiast 31 obiektów
+                habit_data["statuses"] = encode_statuses(statuses)
+                habit_data["xp_awarded"] = encode_flags(xp_awarded)
+            else:
+                habit_data["days"] = [
                     {
-                        "date": d.isoformat(),
-                        "status": hd.status if hd else HabitDay.STATUS_EMPTY,
-                        "xp_awarded": hd.xp_awarded if hd else False,
+                        "date": d,
+                        "status": st,
+                        "xp_awarded": xp,
                     }
-                )
+                    for d, st, xp in zip(dates, statuses, xp_awarded)
+                ]
+
+        return {
+            "habits": result,
+            "first_day": first_date.isoformat(),
+            "last_day": last_date.isoformat(),
+            "compact": compact,
+        }
+
+
+class HabitYearView(APIView):
+    def get(self, request):
+        today = timezone.now().date()
+
+        try:
+            year = int(request.query_params.get("year", today.year))
+            date(year, 1, 1)
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "Invalid year"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        habits = list(
+            Habit.objects.filter(user=request.user, is_active=True)
+            .values("id", "title", "color")
+        )
+
+        bitsets = year_bitsets([h["id"] for h in habits], year)
 
-            habit_data = HabitSerializer(h).data
-            habit_data["days"] = days
-            result.append(habit_data)
+        for h in habits:
+            completed, skipped = bitsets[h["id"]]
+            h["completed"] = encode_bitset(completed)
+            h["skipped"] = encode_bitset(skipped)
 
         return Response(
             {
-                "habits": result,
-                "month": month_q,
-                "first_day": first_date.isoformat(),
-                "last_day": last_date.isoformat(),
+                "year": year,
+                "days_in_year": 366 if calendar.isleap(year) else 365,
+                "habits": habits,
             }
         )
 
 
 class HabitStreakView(APIView):
     def get(self, request):
-        habits = Habit.objects.filter(user=get_user(), is_active=True)
-
-        best = {
-            "habit_id": None,
-            "title": None,
-            "biggest_streak": 0,
-            "current_streak": 0,
-        }
-
-        for h in habits:
-            days = HabitDay.objects.filter(habit=h).order_by("date")
-
-            max_streak = 0
-            cur = 0
-            last_date = None
-
-            for d in days:
-                if d.status == HabitDay.STATUS_COMPLETED:
-                    if last_date and (d.date - last_date).days == 1:
-                        cur += 1
-                    else:
-                        cur = 1
-                    max_streak = max(max_streak, cur)
-                else:
-                    cur = 0
-                last_date = d.date
-
-            current_streak = 0
-            for d in reversed(days):
-                if d.status == HabitDay.STATUS_COMPLETED:
-                    current_streak += 1
-                else:
-                    break
-
-            if max_streak > best["biggest_streak"]:
-                best.update(
-                    {
-                        "habit_id": h.id,
-                        "title": h.title,
-                        "biggest_streak": max_streak,
-                        "current_streak": current_streak,
-                    }
-                )
-
+        today = timezone.now().date()
+        best = user_cache.get_or_compute(
+            request.user,
+            "habit_streak",
+            (user_cache.HABITS,),
+            lambda: best_streak(request.user, today),
+            params=(today,),
+        )
         return Response(best, status=status.HTTP_200_OK)
 
 class RandomHabitSummaryView(APIView):
     def get(self, request):
-        today = timezone.now().date()
-        habits = Habit.objects.filter(user=get_user(), is_active=True)
-        if not habits.exists():
-            return Response(None, status=status.HTTP_200_OK)
-
-        picked = random.choice(list(habits))
-        _, last_day = calendar.monthrange(today.year, today.month)
-        first_date = date(today.year, today.month, 1)
-        last_date = date(today.year, today.month, last_day)
-
-        days_qs = HabitDay.objects.filter(habit=picked, date__range=(first_date, last_date))
-        done = days_qs.filter(status=HabitDay.STATUS_COMPLETED).count()
-
-        summary = {
-            "id": picked.id,
-            "title": picked.title,
-            "reason": picked.motivation_reason,
-            "done": done,
-            "total": last_day,
-        }
-        return Response(summary, status=status.HTTP_200_OK)
\ No newline at end of file
+        summary = random_habit_summary(request.user, timezone.now().date())
+        return Response(summary, status=status.HTTP_200_OK)
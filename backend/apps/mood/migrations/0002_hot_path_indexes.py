@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0009_hot_path_indexes'),
+        ('mood', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moodentry',
+            index=models.Index(fields=['user', 'mood'], name='mood_user_mood_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils import timezone
 from apps.gamification.services.xp_calculator import calculate_xp
+from apps.common.managers import UserScopedManager
 
 
 class MoodEntry(models.Model):
@@ -25,9 +26,14 @@ class MoodEntry(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedManager()
+
     class Meta:
         unique_together = ("user", "date")
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["user", "mood"], name="mood_user_mood_idx"),
+        ]
 
     def award_xp_if_needed(self):
         if self.xp_awarded:
@@ -49,6 +55,6 @@ class MoodEntry(models.Model):
         )
 
         self.xp_awarded = True
-        self.save(update_fields=["xp_awarded"])
+        self.save(update_fields=["xp_awarded", "updated_at"])
 
         return xp
\ No newline at end of file
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import MoodEntry
-from apps.gamification.utils import get_user
+from apps.achievements.services.achievement_engine import EVENT_MOOD
+from apps.achievements.services.job_queue import schedule_event
 from django.utils import timezone
 
 
@@ -19,10 +20,12 @@ class MoodEntrySerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
-        validated_data["user"] = get_user()
+        validated_data["user"] = self.context["request"].user
         instance = super().create(validated_data)
 
         xp = instance.award_xp_if_needed()
         instance.xp_gained = xp
 
+        schedule_event(instance.user, EVENT_MOOD, delta=1, mood=instance.mood)
+
         return instance
\ No newline at end of file
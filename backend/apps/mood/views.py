@@ -1,17 +1,20 @@
 from rest_framework import generics
 from .models import MoodEntry
 from .serializers import MoodEntrySerializer
-from apps.gamification.utils import get_user
+from apps.achievements.services.achievement_engine import EVENT_MOOD
+from apps.achievements.services.job_queue import schedule_event
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from apps.sync.mixins import SyncETagMixin
 
 
-class MoodListCreate(generics.ListCreateAPIView):
+class MoodListCreate(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = MoodEntrySerializer
+    sync_tables = ("mood_entries",)
 
     def get_queryset(self):
         year = self.request.query_params.get("year")
-        qs = MoodEntry.objects.filter(user=get_user())
+        qs = MoodEntry.objects.for_user(self.request.user)
 
         if year:
             qs = qs.filter(date__year=year)
@@ -23,7 +26,20 @@ class MoodDetail(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = MoodEntrySerializer
 
     def get_queryset(self):
-        return MoodEntry.objects.filter(user=get_user())
+        return MoodEntry.objects.for_user(self.request.user)
+
+    def perform_update(self, serializer):
+        entry = serializer.save()
+
+        # zmiana mood przesuwa liczniki specific_mood_count
+        schedule_event(entry.user, EVENT_MOOD)
+
+    def perform_destroy(self, instance):
+        user = instance.user
+        mood = instance.mood
+        instance.delete()
+
+        schedule_event(user, EVENT_MOOD, delta=-1, mood=mood)
     
 class MoodTypesView(APIView):
     def get(self, request):
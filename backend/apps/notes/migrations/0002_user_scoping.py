@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0008_authtoken'),
+        ('notes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='randomnote',
+            index=models.Index(fields=['user', 'updated_at'], name='notes_rando_user_id_c6b2cc_idx'),
+        ),
+    ]
@@ -1,9 +1,15 @@
 from django.db import models
+from apps.common.managers import UserScopedManager
 
 class RandomNote(models.Model):
     user = models.ForeignKey("gamification.User", on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
 
+    objects = UserScopedManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "updated_at"]),
+        ]
@@ -1,37 +1,44 @@
-from apps.achievements.services.achievement_engine import check_user_achievements
+from apps.achievements.services.achievement_engine import EVENT_NOTE
+from apps.achievements.services.job_queue import schedule_event
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from .models import RandomNote
 from .serializers import RandomNoteSerializer
-from apps.gamification.utils import get_user
-import random
+from apps.common.services.random_pick import pick_random
+from apps.sync.mixins import SyncETagMixin
 
-class NotesListCreateView(generics.ListCreateAPIView):
+class NotesListCreateView(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = RandomNoteSerializer
+    sync_tables = ("notes",)
 
     def get_queryset(self):
         return RandomNote.objects.filter(
-            user=get_user()
+            user=self.request.user
         ).order_by("-updated_at")
 
     def perform_create(self, serializer):
-        note = serializer.save(user=get_user())
-        check_user_achievements(get_user())
+        note = serializer.save(user=self.request.user)
+        schedule_event(note.user, EVENT_NOTE, delta=1)
 
 class NoteDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = RandomNoteSerializer
 
     def get_queryset(self):
-        return RandomNote.objects.filter(user=get_user())
+        return RandomNote.objects.for_user(self.request.user)
+
+    def perform_destroy(self, instance):
+        user = instance.user
+        instance.delete()
+        schedule_event(user, EVENT_NOTE, delta=-1)
 
 
 class RandomNoteView(APIView):
     def get(self, request):
-        qs = RandomNote.objects.filter(user=get_user())
+        qs = RandomNote.objects.for_user(request.user)
 
-        if not qs.exists():
+        note = pick_random(qs)
+        if note is None:
             return Response(None, status=status.HTTP_200_OK)
 
-        note = random.choice(qs)
         return Response(RandomNoteSerializer(note).data)
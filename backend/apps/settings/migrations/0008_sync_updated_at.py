@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('settings', '0007_alter_userpreference_key_alter_userpreference_value'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardtile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='moduledefinition',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='userpreference',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
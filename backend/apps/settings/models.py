@@ -1,5 +1,6 @@
 from django.db import models
 from apps.gamification.models import User
+from apps.common.managers import UserScopedManager
 
 
 class ModuleDefinition(models.Model):
@@ -19,6 +20,9 @@ class ModuleDefinition(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     module = models.CharField(max_length=30, choices=MODULE_CHOICES)
     is_enabled = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
 
     class Meta:
         unique_together = ("user", "module")
@@ -57,6 +61,10 @@ class DashboardTile(models.Model):
     null=True
 )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
+
     class Meta:
         unique_together = ("user", "key")
 
@@ -74,6 +82,10 @@ class UserPreference(models.Model):
     key = models.CharField(max_length=50, choices=PREFERENCE_KEYS)
     value = models.CharField(max_length=50, blank=True, null=True)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
+
     class Meta:
         unique_together = ("user", "key")
 
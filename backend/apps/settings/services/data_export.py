@@ -0,0 +1,149 @@
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from apps.achievements.models import Achievement, UserAchievement
+from apps.challenges.models import ChallengeDefinition, ChallengeTag, UserChallenge
+from apps.gamification.models import User, XPLog
+from apps.goals.models import Goal, GoalStep
+from apps.habits.models import Habit, HabitDay
+from apps.mood.models import MoodEntry
+from apps.notes.models import RandomNote
+from apps.settings.models import DashboardTile, ModuleDefinition
+from apps.sobriety.models import Sobriety, SobrietyRelapse
+from apps.todos.models import TodoCategory, TodoTask
+
+
+FORMAT = "lucky-prism-ndjson"
+FORMAT_VERSION = 1
+CONTENT_TYPE = "application/x-ndjson"
+
+# wierszy na jedno zapytanie przy iteracji
+CHUNK_SIZE = 2000
+# ile bajtów zbieramy przed wysłaniem kawałka odpowiedzi
+FLUSH_BYTES = 64 * 1024
+
+
+# nazwa tabeli -> (model, queryset dla usera). Kolejność = bezpieczna kolejność importu.
+TABLES = {
+    "user": (User, lambda user: User.objects.filter(pk=user.pk)),
+    "challenge_tags": (ChallengeTag, lambda user: ChallengeTag.objects.for_user(user)),
+    "challenge_definitions": (
+        ChallengeDefinition,
+        lambda user: ChallengeDefinition.objects.for_user(user),
+    ),
+    "challenge_definition_tags": (
+        ChallengeDefinition.tags.through,
+        lambda user: ChallengeDefinition.tags.through.objects.filter(
+            challengedefinition__in=ChallengeDefinition.objects.for_user(user),
+        ),
+    ),
+    "todo_categories": (TodoCategory, lambda user: TodoCategory.objects.for_user(user)),
+    "achievements": (Achievement, lambda user: Achievement.objects.for_user(user)),
+    "habits": (Habit, lambda user: Habit.objects.for_user(user)),
+    "habit_days": (HabitDay, lambda user: HabitDay.objects.for_user(user)),
+    "goals": (Goal, lambda user: Goal.objects.for_user(user)),
+    "goal_steps": (GoalStep, lambda user: GoalStep.objects.for_user(user)),
+    "xp_logs": (XPLog, lambda user: XPLog.objects.filter(user=user)),
+    "user_challenges": (UserChallenge, lambda user: UserChallenge.objects.for_user(user)),
+    "todo_tasks": (TodoTask, lambda user: TodoTask.objects.for_user(user)),
+    "notes": (RandomNote, lambda user: RandomNote.objects.for_user(user)),
+    "module_settings": (ModuleDefinition, lambda user: ModuleDefinition.objects.for_user(user)),
+    "dashboard_tiles": (DashboardTile, lambda user: DashboardTile.objects.for_user(user)),
+    "mood_entries": (MoodEntry, lambda user: MoodEntry.objects.for_user(user)),
+    "sobriety": (Sobriety, lambda user: Sobriety.objects.for_user(user)),
+    "sobriety_relapses": (SobrietyRelapse, lambda user: SobrietyRelapse.objects.for_user(user)),
+    "user_achievements": (
+        UserAchievement,
+        lambda user: UserAchievement.objects.for_user(user),
+    ),
+}
+
+
+def _columns(model):
+    # attname (habit_id zamiast habit) — values() nie ładuje powiązanych obiektów
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+class _ExportEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder ucina mikrosekundy — import ma odtworzyć daty 1:1
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _dumps(obj):
+    return json.dumps(obj, cls=_ExportEncoder, separators=(",", ":"))
+
+
+def export_lines(user):
+    """
+    Linie NDJSON eksportu:
+      {"format": ..., "version": ..., "exported_at": ...}
+      {"table": "habits", "row": {...}}   — po jednej linii na wiersz
+    Tabele czytane przez values().iterator(), więc pamięć nie rośnie z historią.
+    """
+
+    yield _dumps(
+        {
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "exported_at": timezone.now(),
+        }
+    ) + "\n"
+
+    for table, (model, queryset) in TABLES.items():
+        rows = queryset(user).order_by("pk").values(*_columns(model))
+
+        for row in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield _dumps({"table": table, "row": row}) + "\n"
+
+
+def export_chunks(user):
+    """
+    export_lines sklejone w kawałki ~FLUSH_BYTES (mniej wywołań write przy streamingu).
+    """
+
+    buffer = []
+    size = 0
+
+    for line in export_lines(user):
+        buffer.append(line)
+        size += len(line)
+
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def read_lines(stream):
+    """
+    Parsuje NDJSON linia po linii -> (table, row). Nagłówek jest walidowany i pomijany.
+    """
+
+    for number, raw in enumerate(stream, start=1):
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+
+        raw = raw.strip()
+        if not raw:
+            continue
+
+        entry = json.loads(raw)
+
+        if "format" in entry:
+            if entry["format"] != FORMAT or entry.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported export format in line {number}")
+            continue
+
+        if entry.get("table") not in TABLES:
+            raise ValueError(f"Unknown table in line {number}: {entry.get('table')!r}")
+
+        yield entry["table"], entry["row"]
@@ -0,0 +1,316 @@
+import json
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from apps.achievements.models import UserAchievement
+from apps.achievements.services.achievement_engine import check_user_achievements
+from apps.challenges.models import UserChallenge
+from apps.common.services import user_cache
+from apps.gamification.models import User, XPDailyRollup, XPLog
+from apps.gamification.services.level_calculator import calculate_level
+from apps.gamification.services.xp_rollup import rebuild_rollups
+from apps.goals.models import Goal, GoalStep, period_end_after
+from apps.habits.models import Habit, HabitDay, HabitStreak
+from apps.habits.services.habit_calendar import invalidate_year_bitsets
+from apps.habits.services.streaks import rebuild_streak
+from apps.mood.models import MoodEntry
+from apps.notes.models import RandomNote
+from apps.settings.models import DashboardTile, ModuleDefinition
+from apps.settings.services import data_export
+from apps.sobriety.models import Sobriety, SobrietyRelapse
+from apps.sync.services.changes import record_reset
+from apps.todos.models import TodoTask
+
+
+# tabele odtwarzane przy imporcie (słowniki i sam user zostają jak są)
+IMPORT_TABLES = [
+    "habits",
+    "habit_days",
+    "goals",
+    "goal_steps",
+    "xp_logs",
+    "user_challenges",
+    "todo_tasks",
+    "notes",
+    "module_settings",
+    "dashboard_tiles",
+    "mood_entries",
+    "sobriety",
+    "sobriety_relapses",
+    "user_achievements",
+]
+
+# (model, lookup do usera) — dzieci przed rodzicami, żeby nie było kaskad
+RESET_ORDER = [
+    (XPDailyRollup, "user"),
+    (XPLog, "user"),
+    (HabitStreak, "habit__user"),
+    (HabitDay, "habit__user"),
+    (Habit, "user"),
+    (GoalStep, "goal__user"),
+    (Goal, "user"),
+    (UserChallenge, "user"),
+    (TodoTask, "user"),
+    (RandomNote, "user"),
+    (ModuleDefinition, "user"),
+    (DashboardTile, "user"),
+    (MoodEntry, "user"),
+    (SobrietyRelapse, "sobriety__user"),
+    (Sobriety, "user"),
+    (UserAchievement, "user"),
+]
+
+
+def _batch_size():
+    return getattr(settings, "DATA_IMPORT", {}).get("BATCH_SIZE", 1000)
+
+
+def _elapsed(started):
+    return round(time.perf_counter() - started, 3)
+
+
+def reset_user_data(user):
+    """
+    Jeden DELETE na tabelę. _raw_delete pomija zbieranie obiektów do kaskad
+    i sygnały per wiersz — cache usera jest unieważniany raz, po imporcie.
+    """
+
+    for model, lookup in RESET_ORDER:
+        model.objects.filter(**{lookup: user})._raw_delete(using=connection.alias)
+
+    # bez tombstonów per wiersz — klienci /api/sync/ dostaną reset i pobiorą wszystko
+    record_reset(user)
+
+
+class _ParentIds:
+    """
+    id rodziców, na które wolno wskazywać importowanym wierszom: utworzone wcześniej
+    w tym samym imporcie (habits, goals, sobriety) albo widoczne dla usera
+    (kategorie, definicje wyzwań, osiągnięcia — systemowe + jego).
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.imported = {data_export.TABLES[table][0]: set() for table in IMPORT_TABLES}
+        self.visible = {}
+
+    def allowed(self, model):
+        if model in self.imported:
+            return self.imported[model]
+
+        if model not in self.visible:
+            self.visible[model] = set(
+                model.objects.for_user(self.user).values_list("pk", flat=True)
+            )
+
+        return self.visible[model]
+
+
+class _TableWriter:
+    """
+    Zbiera wiersze jednej tabeli i wstawia je paczkami.
+
+    Zamiast bulk_create idzie surowy INSERT (raw=True, tak jak loaddata):
+    bulk_create nadpisałby created_at / updated_at (auto_now_add / auto_now)
+    bieżącym czasem, a import ma zachować oryginalne daty.
+
+    user_id jest nadpisywany, a klucze do rodziców należących do userów
+    (habit_id, goal_id, category_id, ...) sprawdzane — wiersz wskazujący na cudzy
+    rekord przerywa import.
+    """
+
+    def __init__(self, user, table, batch_size, parent_ids):
+        self.user = user
+        self.table = table
+        self.model, _ = data_export.TABLES[table]
+        self.fields = self.model._meta.concrete_fields
+        self.attnames = {field.attname for field in self.fields}
+        self.pk_attname = self.model._meta.pk.attname
+        self.parent_ids = parent_ids
+        self.parents = [
+            (field.attname, field.related_model)
+            for field in self.fields
+            if field.is_relation
+            and field.related_model is not User
+            and hasattr(field.related_model.objects, "for_user")
+        ]
+        self.batch_size = batch_size
+        self.pending = []
+        self.rows = 0
+        self.started = time.perf_counter()
+
+    def add(self, row):
+        row = {key: value for key, value in row.items() if key in self.attnames}
+
+        if "user_id" in self.attnames:
+            row["user_id"] = self.user.id
+
+        for attname, model in self.parents:
+            value = row.get(attname)
+            if value is not None and value not in self.parent_ids.allowed(model):
+                raise ValueError(
+                    f"{self.table}: {attname}={value!r} is not part of this import"
+                )
+
+        self.parent_ids.imported[self.model].add(row.get(self.pk_attname))
+
+        self.pending.append(self.model(**row))
+
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        # SQLite ma limit parametrów na zapytanie
+        size = connection.ops.bulk_batch_size(self.fields, self.pending) or len(self.pending)
+
+        for start in range(0, len(self.pending), size):
+            self.model._base_manager._insert(
+                self.pending[start:start + size],
+                fields=self.fields,
+                raw=True,
+            )
+
+        self.rows += len(self.pending)
+        self.pending = []
+
+    def report(self):
+        return {"rows": self.rows, "seconds": _elapsed(self.started)}
+
+
+def _close(writer, tables):
+    writer.flush()
+    report = writer.report()
+
+    # tabela rozbita na kilka fragmentów pliku — sumujemy
+    if writer.table in tables:
+        previous = tables[writer.table]
+        report = {
+            "rows": previous["rows"] + report["rows"],
+            "seconds": round(previous["seconds"] + report["seconds"], 3),
+        }
+
+    tables[writer.table] = report
+
+
+def _legacy_rows(payload):
+    """
+    Stary backup.json: {"habits": "<django serializers json>", ...} -> (table, row).
+    """
+
+    for table in IMPORT_TABLES:
+        if not payload.get(table):
+            continue
+
+        model, _ = data_export.TABLES[table]
+
+        for obj in json.loads(payload[table]):
+            row = {model._meta.pk.attname: obj["pk"]}
+
+            for name, value in obj["fields"].items():
+                field = model._meta.get_field(name)
+                if not field.many_to_many:
+                    row[field.attname] = value
+
+            yield table, row
+
+
+def _fill_period_ends(user):
+    # kopie sprzed wprowadzenia period_end nie mają tej kolumny
+    goals = list(Goal.objects.filter(user=user, period_end__isnull=True).select_related("period"))
+    for goal in goals:
+        goal.period_end = period_end_after(goal.period.name, goal.created_at)
+    Goal.objects.bulk_update(goals, ["period_end"], batch_size=_batch_size())
+
+    challenges = list(
+        UserChallenge.objects.filter(user=user, period_end__isnull=True)
+        .select_related("challenge_type")
+    )
+    for challenge in challenges:
+        challenge.set_period()
+    UserChallenge.objects.bulk_update(
+        challenges,
+        ["weekly_deadline", "period_end"],
+        batch_size=_batch_size(),
+    )
+
+
+def _recompute(user, habit_years):
+    """
+    Jednorazowe przeliczenie wszystkiego, co wynika z zaimportowanej historii.
+    """
+
+    total_xp = XPLog.objects.filter(user=user).aggregate(total=Sum("xp"))["total"] or 0
+    user.total_xp = total_xp
+    user.current_level = calculate_level(total_xp)
+    User.objects.filter(pk=user.pk).update(
+        total_xp=user.total_xp,
+        current_level=user.current_level,
+    )
+
+    rebuild_rollups(user.id, batch_size=_batch_size())
+
+    _fill_period_ends(user)
+
+    habits = list(Habit.objects.filter(user=user))
+    for habit in habits:
+        rebuild_streak(habit)
+
+    invalidate_year_bitsets([habit.id for habit in habits], habit_years)
+
+    check_user_achievements(user)
+
+    user_cache.bump(user.id, *user_cache.ALL_RESOURCES)
+
+
+def import_data(user, *, stream=None, payload=None, batch_size=None):
+    """
+    Kasuje dane usera i wgrywa je z NDJSON (`stream`, linia po linii) albo starego
+    backup.json (`payload`). Zwraca raport: wiersze i czas per tabela.
+    """
+
+    batch_size = batch_size or _batch_size()
+    started = time.perf_counter()
+
+    rows = data_export.read_lines(stream) if stream is not None else _legacy_rows(payload)
+
+    tables = {}
+    habit_years = set()
+    parent_ids = _ParentIds(user)
+
+    with transaction.atomic():
+        reset_user_data(user)
+
+        writer = None
+
+        for table, row in rows:
+            if table not in IMPORT_TABLES:
+                continue
+
+            if writer is None or writer.table != table:
+                if writer is not None:
+                    _close(writer, tables)
+
+                writer = _TableWriter(user, table, batch_size, parent_ids)
+
+            if table == "habit_days":
+                habit_years.add(int(str(row["date"])[:4]))
+
+            writer.add(row)
+
+        if writer is not None:
+            _close(writer, tables)
+
+        recompute_started = time.perf_counter()
+        _recompute(user, habit_years)
+
+    return {
+        "tables": tables,
+        "recompute_seconds": _elapsed(recompute_started),
+        "total_seconds": _elapsed(started),
+    }
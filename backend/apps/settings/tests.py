@@ -1,3 +1,131 @@
-from django.test import TestCase
+import json
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core import serializers as django_serializers
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.common.models import DifficultyType
+from apps.gamification.models import User, XPDailyRollup, XPLog
+from apps.habits.models import Habit, HabitDay
+from apps.mood.models import MoodEntry
+from apps.settings.services.data_export import CONTENT_TYPE, FORMAT
+
+
+def _export(client):
+    res = client.get("/api/settings/export/")
+    body = b"".join(res.streaming_content).decode()
+    return res, body, [json.loads(line) for line in body.splitlines()]
+
+
+class ExportImportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create()
+        self.other = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+        self.habit = Habit.objects.create(user=self.user, title="Read", difficulty=self.diff)
+        start = date(2024, 1, 1)
+        for i in range(50):
+            HabitDay.objects.create(
+                habit=self.habit,
+                date=start + timedelta(days=i),
+                status=HabitDay.STATUS_COMPLETED,
+            )
+
+        Habit.objects.create(user=self.other, title="Other", difficulty=self.diff)
+
+        self.log = XPLog.objects.create(user=self.user, source="habit", xp=120)
+        XPLog.objects.filter(pk=self.log.pk).update(created_at=timezone.now() - timedelta(days=30))
+        MoodEntry.objects.create(user=self.user, mood="good", date=date(2025, 1, 1), time="08:00")
+
+    def test_export_streams_ndjson_rows_of_request_user(self):
+        res, _, lines = _export(self.client)
+
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], CONTENT_TYPE)
+        self.assertEqual(lines[0]["format"], FORMAT)
+
+        habits = [line["row"] for line in lines[1:] if line["table"] == "habits"]
+        days = [line["row"] for line in lines[1:] if line["table"] == "habit_days"]
+
+        self.assertEqual([h["title"] for h in habits], ["Read"])
+        self.assertEqual(len(days), 50)
+        self.assertEqual(days[0]["habit_id"], self.habit.id)
+        self.assertEqual(days[0]["date"], "2024-01-01")
+
+    @override_settings(DATA_IMPORT={"BATCH_SIZE": 7})
+    def test_ndjson_export_roundtrips_through_import(self):
+        _, body, _ = _export(self.client)
+        created_at = XPLog.objects.get(pk=self.log.pk).created_at
+
+        Habit.objects.filter(user=self.user).delete()
+
+        res = self.client.generic(
+            "POST",
+            "/api/settings/import/",
+            body.encode(),
+            content_type=CONTENT_TYPE,
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["tables"]["habit_days"]["rows"], 50)
+        self.assertEqual(res.data["tables"]["xp_logs"]["rows"], 1)
+        # wpisy nastroju są kasowane przed wgraniem, inaczej INSERT łapie ich stare id
+        self.assertEqual(MoodEntry.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(
+            list(Habit.objects.filter(user=self.user).values_list("title", flat=True)),
+            ["Read"],
+        )
+        self.assertEqual(HabitDay.objects.for_user(self.user).count(), 50)
+        self.assertTrue(Habit.objects.filter(user=self.other).exists())
+
+        # oryginalne daty zostają, pochodne liczone raz na końcu
+        self.assertEqual(XPLog.objects.get(pk=self.log.pk).created_at, created_at)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.total_xp, 120)
+        self.assertEqual(XPDailyRollup.objects.get(user=self.user).xp_sum, 120)
+        self.assertEqual(Habit.objects.get(user=self.user).streak.longest_streak, 50)
+
+    def test_legacy_json_backup_is_still_importable(self):
+        payload = {
+            "habits": django_serializers.serialize("json", Habit.objects.filter(user=self.user)),
+            "habit_days": django_serializers.serialize(
+                "json", HabitDay.objects.filter(habit__user=self.user)
+            ),
+        }
+
+        Habit.objects.filter(user=self.user).delete()
+
+        res = self.client.post("/api/settings/import/", payload, format="json")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["tables"]["habits"]["rows"], 1)
+        self.assertEqual(HabitDay.objects.for_user(self.user).count(), 50)
+        # import czyści też XP, którego nie było w pliku
+        self.assertFalse(XPLog.objects.filter(user=self.user).exists())
+
+    def test_rows_pointing_at_other_users_parents_are_rejected(self):
+        _, body, _ = _export(self.client)
+        foreign = Habit.objects.get(user=self.other)
+        line = {
+            "table": "habit_days",
+            "row": {"habit_id": foreign.id, "date": "2025-02-01", "status": HabitDay.STATUS_COMPLETED},
+        }
+        body += json.dumps(line) + "\n"
+
+        res = self.client.generic(
+            "POST",
+            "/api/settings/import/",
+            body.encode(),
+            content_type=CONTENT_TYPE,
+        )
+
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("habit_id", res.data["detail"])
+        self.assertFalse(foreign.days.exists())
+        # całość w transakcji — dane usera zostają nietknięte
+        self.assertEqual(HabitDay.objects.for_user(self.user).count(), 50)
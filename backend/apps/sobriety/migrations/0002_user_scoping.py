@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0008_authtoken'),
+        ('sobriety', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sobriety',
+            index=models.Index(fields=['user', 'created_at'], name='sobriety_so_user_id_eb9608_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.utils import timezone
+from apps.common.managers import UserScopedManager
 
 class Sobriety(models.Model):
     user = models.ForeignKey("gamification.User", on_delete=models.CASCADE)
@@ -16,6 +17,13 @@ class Sobriety(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
+
     def current_duration(self):
         if self.is_active:
             return timezone.now() - self.started_at
@@ -35,6 +43,10 @@ class SobrietyRelapse(models.Model):
 
     occurred_at = models.DateTimeField(default=timezone.now)
     note = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
+    user_lookup = "sobriety__user"
 
     def __str__(self):
         return f"{self.sobriety.name} relapse at {self.occurred_at}"    
\ No newline at end of file
@@ -6,8 +6,8 @@ from django.utils import timezone
 
 from .models import Sobriety, SobrietyRelapse
 from .serializers import SobrietySerializer, SobrietyRelapseSerializer
-from apps.gamification.utils import get_user
-from apps.achievements.services.achievement_engine import check_user_achievements
+from apps.achievements.services.achievement_engine import EVENT_SOBRIETY
+from apps.achievements.services.job_queue import schedule_event
 
 
 
@@ -16,26 +16,36 @@ class SobrietyListCreateView(generics.ListCreateAPIView):
     serializer_class = SobrietySerializer
 
     def get_queryset(self):
-        user = get_user()
-        return Sobriety.objects.filter(user=user).order_by("-created_at")
+        user = self.request.user
+        return (
+            Sobriety.objects.for_user(user)
+            .prefetch_related("relapses")
+            .order_by("-created_at")
+        )
 
     def perform_create(self, serializer):
-        user = get_user()
-        serializer.save(user=user)
-        check_user_achievements(user)
+        user = self.request.user
+        sobriety = serializer.save(user=user)
+        schedule_event(user, EVENT_SOBRIETY, sobriety_id=sobriety.id)
 
 
 # RETRIEVE + UPDATE + DELETE
 class SobrietyDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = SobrietySerializer
-    queryset = Sobriety.objects.all()
+
+    def get_queryset(self):
+        return Sobriety.objects.for_user(self.request.user)
+
+    def perform_update(self, serializer):
+        sobriety = serializer.save()
+        schedule_event(sobriety.user, EVENT_SOBRIETY, sobriety_id=sobriety.id)
 
 
 # RELAPSE CREATE
 class SobrietyRelapseCreateView(APIView):
     def post(self, request, sobriety_id):
         try:
-            sobriety = Sobriety.objects.get(id=sobriety_id)
+            sobriety = Sobriety.objects.for_user(request.user).get(id=sobriety_id)
         except Sobriety.DoesNotExist:
             return Response({"detail": "Not found"}, status=404)
 
@@ -46,9 +56,9 @@ class SobrietyRelapseCreateView(APIView):
             # automatycznie kończymy streak
             sobriety.is_active = False
             sobriety.ended_at = timezone.now()
-            sobriety.save(update_fields=["is_active", "ended_at"])
+            sobriety.save(update_fields=["is_active", "ended_at", "updated_at"])
 
-            check_user_achievements(sobriety.user)
+            schedule_event(sobriety.user, EVENT_SOBRIETY, sobriety_id=sobriety.id)
 
             return Response(serializer.data, status=201)
 
@@ -59,15 +69,15 @@ class SobrietyRelapseCreateView(APIView):
 class SobrietyRestartView(APIView):
     def post(self, request, sobriety_id):
         try:
-            sobriety = Sobriety.objects.get(id=sobriety_id)
+            sobriety = Sobriety.objects.for_user(request.user).get(id=sobriety_id)
         except Sobriety.DoesNotExist:
             return Response({"detail": "Not found"}, status=404)
 
         sobriety.started_at = timezone.now()
         sobriety.ended_at = None
         sobriety.is_active = True
-        sobriety.save(update_fields=["started_at", "ended_at", "is_active"])
+        sobriety.save(update_fields=["started_at", "ended_at", "is_active", "updated_at"])
 
-        check_user_achievements(sobriety.user)
+        schedule_event(sobriety.user, EVENT_SOBRIETY, sobriety_id=sobriety.id)
 
         return Response({"detail": "Restarted"}, status=200)
\ No newline at end of file
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.sync.services.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Usuwa tombstony starsze niż SYNC['TOMBSTONE_DAYS'] (klienci z starszym kursorem robią pełny sync)."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(f"[SYNC] pruned {deleted} tombstones")
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:26
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('gamification', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=40)),
+                ('object_id', models.BigIntegerField(default=0)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='gamification.user')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'deleted_at'], name='tombstone_user_deleted_idx')],
+            },
+        ),
+    ]
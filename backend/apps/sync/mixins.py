@@ -0,0 +1,28 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from .services.changes import latest_cursor
+
+
+class SyncETagMixin:
+    """
+    Warunkowy GET dla list: ETag = kursor ostatniej zmiany w `sync_tables`
+    (ten sam co w /api/sync/). Zgodny If-None-Match -> 304 bez serializacji.
+    Tylko dla list, których treść nie zależy od dzisiejszej daty.
+    """
+
+    sync_tables = ()
+
+    def _sync_etag(self, request):
+        return f'"{latest_cursor(request.user, self.sync_tables)}"'
+
+    def list(self, request, *args, **kwargs):
+        etag = self._sync_etag(request)
+
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+
+        return response
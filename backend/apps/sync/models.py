@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+from apps.common.managers import UserScopedManager
+
+
+class Tombstone(models.Model):
+    """
+    Ślad po usuniętym wierszu dla /api/sync/ — klient usuwa go ze swojego store'a.
+    table = "*" oznacza reset (np. import) — klient musi pobrać wszystko od nowa.
+    """
+
+    TABLE_RESET = "*"
+
+    # NULL = wiersz wspólny (systemowy), widoczny dla wszystkich
+    user = models.ForeignKey(
+        "gamification.User",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
+    table = models.CharField(max_length=40)
+    object_id = models.BigIntegerField(default=0)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    objects = UserScopedManager()
+    user_scope_shared = True
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="tombstone_user_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.table}:{self.object_id}"
@@ -0,0 +1,275 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Subquery
+from django.utils import timezone
+
+from apps.achievements.models import Achievement, UserAchievement
+from apps.challenges.models import ChallengeDefinition, UserChallenge
+from apps.gamification.models import User, XPLog
+from apps.goals.models import Goal, GoalStep
+from apps.habits.models import Habit, HabitDay
+from apps.mood.models import MoodEntry
+from apps.notes.models import RandomNote
+from apps.settings.models import DashboardTile, ModuleDefinition, UserPreference
+from apps.sobriety.models import Sobriety, SobrietyRelapse
+from apps.sync.models import Tombstone
+from apps.todos.models import TodoCategory, TodoTask
+
+
+# nazwa tabeli -> (model, kolumna zmiany). XPLog jest append-only, więc wystarcza created_at.
+SYNC_TABLES = {
+    "habits": (Habit, "updated_at"),
+    "habit_days": (HabitDay, "updated_at"),
+    "todo_categories": (TodoCategory, "updated_at"),
+    "todo_tasks": (TodoTask, "updated_at"),
+    "goals": (Goal, "updated_at"),
+    "goal_steps": (GoalStep, "updated_at"),
+    "notes": (RandomNote, "updated_at"),
+    "mood_entries": (MoodEntry, "updated_at"),
+    "sobriety": (Sobriety, "updated_at"),
+    "sobriety_relapses": (SobrietyRelapse, "updated_at"),
+    "challenge_definitions": (ChallengeDefinition, "updated_at"),
+    "user_challenges": (UserChallenge, "updated_at"),
+    "achievements": (Achievement, "updated_at"),
+    "user_achievements": (UserAchievement, "updated_at"),
+    "module_settings": (ModuleDefinition, "updated_at"),
+    "dashboard_tiles": (DashboardTile, "updated_at"),
+    "user_preferences": (UserPreference, "updated_at"),
+    "xp_logs": (XPLog, "created_at"),
+}
+
+MODEL_TABLES = {model: table for table, (model, _) in SYNC_TABLES.items()}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _config():
+    return getattr(settings, "SYNC", {})
+
+
+# --- kursor: mikrosekundy od epoki jako string ---
+
+def encode_cursor(moment):
+    if moment is None:
+        return "0"
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_cursor(value):
+    """
+    None dla pustego kursora, ValueError dla nieprawidłowego.
+    Liczba poza zakresem dat też daje None — klient dostanie pełną synchronizację.
+    """
+
+    if value in (None, "", "0"):
+        return None
+
+    microseconds = int(value)
+
+    try:
+        return EPOCH + timedelta(microseconds=microseconds)
+    except OverflowError:
+        return None
+
+
+# --- strona: "<kursor>-<tabela>-<ostatnie pk>", kontynuacja tej samej synchronizacji ---
+
+def encode_page(cursor, table, last_pk):
+    return f"{encode_cursor(cursor)}-{table}-{last_pk}"
+
+
+def decode_page(value):
+    """
+    (kursor, tabela, ostatnie pk); ValueError dla nieprawidłowej strony.
+    """
+
+    cursor, table, last_pk = value.split("-")
+    if table not in SYNC_TABLES:
+        raise ValueError(f"Unknown table: {table!r}")
+
+    return decode_cursor(cursor) or EPOCH, table, int(last_pk)
+
+
+# --- tombstony ---
+
+def record_deletion(table, object_id, user_id):
+    Tombstone.objects.create(user_id=user_id, table=table, object_id=object_id)
+
+
+def record_deletions(table, object_ids, user_id):
+    Tombstone.objects.bulk_create(
+        Tombstone(user_id=user_id, table=table, object_id=object_id)
+        for object_id in object_ids
+    )
+
+
+def record_reset(user):
+    """
+    Dane usera podmienione hurtem (import) — każdy klient musi zrobić pełną synchronizację.
+    """
+
+    Tombstone.objects.create(user=user, table=Tombstone.TABLE_RESET)
+
+
+def prune_tombstones(now=None):
+    horizon = (now or timezone.now()) - timedelta(days=_config().get("TOMBSTONE_DAYS", 90))
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=horizon).delete()
+    return deleted
+
+
+# --- zmiany ---
+
+def _columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def _with_tag_ids(rows):
+    # M2M nie ma własnego updated_at — tagi idą razem z definicją (m2m_changed ją "dotyka")
+    through = ChallengeDefinition.tags.through
+    tags = {}
+
+    for definition_id, tag_id in through.objects.filter(
+        challengedefinition_id__in=[row["id"] for row in rows],
+    ).values_list("challengedefinition_id", "challengetag_id"):
+        tags.setdefault(definition_id, []).append(tag_id)
+
+    for row in rows:
+        row["tag_ids"] = tags.get(row["id"], [])
+
+    return rows
+
+
+EXTRAS = {
+    "challenge_definitions": _with_tag_ids,
+}
+
+
+def needs_reset(user, since):
+    """
+    Pełna synchronizacja gdy: brak kursora, kursor starszy niż trzymane tombstony
+    albo od tego czasu był reset danych (import).
+    """
+
+    if since is None:
+        return True
+
+    horizon = timezone.now() - timedelta(days=_config().get("TOMBSTONE_DAYS", 90))
+    if since < horizon:
+        return True
+
+    return Tombstone.objects.filter(
+        user=user,
+        table=Tombstone.TABLE_RESET,
+        deleted_at__gte=since,
+    ).exists()
+
+
+def changes_since(user, since, tables=None, page=None):
+    """
+    {"cursor", "reset", "changes": {tabela: [wiersze]}, "deleted": {tabela: [id]}, "next"}.
+    Wiersze są płaskie (kolumny modelu, FK jako *_id). Klient najpierw robi upsert
+    `changes`, potem usuwa `deleted`.
+
+    Najwyżej SYNC["PAGE_SIZE"] wierszy na odpowiedź (tabele po kolei, wiersze po pk),
+    także przy pełnej synchronizacji. Gdy `next` nie jest null, klient pyta ponownie
+    z tym samym `since` i page=<next>; każda strona zwraca kursor pierwszej.
+    """
+
+    tables = [table for table in (tables or SYNC_TABLES) if table in SYNC_TABLES]
+    reset = needs_reset(user, since)
+    limit = _config().get("PAGE_SIZE", 5000)
+
+    if page is None:
+        cursor, start_table, after = timezone.now(), None, None
+    else:
+        cursor, start_table, after = decode_page(page)
+
+    # zakładka: zapis z updated_at sprzed kursora mógł się zacommitować chwilę po nim
+    lower = None if reset else since - timedelta(seconds=_config().get("OVERLAP_SECONDS", 2))
+
+    changes = {}
+    next_page = None
+
+    for table in tables:
+        if start_table is not None and table != start_table:
+            # tabela pobrana na poprzednich stronach
+            if start_table in tables:
+                continue
+            raise ValueError(f"Page table not requested: {start_table!r}")
+
+        if limit <= 0:
+            # strona skończyła się dokładnie na granicy tabel — ta od początku na następnej
+            next_page = encode_page(cursor, table, 0)
+            break
+
+        model, column = SYNC_TABLES[table]
+        qs = model.objects.for_user(user)
+
+        if lower is not None:
+            qs = qs.filter(**{f"{column}__gte": lower})
+
+        if start_table is not None:
+            qs = qs.filter(pk__gt=after)
+            start_table = None
+
+        # +1 wiersz mówi, czy tabela ma ciąg dalszy
+        rows = list(qs.order_by("pk").values(*_columns(model))[:limit + 1])
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_page = encode_page(cursor, table, rows[-1][model._meta.pk.attname])
+
+        if rows and table in EXTRAS:
+            rows = EXTRAS[table](rows)
+
+        changes[table] = rows
+        limit -= len(rows)
+
+        if next_page is not None:
+            break
+
+    deleted = {}
+    # tombstony raz, na pierwszej stronie
+    if lower is not None and page is None:
+        tombstones = (
+            Tombstone.objects.for_user(user)
+            .filter(table__in=tables, deleted_at__gte=lower)
+            .values_list("table", "object_id")
+        )
+        for table, object_id in tombstones:
+            deleted.setdefault(table, []).append(object_id)
+
+    return {
+        "cursor": encode_cursor(cursor),
+        "reset": reset,
+        "changes": changes,
+        "deleted": deleted,
+        "next": next_page,
+    }
+
+
+def latest_cursor(user, tables):
+    """
+    Kursor ostatniej zmiany w tabelach (zapis, usunięcie albo reset) — służy jako ETag list.
+    Jedno zapytanie: wiersz usera z podzapytaniem "najnowszy wiersz" per tabela.
+    """
+
+    def newest(qs, column):
+        return Subquery(qs.order_by(f"-{column}").values(column)[:1])
+
+    annotations = {
+        f"last_{table}": newest(
+            SYNC_TABLES[table][0].objects.for_user(user),
+            SYNC_TABLES[table][1],
+        )
+        for table in tables
+    }
+    annotations["last_tombstone"] = newest(
+        Tombstone.objects.for_user(user).filter(table__in=[*tables, Tombstone.TABLE_RESET]),
+        "deleted_at",
+    )
+
+    latest = User.objects.filter(pk=user.pk).annotate(**annotations).values(*annotations).first()
+
+    return encode_cursor(max((moment for moment in (latest or {}).values() if moment), default=None))
@@ -0,0 +1,77 @@
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.utils import timezone
+
+from apps.challenges.models import ChallengeDefinition
+from apps.common.managers import owner_id
+from apps.sync.services.changes import MODEL_TABLES, record_deletion, record_deletions
+
+
+def cascade_parent(model):
+    """
+    FK do rodzica dla wierszy-dzieci (user_lookup przez rodzica: HabitDay, GoalStep, ...), inaczej None.
+    """
+
+    lookup = getattr(model, "user_lookup", "user")
+    if "__" not in lookup:
+        return None
+
+    return model._meta.get_field(lookup.split("__", 1)[0])
+
+
+def _make_receiver(table):
+    def receiver(sender, instance, origin=None, **kwargs):
+        record_deletion(table, instance.pk, owner_id(instance, origin))
+
+    return receiver
+
+
+def _make_cascade_receiver(model, table, parent):
+    def receiver(sender, instance, **kwargs):
+        # dzieci znikną kaskadą — tombstony jednym zapytaniem, zanim zrobi to DELETE
+        ids = model.objects.filter(**{parent.attname: instance.pk}).values_list("pk", flat=True)
+        record_deletions(table, ids, owner_id(instance))
+
+    return receiver
+
+
+def _tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    # zmiana tagów = zmiana definicji dla klienta synchronizacji
+    if reverse:
+        definitions = ChallengeDefinition.objects.filter(pk__in=pk_set or ())
+    else:
+        definitions = ChallengeDefinition.objects.filter(pk=instance.pk)
+
+    definitions.update(updated_at=timezone.now())
+
+
+def connect():
+    for model, table in MODEL_TABLES.items():
+        parent = cascade_parent(model)
+
+        if parent is None:
+            post_delete.connect(
+                _make_receiver(table),
+                sender=model,
+                weak=False,
+                dispatch_uid=f"sync:tombstone:{table}",
+            )
+            continue
+
+        # bez receivera na samym dziecku: Django kasuje kaskadę jednym DELETE
+        # (fast delete), zamiast ładować całą historię rodzica do pamięci.
+        # Bezpośrednie usunięcie dziecka musi samo wołać record_deletion.
+        pre_delete.connect(
+            _make_cascade_receiver(model, table, parent),
+            sender=parent.related_model,
+            weak=False,
+            dispatch_uid=f"sync:tombstone:{table}",
+        )
+
+    m2m_changed.connect(
+        _tags_changed,
+        sender=ChallengeDefinition.tags.through,
+        dispatch_uid="sync:challenge_tags",
+    )
@@ -0,0 +1,236 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.common.models import DifficultyType
+from apps.gamification.models import AuthToken, User
+from apps.goals.models import Goal, GoalPeriod, GoalStep
+from apps.habits.models import Habit, HabitDay
+from apps.notes.models import RandomNote
+from apps.settings.services.data_import import reset_user_data
+from apps.sobriety.models import Sobriety
+from apps.sync.models import Tombstone
+from apps.sync.services.changes import prune_tombstones
+
+
+class SyncTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create()
+        self.other = User.objects.create()
+        self.diff = DifficultyType.objects.create(name="easy", order=1)
+
+        self.client = APIClient()
+        token = AuthToken.issue(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        self.old = RandomNote.objects.create(user=self.user, content="old")
+        self.kept = RandomNote.objects.create(user=self.user, content="kept")
+        RandomNote.objects.create(user=self.other, content="foreign")
+
+        # wiersze sprzed kursora — poza oknem zakładki
+        RandomNote.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def _sync(self, since=None, tables="notes,habits"):
+        params = {"tables": tables}
+        if since:
+            params["since"] = since
+
+        res = self.client.get("/api/sync/", params)
+        self.assertEqual(res.status_code, 200)
+        return res.data
+
+    def test_full_then_delta_with_tombstones(self):
+        full = self._sync()
+
+        self.assertTrue(full["reset"])
+        self.assertEqual(
+            sorted(row["content"] for row in full["changes"]["notes"]),
+            ["kept", "old"],
+        )
+        self.assertEqual(full["deleted"], {})
+
+        self.kept.content = "edited"
+        self.kept.save()
+        old_id = self.old.id
+        self.old.delete()
+        habit = Habit.objects.create(user=self.user, title="Read", difficulty=self.diff)
+
+        delta = self._sync(full["cursor"])
+
+        self.assertFalse(delta["reset"])
+        self.assertEqual([row["content"] for row in delta["changes"]["notes"]], ["edited"])
+        self.assertEqual([row["id"] for row in delta["changes"]["habits"]], [habit.id])
+        self.assertEqual(delta["deleted"], {"notes": [old_id]})
+
+    def test_import_reset_forces_full_sync(self):
+        cursor = self._sync()["cursor"]
+
+        reset_user_data(self.user)
+
+        delta = self._sync(cursor)
+        self.assertTrue(delta["reset"])
+        self.assertEqual(delta["changes"]["notes"], [])
+
+    def test_invalid_cursor_is_rejected(self):
+        res = self.client.get("/api/sync/", {"since": "yesterday"})
+        self.assertEqual(res.status_code, 400)
+
+        res = self.client.get("/api/sync/", {"since": "1", "page": "garbage"})
+        self.assertEqual(res.status_code, 400)
+
+    def test_out_of_range_cursor_forces_full_sync(self):
+        full = self._sync("99999999999999999999")
+
+        self.assertTrue(full["reset"])
+        self.assertEqual(len(full["changes"]["notes"]), 2)
+
+    @override_settings(SYNC={"OVERLAP_SECONDS": 2, "TOMBSTONE_DAYS": 90, "PAGE_SIZE": 2})
+    def test_full_sync_is_paged(self):
+        RandomNote.objects.create(user=self.user, content="third")
+        habit = Habit.objects.create(user=self.user, title="Read", difficulty=self.diff)
+
+        first = self._sync()
+        self.assertEqual(len(first["changes"]["notes"]), 2)
+        self.assertNotIn("habits", first["changes"])
+
+        res = self.client.get("/api/sync/", {"tables": "notes,habits", "page": first["next"]})
+        second = res.data
+
+        self.assertTrue(second["reset"])
+        self.assertEqual([row["content"] for row in second["changes"]["notes"]], ["third"])
+        self.assertEqual([row["id"] for row in second["changes"]["habits"]], [habit.id])
+        self.assertIsNone(second["next"])
+        # kursor pierwszej strony — zmiany w trakcie stronicowania przyjdą w następnej delcie
+        self.assertEqual(second["cursor"], first["cursor"])
+
+    @override_settings(SYNC={"OVERLAP_SECONDS": 2, "TOMBSTONE_DAYS": 90, "PAGE_SIZE": 2})
+    def test_page_ending_on_table_boundary(self):
+        for i in range(4):
+            Habit.objects.create(user=self.user, title=f"h{i}", difficulty=self.diff)
+
+        pages = [self._sync(tables="habits,notes")]
+        while pages[-1]["next"]:
+            res = self.client.get("/api/sync/", {"tables": "habits,notes", "page": pages[-1]["next"]})
+            pages.append(res.data)
+
+        # druga strona kończy się dokładnie na ostatnim habicie — notes nie mogą przepaść
+        synced = {
+            table: sorted(row["id"] for page in pages for row in page["changes"].get(table, []))
+            for table in ("habits", "notes")
+        }
+        self.assertEqual(synced["habits"], sorted(Habit.objects.values_list("id", flat=True)))
+        self.assertEqual(synced["notes"], sorted([self.old.id, self.kept.id]))
+
+    def _delta_after(self, action, table, obj):
+        type(obj).objects.filter(pk=obj.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        cursor = self._sync(tables=table)["cursor"]
+
+        action()
+
+        delta = self._sync(cursor, tables=table)
+        self.assertEqual([row["id"] for row in delta["changes"][table]], [obj.id])
+
+    def test_sobriety_relapse_and_restart_reach_delta(self):
+        sobriety = Sobriety.objects.create(user=self.user, name="Coffee", motivation_reason="sleep")
+        url = f"/api/sobriety/{sobriety.id}"
+
+        self._delta_after(
+            lambda: self.client.post(f"{url}/relapse/", {"sobriety": sobriety.id}, format="json"),
+            "sobriety",
+            sobriety,
+        )
+        self._delta_after(lambda: self.client.post(f"{url}/restart/"), "sobriety", sobriety)
+
+    def test_goal_step_and_archive_changes_reach_delta(self):
+        goal = Goal.objects.create(
+            user=self.user,
+            title="Run",
+            motivation_reason="health",
+            period=GoalPeriod.objects.create(name="weekly"),
+            difficulty=self.diff,
+        )
+        step = GoalStep.objects.create(goal=goal, title="5 km")
+
+        self._delta_after(
+            lambda: self.client.post(f"/api/goals/steps/{step.id}/toggle/"),
+            "goal_steps",
+            step,
+        )
+        self._delta_after(
+            lambda: self.client.patch(f"/api/goals/steps/{step.id}/", {"title": "10 km"}, format="json"),
+            "goal_steps",
+            step,
+        )
+        self._delta_after(goal.archive, "goals", goal)
+
+    def test_cascade_delete_writes_tombstones_in_bulk(self):
+        habit = Habit.objects.create(user=self.user, title="Read", difficulty=self.diff)
+        start = date(2025, 1, 1)
+        HabitDay.objects.bulk_create(
+            HabitDay(habit=habit, date=start + timedelta(days=i)) for i in range(30)
+        )
+        day_ids = sorted(HabitDay.objects.values_list("id", flat=True))
+        habit_id = habit.id
+        cursor = self._sync(tables="habits,habit_days")["cursor"]
+
+        with CaptureQueriesContext(connection) as queries:
+            habit.delete()
+
+        # id dni + tombstony dni, po jednym DELETE na tabelę, tombstone nawyku —
+        # niezależnie od długości historii
+        self.assertLessEqual(len(queries), 6)
+
+        delta = self._sync(cursor, tables="habits,habit_days")
+        self.assertEqual(delta["deleted"]["habits"], [habit_id])
+        self.assertEqual(sorted(delta["deleted"]["habit_days"]), day_ids)
+        self.assertEqual(
+            set(Tombstone.objects.filter(table="habit_days").values_list("user_id", flat=True)),
+            {self.user.id},
+        )
+
+    def test_direct_goal_step_delete_is_tombstoned(self):
+        goal = Goal.objects.create(
+            user=self.user,
+            title="Run",
+            motivation_reason="health",
+            period=GoalPeriod.objects.create(name="weekly"),
+            difficulty=self.diff,
+        )
+        step = GoalStep.objects.create(goal=goal, title="5 km")
+        cursor = self._sync(tables="goal_steps")["cursor"]
+
+        self.client.delete(f"/api/goals/steps/{step.id}/")
+
+        delta = self._sync(cursor, tables="goal_steps")
+        self.assertEqual(delta["deleted"], {"goal_steps": [step.id]})
+
+    def test_prune_drops_only_expired_tombstones(self):
+        self.old.delete()
+        Tombstone.objects.create(
+            user=self.user,
+            table="notes",
+            object_id=0,
+            deleted_at=timezone.now() - timedelta(days=365),
+        )
+
+        self.assertEqual(prune_tombstones(), 1)
+        self.assertEqual(Tombstone.objects.count(), 1)
+
+    def test_list_etag_returns_304_until_data_changes(self):
+        res = self.client.get("/api/notes/")
+        etag = res["ETag"]
+
+        res = self.client.get("/api/notes/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        self.old.delete()
+
+        res = self.client.get("/api/notes/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(len(res.data), 1)
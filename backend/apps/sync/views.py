@@ -0,0 +1,30 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .services.changes import changes_since, decode_cursor
+
+
+class SyncView(APIView):
+    """
+    GET /api/sync/?since=<cursor>&tables=habits,todo_tasks
+    Bez `since` (albo gdy reset=true) — pełny stan; potem tylko zmiany od kursora.
+    Zwrócony `cursor` idzie jako `since` w następnym wywołaniu.
+    Duże odpowiedzi są stronicowane: dopóki `next` nie jest null, to samo zapytanie
+    z &page=<next>.
+    """
+
+    def get(self, request):
+        tables = request.query_params.get("tables")
+        tables = tables.split(",") if tables else None
+
+        try:
+            since = decode_cursor(request.query_params.get("since"))
+            data = changes_since(request.user, since, tables, request.query_params.get("page"))
+        except ValueError:
+            return Response(
+                {"detail": "Invalid cursor"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(data, status=status.HTTP_200_OK)
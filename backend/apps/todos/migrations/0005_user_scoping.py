@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_difficultytype_order'),
+        ('gamification', '0008_authtoken'),
+        ('todos', '0004_alter_todotask_options_todotask_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todocategory',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='custom_todo_categories', to='gamification.user'),
+        ),
+        migrations.AddIndex(
+            model_name='todotask',
+            index=models.Index(fields=['user', 'category', 'order'], name='todos_todot_user_id_367f6a_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_difficultytype_order'),
+        ('gamification', '0009_hot_path_indexes'),
+        ('todos', '0005_user_scoping'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todotask',
+            index=models.Index(fields=['user', 'category', 'is_completed'], name='todo_user_cat_done_idx'),
+        ),
+    ]
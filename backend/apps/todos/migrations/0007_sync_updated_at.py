@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todocategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
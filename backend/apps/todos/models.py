@@ -1,10 +1,27 @@
 from django.db import models
+from django.utils import timezone
+from apps.gamification.services.xp_calculator import calculate_xp
+from apps.common.managers import UserScopedManager
 
 class TodoCategory(models.Model):
     name = models.CharField(max_length=30)
     difficulty = models.ForeignKey("common.DifficultyType", on_delete=models.PROTECT)
     color = models.CharField(max_length=20, blank=True, null=True)
 
+    # systemowa czy customowa usera
+    user = models.ForeignKey(
+        "gamification.User",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="custom_todo_categories",
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedManager()
+    user_scope_shared = True
+
     def __str__(self):
         return f"{self.name}"
 
@@ -32,8 +49,50 @@ class TodoTask(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedManager()
+
     class Meta:
         ordering = ["order"]
+        indexes = [
+            models.Index(fields=["user", "category", "order"]),
+            models.Index(fields=["user", "category", "is_completed"], name="todo_user_cat_done_idx"),
+        ]
+
+    def complete(self):
+        """
+        None gdy zadanie już było ukończone, inaczej przyznane XP.
+        """
+
+        if self.is_completed:
+            return None
+
+        diff = self.custom_difficulty or self.category.difficulty
+        xp = (
+            calculate_xp(
+                module="todos",
+                difficulty=diff.name.lower(),
+                user=self.user,
+            )
+            if diff
+            else 0
+        )
+
+        self.user.add_xp(
+            xp=xp,
+            source="todo",
+            source_id=self.id,
+        )
+
+        self.is_completed = True
+        self.completed_at = timezone.now()
+        self.save(update_fields=["is_completed", "completed_at", "updated_at"])
+
+        # lokalny import — achievements importują modele todo
+        from apps.achievements.services.achievement_engine import EVENT_TODO
+        from apps.achievements.services.job_queue import schedule_event
+        schedule_event(self.user, EVENT_TODO, delta=1, category_id=self.category_id)
+
+        return xp
 
     def __str__(self):
         return self.content[:40]
@@ -3,7 +3,6 @@ from .models import TodoCategory, TodoTask
 from apps.common.serializers import DifficultyTypeSerializer
 from apps.common.models import DifficultyType
 from django.db.models import Max
-from apps.gamification.utils import get_user
 
 
 class TodoCategorySerializer(serializers.ModelSerializer):
@@ -36,6 +35,14 @@ class TodoTaskSerializer(serializers.ModelSerializer):
         allow_null=True
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # tylko kategorie widoczne dla usera (systemowe + jego)
+        request = self.context.get("request")
+        if request is not None:
+            self.fields["category_id"].queryset = TodoCategory.objects.for_user(request.user)
+
     class Meta:
         model = TodoTask
         fields = [
@@ -52,7 +59,7 @@ class TodoTaskSerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
-        user = get_user()
+        user = self.context["request"].user
         category = validated_data["category"]
 
         max_order = (
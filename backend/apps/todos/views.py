@@ -1,10 +1,11 @@
 from django.utils import timezone
-from apps.gamification.services.xp_calculator import calculate_xp
-from rest_framework import generics, status
+from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-import random
+from apps.common.services import user_cache
+from apps.common.services.random_pick import pick_random
+from apps.sync.mixins import SyncETagMixin
 
 
 from .models import TodoCategory, TodoTask
@@ -12,55 +13,96 @@ from .serializers import (
     TodoCategorySerializer,
     TodoTaskSerializer,
 )
-from apps.gamification.utils import get_user
+from apps.achievements.services.achievement_engine import EVENT_TODO
+from apps.achievements.services.job_queue import schedule_event
 
-class TodoCategoryListCreate(generics.ListCreateAPIView):
-    queryset = TodoCategory.objects.all().order_by("name")
+class TodoCategoryListCreate(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = TodoCategorySerializer
+    sync_tables = ("todo_categories",)
+
+    def get_queryset(self):
+        # systemowe + custom usera
+        return (
+            TodoCategory.objects.for_user(self.request.user)
+            .select_related("difficulty")
+            .order_by("name")
+        )
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
 
 
 class TodoCategoryDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = TodoCategory.objects.all()
     serializer_class = TodoCategorySerializer
 
+    def get_queryset(self):
+        # systemowe tylko do odczytu — edycja/usuwanie wyłącznie własnych
+        if self.request.method in permissions.SAFE_METHODS:
+            return TodoCategory.objects.for_user(self.request.user)
+        return TodoCategory.objects.owned_by(self.request.user)
+
     def destroy(self, request, *args, **kwargs):
         category = self.get_object()
-        if TodoCategory.objects.count() <= 1:
+        if TodoCategory.objects.for_user(request.user).count() <= 1:
             return Response(
                 {"detail": "Cannot delete the last category."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        category.tasks.all().delete()
-        return super().destroy(request, *args, **kwargs)
+        category_id = category.id
+        category.tasks.filter(user=request.user).delete()
+        response = super().destroy(request, *args, **kwargs)
+
+        schedule_event(request.user, EVENT_TODO, category_id=category_id)
 
+        return response
 
-class TodoTaskListCreate(generics.ListCreateAPIView):
+
+class TodoTaskListCreate(SyncETagMixin, generics.ListCreateAPIView):
     serializer_class = TodoTaskSerializer
+    sync_tables = ("todo_tasks", "todo_categories")
 
     def get_queryset(self):
-        qs = TodoTask.objects.filter(user=get_user())
+        qs = TodoTask.objects.for_user(self.request.user).select_related(
+            "category__difficulty",
+            "custom_difficulty",
+        )
         category_id = self.request.query_params.get("category_id")
         if category_id:
             qs = qs.filter(category_id=category_id)
         return qs
 
     def perform_create(self, serializer):
-        serializer.save(user=get_user())
+        serializer.save(user=self.request.user)
 
 
 class TodoTaskDetail(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TodoTaskSerializer
 
     def get_queryset(self):
-        return TodoTask.objects.filter(user=get_user())
+        return TodoTask.objects.for_user(self.request.user)
+
+    def perform_update(self, serializer):
+        task = serializer.save()
+
+        # is_completed / category mogą się zmienić przez PATCH
+        schedule_event(task.user, EVENT_TODO)
+
+    def perform_destroy(self, instance):
+        user = instance.user
+        was_completed = instance.is_completed
+        category_id = instance.category_id
+        instance.delete()
+
+        if was_completed:
+            schedule_event(user, EVENT_TODO, delta=-1, category_id=category_id)
 
 class CompleteTodoTaskView(APIView):
     def post(self, request, pk):
         task = get_object_or_404(
             TodoTask,
             pk=pk,
-            user=get_user(),
+            user=request.user,
         )
 
         if task.is_completed:
@@ -72,26 +114,7 @@ class CompleteTodoTaskView(APIView):
                 status=status.HTTP_200_OK,
             )
 
-        diff = task.custom_difficulty or task.category.difficulty
-        xp = (
-            calculate_xp(
-                module="todos",
-                difficulty=diff.name.lower(),
-                user=task.user,
-            )
-            if diff
-            else 0
-        )
-
-        task.user.add_xp(
-            xp=xp,
-            source="todo",
-            source_id=task.id,
-        )
-
-        task.is_completed = True
-        task.completed_at = timezone.now()
-        task.save(update_fields=["is_completed", "completed_at", "updated_at"])
+        xp = task.complete()
 
         return Response(
             {
@@ -107,7 +130,7 @@ class CompleteTodoTaskView(APIView):
 class RandomTodoTaskView(APIView):
     def get(self, request):
         qs = TodoTask.objects.filter(
-            user=get_user(),
+            user=request.user,
             is_completed=False,
         )
 
@@ -115,16 +138,16 @@ class RandomTodoTaskView(APIView):
         if category_id:
             qs = qs.filter(category_id=category_id)
 
-        if not qs.exists():
+        task = pick_random(qs)
+        if task is None:
             return Response(None, status=status.HTTP_200_OK)
 
-        task = random.choice(list(qs))
         return Response(TodoTaskSerializer(task).data)
 
 class CategoryHasUncompletedTasksView(APIView):
     def get(self, request, category_id):
         exists = TodoTask.objects.filter(
-            user=get_user(),
+            user=request.user,
             category_id=category_id,
             is_completed=False,
         ).exists()
@@ -133,7 +156,7 @@ class CategoryHasUncompletedTasksView(APIView):
 
 class TodoReorderView(APIView):
     def post(self, request):
-        user = get_user()
+        user = request.user
         category_id = request.data.get("category_id")
         items = request.data.get("items", [])
 
@@ -145,6 +168,8 @@ class TodoReorderView(APIView):
                 id=item["id"],
                 user=user,
                 category_id=category_id
-            ).update(order=item["order"])
+            ).update(order=item["order"], updated_at=timezone.now())
+
+        user_cache.bump(user.id, user_cache.TODOS)
 
         return Response({"detail": "reordered"})    
\ No newline at end of file
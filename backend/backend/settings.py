@@ -32,8 +32,19 @@ ALLOWED_HOSTS = ['*']
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'apps.gamification.authentication.TokenAuthentication',
+        'apps.gamification.authentication.SingleUserAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+    ],
 }
 
+# True: request bez tokena = pierwszy user w bazie (lokalna instalacja bez logowania).
+# False: każdy request musi mieć nagłówek Authorization: Token <key>
+SINGLE_USER_MODE = True
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -58,6 +69,9 @@ INSTALLED_APPS = [
     'apps.mood',
     'apps.sobriety',
     'apps.achievements',
+    'apps.dashboard',
+    'apps.sync',
+    'apps.batch',
 ]
 
 MIDDLEWARE = [
@@ -75,6 +89,7 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'backend.urls'
 
 CORS_ALLOW_ALL_ORIGINS = True   #na lokalny dev
+CORS_EXPOSE_HEADERS = ["ETag"]  # klient web odczytuje ETag dashboardu
 
 TEMPLATES = [
     {
@@ -145,3 +160,64 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# pomija testy z tagiem "perf" — apps/common/tests_perf.py, uruchamiane przez: manage.py test --tag perf
+TEST_RUNNER = "apps.common.testing.TestRunner"
+
+# Achievementy liczone w tle po commicie (apps/achievements/services/job_queue.py).
+# "thread" — pula wątków z łączeniem eventów per user, "immediate" — od razu w requeście
+# (testy na TestCase przełączają to przez override_settings)
+ACHIEVEMENT_QUEUE = {
+    "BACKEND": "thread",
+    "WORKERS": 2,
+    "COALESCE_SECONDS": 0.5,
+}
+
+# Cache (apps/common/services/user_cache.py + kalendarz habitów + indeks achievementów).
+# Domyślnie w pamięci procesu; przy kilku workerach podmień na współdzielony backend, np.:
+#   "BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": BASE_DIR / ".cache"
+#   "BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://127.0.0.1:6379"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "lucky-prism",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    }
+}
+
+# Odczyty per user (streaki, miesiąc habitów, aktywne challenge, achievementy)
+# wersjonowane zapisami (po commicie). Wersje żyją w CACHES — na LocMemCache bump z jednego
+# workera nie dociera do pozostałych, więc włączaj dopiero ze współdzielonym backendem
+# (albo przy jednym procesie). Runner testów czyści cache przed każdym testem.
+USER_CACHE = {
+    "ENABLED": False,
+    "ALIAS": "default",
+    "TIMEOUT": 24 * 60 * 60,
+}
+
+# Import danych (apps/settings/services/data_import.py) — ile wierszy na jeden INSERT
+DATA_IMPORT = {
+    "BATCH_SIZE": 1000,
+}
+
+# /api/sync/ — zakładka kursora (zapisy commitowane chwilę po odczycie)
+# i jak długo trzymamy tombstony (starszy kursor = pełna synchronizacja);
+# PAGE_SIZE — najwięcej wierszy w jednej odpowiedzi, reszta pod `next`
+SYNC = {
+    "OVERLAP_SECONDS": 2,
+    "TOMBSTONE_DAYS": 90,
+    "PAGE_SIZE": 5000,
+}
+
+# /api/batch/ — kolejka akcji offline
+BATCH = {
+    "MAX_OPERATIONS": 200,
+    # jak długo pamiętamy klucze idempotencji (prune_batch_keys)
+    "KEY_DAYS": 30,
+}
+
+# /api/dashboard/ — ile kafelków liczyć równolegle (1 = po kolei w wątku requestu)
+DASHBOARD = {
+    "TILE_WORKERS": 4,
+}
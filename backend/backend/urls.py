@@ -14,5 +14,8 @@ urlpatterns = [
     path("api/mood/", include("apps.mood.urls")),
     path("api/sobriety/", include("apps.sobriety.urls")),
     path("api/achievements/", include("apps.achievements.urls")),
+    path("api/dashboard/", include("apps.dashboard.urls")),
+    path("api/sync/", include("apps.sync.urls")),
+    path("api/batch/", include("apps.batch.urls")),
 ]
 
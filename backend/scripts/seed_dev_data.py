@@ -1,3 +1,5 @@
+# Kilka przykładowych rekordów do ręcznego klikania. Duży, deterministyczny zbiór
+# (testy wydajności): python manage.py seed_load --users N --years Y --density D
 print("\n=== SEED DEV DATA START ===\n")
 from apps.gamification.models import User
 from apps.challenges.models import ChallengeType, ChallengeDefinition, ChallengeTag
@@ -78,14 +78,12 @@ useEffect(() => {
 
 const handleExport = async () => {
   try {
-    const res = await api.get("/settings/export/");
-    const data = res.data;
+    // NDJSON streamowany prosto do pliku, bez trzymania eksportu w pamięci
+    const fileUri = FileSystem.documentDirectory + "backup.ndjson";
 
-    const fileUri = FileSystem.documentDirectory + "backup.json";
-
-    await FileSystem.writeAsStringAsync(
-      fileUri,
-      JSON.stringify(data)
+    await FileSystem.downloadAsync(
+      `${api.defaults.baseURL}/settings/export/`,
+      fileUri
     );
 
     await Sharing.shareAsync(fileUri);
@@ -97,18 +95,28 @@ const handleExport = async () => {
 const handleImport = async () => {
   try {
     const result = await DocumentPicker.getDocumentAsync({
-      type: "application/json",
+      type: ["application/x-ndjson", "application/json", "*/*"],
     });
 
     if (result.canceled) return;
 
-    const fileContent = await FileSystem.readAsStringAsync(
-      result.assets[0].uri
-    );
+    const asset = result.assets[0];
+    const fileContent = await FileSystem.readAsStringAsync(asset.uri);
 
-    await api.post("/settings/import/", JSON.parse(fileContent));
+    const res = asset.name?.endsWith(".ndjson")
+      ? await api.post("/settings/import/", fileContent, {
+          headers: { "Content-Type": "application/x-ndjson" },
+          transformRequest: (data) => data,
+        })
+      // stare kopie backup.json
+      : await api.post("/settings/import/", JSON.parse(fileContent));
+
+    const rows = Object.values(res.data?.tables ?? {}).reduce(
+      (sum: number, t: any) => sum + (t.rows ?? 0),
+      0
+    );
 
-    alert("Import finished. Restart app.");
+    alert(`Import finished (${rows} rows). Restart app.`);
   } catch (e) {
     console.log("Import error:", e);
   }
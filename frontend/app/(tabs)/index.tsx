@@ -15,6 +15,7 @@ import { RandomHabitSummary, useHabitStore } from "../stores/useHabitStore";
 import { useGoalStore } from "../stores/useGoalStore";
 import { useTodoStore } from "../stores/useTodoStore";
 import { useNotesStore } from "../stores/useNotesStore";
+import { useDashboardStore } from "../stores/useDashboardStore";
 import { LevelTile } from "../../components/dashboard/LevelTile";
 import { BiggestStreakTile } from "../../components/dashboard/BiggestStreak";
 import { RandomGoalTile } from "../../components/dashboard/RandomGoalTile";
@@ -33,19 +34,15 @@ export default function DashboardScreen() {
   const {
     totalXp,
     currentLevel: level,
-    fetchUser,
   } = useGamificationStore();
 
   const {
-    fetchActive,
     activeDaily,
     activeWeekly,
   } = useChallengeStore();
 
   const {
-    fetchStreaks,
     biggestStreak,
-    loadMonth,
   } = useHabitStore();
 
   const { pickRandomGoal } = useGoalStore();
@@ -88,35 +85,39 @@ export default function DashboardScreen() {
   const fetchAll = useCallback(async () => {
     setLoading(true);
     try {
-      await Promise.all([
+      // wszystkie włączone kafelki jednym requestem (/api/dashboard/)
+      const [dashboard] = await Promise.all([
+        useDashboardStore.getState().fetchDashboard(),
         fetchModules?.(),
-        fetchUser?.(),
-        fetchActive?.(),
-        fetchStreaks?.(),
-        fetchRandomNote?.(),
-        loadMonth?.(),
       ]);
 
-      const [gw, gm, gy] = await Promise.all([
-        pickRandomGoal?.("weekly"),
-        pickRandomGoal?.("monthly"),
-        pickRandomGoal?.("yearly"),
-      ]);
-
-      setGoalWeek(gw ?? null);
-      setGoalMonth(gm ?? null);
-      setGoalYear(gy ?? null);
-
-      const todo = await fetchRandomTask?.();
-      setRandomTodo(todo ?? null);
-
-      const rh = await useHabitStore
-        .getState()
-        .pickRandomHabitSummary();
-
-      setRandomHabit(rh ?? null);
-
-
+      const tiles = dashboard?.data ?? {};
+
+      if (tiles.level_gamification) {
+        useGamificationStore.setState({
+          totalXp: tiles.level_gamification.total_xp,
+          currentLevel: tiles.level_gamification.current_level,
+          xpMultiplier: tiles.level_gamification.xp_multiplier,
+        });
+      }
+      if ("biggest_streak" in tiles) {
+        useHabitStore.setState({ biggestStreak: tiles.biggest_streak ?? null });
+      }
+      if ("daily_challenge" in tiles || "weekly_challenge" in tiles) {
+        useChallengeStore.setState({
+          activeDaily: tiles.daily_challenge ?? null,
+          activeWeekly: tiles.weekly_challenge ?? [],
+        });
+      }
+      if ("random_note" in tiles) {
+        useNotesStore.setState({ randomNote: tiles.random_note ?? null });
+      }
+
+      setGoalWeek(tiles.goal_week ?? null);
+      setGoalMonth(tiles.goal_month ?? null);
+      setGoalYear(tiles.goal_year ?? null);
+      setRandomTodo(tiles.random_todo ?? null);
+      setRandomHabit(tiles.random_habit ?? null);
     } catch (e) {
       console.error("Dashboard fetch error:", e);
     } finally {
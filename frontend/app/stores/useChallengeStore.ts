@@ -32,6 +32,7 @@ export interface UserChallenge {
   start_date: string;
   challenge_type: ChallengeType;
   weekly_deadline?: string;
+  period_end?: string | null;
   progress_days?: number;
   is_completed: boolean;
 }
@@ -0,0 +1,46 @@
+import { create } from "zustand";
+import { api } from "../api/apiClient";
+import { DashboardTileKey } from "./useModuleSettingsStore";
+
+export type DashboardPayload = {
+  tiles: DashboardTileKey[];
+  data: Partial<Record<DashboardTileKey, any>>;
+};
+
+type DashboardStore = {
+  // stały seed = te same losowania przy każdym wejściu, więc backend może zwrócić 304
+  seed: string;
+  etag: string | null;
+  dashboard: DashboardPayload | null;
+
+  fetchDashboard: () => Promise<DashboardPayload | null>;
+  reshuffle: () => void;
+};
+
+export const useDashboardStore = create<DashboardStore>((set, get) => ({
+  seed: String(Date.now()),
+  etag: null,
+  dashboard: null,
+
+  fetchDashboard: async () => {
+    const { seed, etag, dashboard } = get();
+
+    try {
+      const res = await api.get("/dashboard/", {
+        params: { seed },
+        headers: etag && dashboard ? { "If-None-Match": etag } : {},
+        validateStatus: (s) => s === 200 || s === 304,
+      });
+
+      if (res.status === 304) return dashboard;
+
+      set({ etag: res.headers["etag"] ?? null, dashboard: res.data });
+      return res.data;
+    } catch (e) {
+      console.error("fetchDashboard", e);
+      return null;
+    }
+  },
+
+  reshuffle: () => set({ seed: String(Date.now()), etag: null }),
+}));
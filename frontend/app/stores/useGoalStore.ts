@@ -29,6 +29,7 @@ export interface Goal {
 
   is_archived: boolean;
   archived_at?: string | null;
+  period_end?: string | null;
 
   created_at: string;
   updated_at: string;
@@ -0,0 +1,78 @@
+import { create } from "zustand";
+import { api } from "../api/apiClient";
+
+type Row = { id: number; [key: string]: any };
+
+type SyncResponse = {
+  cursor: string;
+  reset: boolean;
+  changes: Record<string, Row[]>;
+  deleted: Record<string, number[]>;
+  next: string | null;
+};
+
+type SyncStore = {
+  cursor: string | null;
+  // tabela -> id -> wiersz (płaskie kolumny z backendu, FK jako *_id)
+  tables: Record<string, Record<number, Row>>;
+
+  pull: () => Promise<boolean>;
+  rows: (table: string) => Row[];
+};
+
+export const useSyncStore = create<SyncStore>((set, get) => ({
+  cursor: null,
+  tables: {},
+
+  // zawsze wszystkie tabele — jeden wspólny kursor
+  pull: async () => {
+    const { cursor } = get();
+
+    try {
+      // strony tej samej synchronizacji (next != null) — zapisujemy dopiero po ostatniej,
+      // inaczej kolejna delta zaczęłaby od kursora i reszta wierszy by przepadła
+      const pages: SyncResponse[] = [];
+      let page: string | null = null;
+
+      do {
+        const params: Record<string, string> = cursor ? { since: cursor } : {};
+        if (page) params.page = page;
+
+        const res = await api.get<SyncResponse>("/sync/", { params });
+        pages.push(res.data);
+        page = res.data.next;
+      } while (page);
+
+      // reset, deleted i kursor są takie same na każdej stronie / tylko na pierwszej
+      const { reset, deleted, cursor: nextCursor } = pages[0];
+
+      // reset = pełny stan, stare wiersze wyrzucamy; inaczej najpierw upsert, potem usunięcia
+      const next: SyncStore["tables"] = reset ? {} : { ...get().tables };
+
+      pages.forEach(({ changes }) => {
+        Object.entries(changes).forEach(([table, rows]) => {
+          const current: Record<number, Row> = { ...(next[table] ?? {}) };
+          rows.forEach((row) => {
+            current[row.id] = row;
+          });
+          next[table] = current;
+        });
+      });
+
+      Object.entries(deleted).forEach(([table, ids]) => {
+        if (!next[table]) return;
+        const current = { ...next[table] };
+        ids.forEach((id) => delete current[id]);
+        next[table] = current;
+      });
+
+      set({ cursor: nextCursor, tables: next });
+      return true;
+    } catch (e) {
+      console.error("sync pull", e);
+      return false;
+    }
+  },
+
+  rows: (table) => Object.values(get().tables[table] ?? {}),
+}));